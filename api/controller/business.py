@@ -4,7 +4,7 @@ Business controller - exposes business endpoints with repository injection.
 from datetime import date
 from typing import Optional
 
-from fastapi import Depends, Query, BackgroundTasks
+from fastapi import Depends, Query
 from sqlalchemy.orm import Session
 
 from database.postgres_optimized import get_db
@@ -80,7 +80,6 @@ async def create_business_controller(
 
 async def add_customer_controller(
     request: CustomerInvite,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
     user_repo: UserRepository = Depends(get_repository(UserRepository)),
@@ -93,7 +92,6 @@ async def add_customer_controller(
 ):
     return await add_customer_to_business(
         request=request,
-        background_tasks=background_tasks,
         current_user=current_user,
         db=db,
         user_repo=user_repo,
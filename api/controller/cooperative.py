@@ -9,7 +9,8 @@ from models.business import Business, BusinessType
 from models.savings import SavingsAccount, SavingsType, SavingsMarking, MarkingStatus, SavingsStatus, PaymentMethod
 from utils.auth import get_current_user
 from utils.response import success_response, error_response
-from store.repositories import SavingsRepository, BusinessRepository, UserRepository
+from utils.tracking_numbers import allocate_tracking_number
+from store.repositories import SavingsRepository, BusinessRepository, UserRepository, RollupRepository
 from schemas.savings import SavingsMarkingResponse, SavingsResponse
 from pydantic import BaseModel
 
@@ -60,8 +61,7 @@ async def add_contribution(
     
     if not account:
         # Create Account
-        import uuid
-        tracking_number = str(uuid.uuid4())[:8].upper()
+        tracking_number = allocate_tracking_number(db)
         account = SavingsAccount(
             customer_id=member.id,
             business_id=business_id if 'business_id' in locals() else member.businesses[0].id, # Fallback
@@ -88,6 +88,8 @@ async def add_contribution(
         created_at=datetime.now(timezone.utc)
     )
     db.add(marking)
+    db.flush()
+    RollupRepository(db).apply_paid_markings([marking.id])
     db.commit()
     
     return success_response(
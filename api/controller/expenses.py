@@ -34,6 +34,7 @@ from service.expenses import (
     delete_expense,
     delete_expense_card,
     expense_planner,
+    export_expenses,
     get_all_expenses,
     get_eligible_savings,
     get_expense_cards,
@@ -56,6 +57,7 @@ from store.repositories import (
 )
 from utils.auth import get_current_user
 from utils.dependencies import get_repository
+from utils.export import EXPORT_FORMAT_PATTERN
 
 
 async def create_expense_card_controller(
@@ -200,19 +202,13 @@ async def get_expense_metrics_controller(
     business_id: int = Query(None, description="Optional business ID filter"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
-    expense_card_repo: ExpenseCardRepository = Depends(
-        get_repository(ExpenseCardRepository)
-    ),
     expense_repo: ExpenseRepository = Depends(get_repository(ExpenseRepository)),
-    user_repo: UserRepository = Depends(get_repository(UserRepository)),
 ):
     return await get_expense_metrics(
         current_user=current_user,
         db=db,
         business_id=business_id,
-        expense_card_repo=expense_card_repo,
         expense_repo=expense_repo,
-        user_repo=user_repo,
     )
 
 
@@ -320,6 +316,8 @@ async def get_all_expenses_controller(
     min_amount: Optional[float] = Query(None),
     max_amount: Optional[float] = Query(None),
     search: Optional[str] = Query(None),
+    after_date: Optional[date] = Query(None, description="Keyset cursor: date of the last expense on the previous page"),
+    after_id: Optional[int] = Query(None, description="Keyset cursor: id of the last expense on the previous page"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
     expense_repo: ExpenseRepository = Depends(get_repository(ExpenseRepository)),
@@ -337,10 +335,36 @@ async def get_all_expenses_controller(
         search=search,
         current_user=current_user,
         db=db,
+        after_date=after_date,
+        after_id=after_id,
         expense_repo=expense_repo,
     )
 
 
+async def export_expenses_controller(
+    fmt: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    category: Optional[str] = Query(None),
+    min_amount: Optional[float] = Query(None),
+    max_amount: Optional[float] = Query(None),
+    search: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user),
+):
+    min_amt = Decimal(str(min_amount)) if min_amount is not None else None
+    max_amt = Decimal(str(max_amount)) if max_amount is not None else None
+    return await export_expenses(
+        fmt=fmt,
+        from_date=from_date,
+        to_date=to_date,
+        category=category,
+        min_amount=min_amt,
+        max_amount=max_amt,
+        search=search,
+        current_user=current_user,
+    )
+
+
 async def update_expense_controller(
     expense_id: int,
     request: ExpenseUpdate,
@@ -25,6 +25,7 @@ from service.payments import (
     create_payment_request,
     delete_account_details,
     delete_payment_account,
+    export_payment_requests,
     get_agent_commissions,
     get_customer_payments,
     get_payment_accounts,
@@ -33,6 +34,7 @@ from service.payments import (
     update_account_details,
     update_payment_account,
 )
+from service.settlements import enqueue_paystack_event
 from store.repositories import (
     AccountDetailsRepository,
     BusinessRepository,
@@ -41,31 +43,23 @@ from store.repositories import (
     PaymentsRepository,
     UserRepository,
     UserNotificationRepository,
-    SavingsRepository,
 )
-from models.financial_advisor import NotificationType, NotificationPriority
-from service.notifications import notify_user, notify_business_admin
 from utils.auth import get_current_user
 from utils.dependencies import get_repository
+from utils.export import EXPORT_FORMAT_PATTERN
 
 
 async def paystack_webhook_controller(
     request: Request,
     db: Session = Depends(get_db),
-    notification_repo: UserNotificationRepository = Depends(get_repository(UserNotificationRepository)),
-    savings_repo: SavingsRepository = Depends(get_repository(SavingsRepository)),
-    business_repo: BusinessRepository = Depends(get_repository(BusinessRepository)),
 ):
     """
-    Handle Paystack webhook events to mark savings as paid.
-    This logic remains controller-specific because it interacts directly with request payloads.
+    Receive Paystack webhook events.
+    Verifies the signature and queues charge events for the settlement worker,
+    so Paystack gets a fast 200 and redeliveries are deduplicated.
     """
     import hashlib
     import hmac
-    from decimal import Decimal
-    from datetime import datetime
-
-    from models.savings import SavingsMarking, SavingsStatus
 
     body = await request.body()
     signature = request.headers.get("x-paystack-signature")
@@ -78,171 +72,7 @@ async def paystack_webhook_controller(
         raise HTTPException(status_code=401, detail="Invalid signature")
 
     payload = await request.json()
-    event = payload.get("event")
-    data = payload.get("data", {})
-    reference = data.get("reference")
-
-    if not reference:
-        raise HTTPException(status_code=400, detail="No reference provided")
-
-    if (
-        db.query(SavingsMarking)
-        .filter(
-            SavingsMarking.payment_reference == reference,
-            SavingsMarking.status == SavingsStatus.PAID.value,
-        )
-        .first()
-    ):
-        return {"status": "success"}
-
-    markings = (
-        db.query(SavingsMarking)
-        .filter(SavingsMarking.payment_reference == reference)
-        .all()
-    )
-    if not markings:
-        return {"status": "success"}
-
-    expected_amount = sum(m.amount for m in markings)
-    amount_paid = Decimal(data.get("amount", 0)) / 100
-
-    if event in ["charge.success", "transfer.success"]:
-        if amount_paid < expected_amount:
-            return {"status": "success"}
-
-        paid_at = data.get("paid_at")
-        paid_at_dt = (
-            datetime.fromisoformat(paid_at.replace("Z", "+00:00"))
-            if paid_at
-            else datetime.utcnow()
-        )
-        from models.savings import SavingsAccount, MarkingStatus
-        
-        for marking in markings:
-            marking.status = SavingsStatus.PAID.value
-            marking.marked_by_id = markings[0].savings_account.customer_id
-            marking.updated_by = marking.marked_by_id
-            marking.updated_at = paid_at_dt
-        
-        # Check if this is a bulk marking (multiple savings accounts)
-        unique_savings_accounts = {}
-        for marking in markings:
-            savings_id = marking.savings_account_id
-            if savings_id not in unique_savings_accounts:
-                unique_savings_accounts[savings_id] = marking.savings_account
-        
-        is_bulk_marking = len(unique_savings_accounts) > 1
-        
-        # If bulk marking, notify each customer about bulk marking
-        if is_bulk_marking:
-            from service.notifications import notify_user
-            from models.financial_advisor import NotificationType, NotificationPriority
-            customers_notified = set()
-            for savings_id, savings_account in unique_savings_accounts.items():
-                if savings_account.customer_id not in customers_notified:
-                    await notify_user(
-                        user_id=savings_account.customer_id,
-                        notification_type=NotificationType.SAVINGS_BULK_MARKED,
-                        title="Multiple Payments Confirmed",
-                        message=f"Multiple payments have been marked for your savings accounts",
-                        priority=NotificationPriority.MEDIUM,
-                        db=db,
-                        notification_repo=notification_repo,
-                        related_entity_id=None,
-                        related_entity_type="savings_marking",
-                    )
-                    customers_notified.add(savings_account.customer_id)
-        
-        # Check if savings account is completed (for single account or each account in bulk)
-        if is_bulk_marking:
-            # Check completion for each savings account in bulk
-            for savings_id, savings_account in unique_savings_accounts.items():
-                all_markings = db.query(SavingsMarking).filter(
-                    SavingsMarking.savings_account_id == savings_id
-                ).all()
-                all_paid = all(m.status == SavingsStatus.PAID.value for m in all_markings)
-                
-                if all_paid and savings_account.marking_status != MarkingStatus.COMPLETED:
-                    savings_account.marking_status = MarkingStatus.COMPLETED
-                    # Notify customer about completion
-                    await notify_user(
-                        user_id=savings_account.customer_id,
-                        notification_type=NotificationType.SAVINGS_ACCOUNT_COMPLETED,
-                        title="Savings Account Completed",
-                        message=f"Congratulations! Your savings account {savings_account.tracking_number} has been completed successfully!",
-                        priority=NotificationPriority.HIGH,
-                        db=db,
-                        notification_repo=notification_repo,
-                        related_entity_id=savings_account.id,
-                        related_entity_type="savings_account",
-                    )
-                    # Notify business admin
-                    if savings_account.business_id:
-                        await notify_business_admin(
-                            business_id=savings_account.business_id,
-                            notification_type=NotificationType.SAVINGS_ACCOUNT_COMPLETED,
-                            title="Savings Account Completed",
-                            message=f"Savings account {savings_account.tracking_number} has been completed.",
-                            priority=NotificationPriority.MEDIUM,
-                            db=db,
-                            business_repo=business_repo,
-                            notification_repo=notification_repo,
-                            related_entity_id=savings_account.id,
-                            related_entity_type="savings_account",
-                        )
-        
-        savings_account = markings[0].savings_account if markings else None
-        if savings_account and not is_bulk_marking:
-            # Check if all markings are paid
-            all_markings = db.query(SavingsMarking).filter(
-                SavingsMarking.savings_account_id == savings_account.id
-            ).all()
-            all_paid = all(m.status == SavingsStatus.PAID.value for m in all_markings)
-            
-            if all_paid and savings_account.marking_status != MarkingStatus.COMPLETED:
-                savings_account.marking_status = MarkingStatus.COMPLETED
-                # Notify customer about completion
-                await notify_user(
-                    user_id=savings_account.customer_id,
-                    notification_type=NotificationType.SAVINGS_ACCOUNT_COMPLETED,
-                    title="Savings Account Completed",
-                    message=f"Congratulations! Your savings account {savings_account.tracking_number} has been completed successfully!",
-                    priority=NotificationPriority.HIGH,
-                    db=db,
-                    notification_repo=notification_repo,
-                    related_entity_id=savings_account.id,
-                    related_entity_type="savings_account",
-                )
-                # Notify business admin
-                if savings_account.business_id:
-                    await notify_business_admin(
-                        business_id=savings_account.business_id,
-                        notification_type=NotificationType.SAVINGS_ACCOUNT_COMPLETED,
-                        title="Savings Account Completed",
-                        message=f"Savings account {savings_account.tracking_number} has been completed.",
-                        priority=NotificationPriority.MEDIUM,
-                        db=db,
-                        business_repo=business_repo,
-                        notification_repo=notification_repo,
-                        related_entity_id=savings_account.id,
-                        related_entity_type="savings_account",
-                    )
-            else:
-                # Notify customer about payment marked
-                await notify_user(
-                    user_id=savings_account.customer_id,
-                    notification_type=NotificationType.SAVINGS_PAYMENT_MARKED,
-                    title="Payment Confirmed",
-                    message=f"Your payment of {amount_paid:.2f} for savings account {savings_account.tracking_number} has been confirmed.",
-                    priority=NotificationPriority.MEDIUM,
-                    db=db,
-                    notification_repo=notification_repo,
-                    related_entity_id=markings[0].id,
-                    related_entity_type="savings_marking",
-                )
-        
-        db.commit()
-
+    enqueue_paystack_event(payload, db)
     return {"status": "success"}
 
 
@@ -478,6 +308,34 @@ async def get_payment_requests_controller(
     )
 
 
+async def export_payment_requests_controller(
+    fmt: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    business_id: Optional[int] = Query(None, description="Filter by business ID"),
+    customer_id: Optional[int] = Query(None, description="Filter by customer ID"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    start_date: Optional[str] = Query(None, description="Start date (ISO format)"),
+    end_date: Optional[str] = Query(None, description="End date (ISO format)"),
+    search: Optional[str] = Query(None, description="Search reference, tracking number, or customer"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    user_repo: UserRepository = Depends(get_repository(UserRepository)),
+    business_repo: BusinessRepository = Depends(get_repository(BusinessRepository)),
+):
+    return await export_payment_requests(
+        fmt=fmt,
+        business_id=business_id,
+        customer_id=customer_id,
+        status_filter=status,
+        start_date=start_date,
+        end_date=end_date,
+        search=search,
+        current_user=current_user,
+        db=db,
+        user_repo=user_repo,
+        business_repo=business_repo,
+    )
+
+
 async def approve_payment_request_controller(
     request_id: int,
     current_user: dict = Depends(get_current_user),
@@ -485,6 +343,7 @@ async def approve_payment_request_controller(
     payments_repo: PaymentsRepository = Depends(get_repository(PaymentsRepository)),
     user_repo: UserRepository = Depends(get_repository(UserRepository)),
     notification_repo: UserNotificationRepository = Depends(get_repository(UserNotificationRepository)),
+    commission_repo: CommissionRepository = Depends(get_repository(CommissionRepository)),
 ):
     return await approve_payment_request(
         request_id=request_id,
@@ -493,6 +352,7 @@ async def approve_payment_request_controller(
         payments_repo=payments_repo,
         user_repo=user_repo,
         notification_repo=notification_repo,
+        commission_repo=commission_repo,
     )
 
 
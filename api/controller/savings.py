@@ -1,6 +1,7 @@
 """
 Savings controller - provides FastAPI endpoints with repository injection.
 """
+from datetime import date
 from typing import Optional
 
 from fastapi import Body, Depends, Query
@@ -24,6 +25,7 @@ from service.savings import (
     create_savings_target,
     delete_savings,
     end_savings_markings,
+    export_savings_markings,
     extend_savings,
     get_all_savings,
     get_monthly_summary,
@@ -43,6 +45,7 @@ from store.repositories import (
 )
 from utils.auth import get_current_user
 from utils.dependencies import get_repository
+from utils.export import EXPORT_FORMAT_PATTERN
 
 
 async def create_daily_savings_controller(
@@ -161,6 +164,30 @@ async def get_all_savings_controller(
     )
 
 
+async def export_savings_markings_controller(
+    fmt: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    business_id: Optional[int] = Query(None, description="Filter by business ID"),
+    tracking_number: Optional[str] = Query(None, description="Filter by tracking number"),
+    status: Optional[str] = Query(None, description="Filter by marking status (pending or paid)"),
+    from_date: Optional[date] = Query(None, description="Earliest marked date"),
+    to_date: Optional[date] = Query(None, description="Latest marked date"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    business_repo: BusinessRepository = Depends(get_repository(BusinessRepository)),
+):
+    return await export_savings_markings(
+        fmt=fmt,
+        business_id=business_id,
+        tracking_number=tracking_number,
+        marking_status=status,
+        from_date=from_date,
+        to_date=to_date,
+        current_user=current_user,
+        db=db,
+        business_repo=business_repo,
+    )
+
+
 async def get_savings_markings_controller(
     tracking_number: str,
     db: Session = Depends(get_db),
@@ -253,6 +280,8 @@ async def confirm_bank_transfer_controller(
 
 async def get_monthly_summary_controller(
     business_id: Optional[int] = Query(None, description="Optional business ID filter"),
+    start_month: Optional[date] = Query(None, description="Optional start of a month range for per-month history"),
+    end_month: Optional[date] = Query(None, description="Optional end of a month range for per-month history"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -260,5 +289,7 @@ async def get_monthly_summary_controller(
         current_user=current_user,
         db=db,
         business_id=business_id,
+        start_month=start_month,
+        end_month=end_month,
     )
 
@@ -11,18 +11,20 @@ import logging
 
 from database.postgres_optimized import get_db
 from utils.auth import get_current_user
-from models.savings import SavingsAccount, SavingsMarking
+from models.savings import SavingsAccount, SavingsMarking, SavingsStatus
 from models.savings_group import SavingsGroup
 
 from schemas.savings_group import (
     SavingsGroupCreate,
     AddGroupMemberRequest,
+    BulkAddGroupMembersRequest,
 )
 from service.savings_group import (
     create_group,
     list_groups,
     get_group,
     add_member_to_group,
+    add_members_to_group_bulk,
     get_group_members,
     delete_group_service,
     get_group_grid_data,
@@ -35,6 +37,7 @@ from store.repositories.savings_group import SavingsGroupRepository
 from store.repositories.savings import SavingsRepository
 from store.repositories.business import BusinessRepository
 from store.repositories.user import UserRepository
+from store.repositories.rollups import RollupRepository
 
 from utils.auth import get_current_user
 from utils.dependencies import get_repository
@@ -50,6 +53,7 @@ async def get_group_markings_grid_controller(
     group_id: int,
     date_page: int = Query(1, ge=1, description="Page of dates"),
     date_limit: int = Query(10, ge=1, le=50, description="Number of dates per page"),
+    encoding: str = Query("map", pattern="^(map|columnar)$", description="Markings encoding: map or columnar"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -81,7 +85,8 @@ async def get_group_markings_grid_controller(
         group_id=group_id,
         db=db,
         date_page=date_page,
-        date_limit=date_limit
+        date_limit=date_limit,
+        encoding=encoding,
     )
 
     if not grid_data:
@@ -90,11 +95,13 @@ async def get_group_markings_grid_controller(
     # Restrict to personal view if only member (not manager)
     if is_member and not is_manager:
         user_tracking = member_account.tracking_number
-        filtered_members = [m for m in grid_data["members"] if m["tracking_number"] == user_tracking]
-        filtered_markings = {user_tracking: grid_data["markings"].get(user_tracking, {})}
+        rows = [i for i, m in enumerate(grid_data["members"]) if m["tracking_number"] == user_tracking]
 
-        grid_data["members"] = filtered_members
-        grid_data["markings"] = filtered_markings
+        grid_data["members"] = [grid_data["members"][i] for i in rows]
+        if "status_rows" in grid_data:
+            grid_data["status_rows"] = [grid_data["status_rows"][i] for i in rows]
+        else:
+            grid_data["markings"] = {user_tracking: grid_data["markings"].get(user_tracking, {})}
         grid_data["view_mode"] = "personal"  # optional frontend hint
 
     return grid_data
@@ -151,9 +158,16 @@ async def toggle_group_marking_controller(
             SavingsMarking.marked_date == date_str
         ).first()
 
+        rollup_repo = RollupRepository(db)
         if marking:
+            was_paid = marking.status == SavingsStatus.PAID
             marking.status = target_status
             marking.marked_by_id = user_id
+            db.flush()
+            if target_status == "paid" and not was_paid:
+                rollup_repo.apply_paid_markings([marking.id])
+            elif target_status != "paid" and was_paid:
+                rollup_repo.revert_paid_markings([marking.id])
         else:
             if target_status == "paid":
                 new_marking = SavingsMarking(
@@ -165,6 +179,10 @@ async def toggle_group_marking_controller(
                     payment_method="manual"
                 )
                 db.add(new_marking)
+                db.flush()
+                rollup_repo.apply_paid_markings([new_marking.id])
+                # An unscheduled period: recount the group rather than patching it
+                rollup_repo.refresh_group_rollups([group_id])
                 marking = new_marking
             else:
                 return {"message": "No change needed", "status": "not_started"}
@@ -304,6 +322,27 @@ async def add_member_controller(
     }
 
 
+async def add_members_bulk_controller(
+    group_id: int,
+    request: BulkAddGroupMembersRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    group_repo: SavingsGroupRepository = Depends(get_repository(SavingsGroupRepository)),
+    business_repo: BusinessRepository = Depends(get_repository(BusinessRepository)),
+    user_repo: UserRepository = Depends(get_repository(UserRepository)),
+):
+    logger.info(f"[CONTROLLER] add_members_bulk_controller - group_id: {group_id}, users: {len(request.user_ids)}")
+    return await add_members_to_group_bulk(
+        group_id=group_id,
+        request=request,
+        current_user=current_user,
+        db=db,
+        group_repo=group_repo,
+        business_repo=business_repo,
+        user_repo=user_repo,
+    )
+
+
 async def get_members_controller(
     group_id: int,
     current_user: dict = Depends(get_current_user),
@@ -346,14 +385,14 @@ async def get_group_metrics(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
     group_repo: SavingsGroupRepository = Depends(get_repository(SavingsGroupRepository)),
-    savings_repo: SavingsRepository = Depends(get_repository(SavingsRepository)),
+    rollup_repo: RollupRepository = Depends(get_repository(RollupRepository)),
 ):
     return await get_group_savings_metrics(
         group_id=group_id,
         current_user=current_user,
         db=db,
         group_repo=group_repo,
-        savings_repo=savings_repo
+        rollup_repo=rollup_repo
     )
 
 
@@ -8,6 +8,7 @@ from api.controller.expenses import (
     delete_expense_card_controller,
     delete_expense_controller,
     expense_planner_controller,
+    export_expenses_controller,
     get_all_expenses_controller,
     get_eligible_savings_controller,
     get_expense_cards_controller,
@@ -147,6 +148,13 @@ expenses_router.add_api_route(
     summary="Get all expenses with filters",
 )
 
+expenses_router.add_api_route(
+    "/export",
+    endpoint=export_expenses_controller,
+    methods=["GET"],
+    summary="Export expenses as CSV or NDJSON",
+)
+
 expenses_router.add_api_route(
     "/{expense_id}",
     endpoint=update_expense_controller,
@@ -8,6 +8,7 @@ from api.controller.payments import (
     create_payment_request_controller,
     delete_account_details_controller,
     delete_payment_account_controller,
+    export_payment_requests_controller,
     get_commissions_controller,
     get_customer_payments_controller,
     get_payment_accounts_controller,
@@ -101,6 +102,13 @@ payments_router.add_api_route(
     summary="List payment requests",
 )
 
+payments_router.add_api_route(
+    "/requests/export",
+    endpoint=export_payment_requests_controller,
+    methods=["GET"],
+    summary="Export payment requests as CSV or NDJSON",
+)
+
 payments_router.add_api_route(
     "/request/{request_id}/approve",
     endpoint=approve_payment_request_controller,
@@ -7,6 +7,7 @@ from api.controller.savings import (
     create_target_savings_controller,
     delete_savings_controller,
     end_savings_markings_controller,
+    export_savings_markings_controller,
     extend_savings_controller,
     get_all_savings_controller,
     get_monthly_summary_controller,
@@ -82,6 +83,13 @@ savings_router.add_api_route(
     summary="List savings accounts with filters",
 )
 
+savings_router.add_api_route(
+    "/markings/export",
+    endpoint=export_savings_markings_controller,
+    methods=["GET"],
+    summary="Export savings markings as CSV or NDJSON",
+)
+
 savings_router.add_api_route(
     "/markings/{tracking_number}",
     endpoint=get_savings_markings_controller,
@@ -5,13 +5,15 @@ from schemas.savings_group import (
     SavingsGroupResponse,
     CreateSavingsGroupResponse,
     PaginatedSavingsGroupsResponse,
-    GroupMemberResponse
+    GroupMemberResponse,
+    BulkAddGroupMembersResponse,
 )
 from api.controller.savings_group import (
     create_group_controller,
     list_groups_controller,
     get_group_controller,
     add_member_controller,
+    add_members_bulk_controller,
     get_members_controller,
     delete_group_controller,
     get_group_markings_grid_controller,
@@ -72,6 +74,14 @@ savings_group_router.add_api_route(
     summary="Add a member to a specific savings group (Business Admin only)",
 )
 
+savings_group_router.add_api_route(
+    "/{group_id}/members/bulk",
+    endpoint=add_members_bulk_controller,
+    methods=["POST"],
+    response_model=BulkAddGroupMembersResponse,
+    summary="Enroll several members into a savings group in one transaction (Business Admin only)",
+)
+
 savings_group_router.add_api_route(
     "/{group_id}/members",
     endpoint=get_members_controller,
@@ -57,6 +57,8 @@ class Settings(BaseSettings):
     OVERSPENDING_ALERT_THRESHOLD: float = 20.0  # percentage increase
     GOAL_BEHIND_SCHEDULE_THRESHOLD: float = 20.0  # percentage behind
     HEALTH_SCORE_UPDATE_DAYS: int = 7  # days between auto-updates
+    EMAIL_SEND_RATE_PER_SECOND: float = 5.0  # SMTP provider limit, per worker process
+    SMS_SEND_RATE_PER_SECOND: float = 10.0  # Termii limit, per worker process
     
     # Score Calculation Weights (should sum to 100)
     SCORE_WEIGHT_EXPENSE_RATIO: int = 30
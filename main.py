@@ -180,6 +180,20 @@ async def on_shutdown():
     except Exception as e:
         logger.error(f"Error during scheduler shutdown: {e}")
     
+    try:
+        from utils.paystack import close_paystack_client
+        await close_paystack_client()
+        logger.info("✓ Paystack client closed")
+    except Exception as e:
+        logger.error(f"Error closing Paystack client: {e}")
+    
+    try:
+        from utils.sms_service import close_sms_client
+        await close_sms_client()
+        logger.info("✓ SMS client closed")
+    except Exception as e:
+        logger.error(f"Error closing SMS client: {e}")
+    
     try:
         from database.postgres_optimized import close_all_connections
         close_all_connections()
@@ -128,8 +128,9 @@ class CachingMiddleware(BaseHTTPMiddleware):
         logger.debug(f"Cache MISS for {request.url.path}")
         response = await call_next(request)
         
-        # Only cache successful responses
-        if response.status_code == 200:
+        # Only cache successful responses; downloads (streamed exports) pass
+        # straight through instead of being read into memory
+        if response.status_code == 200 and not response.headers.get('content-disposition', '').startswith('attachment'):
             try:
                 # Read response body asynchronously
                 body = b""
@@ -0,0 +1,55 @@
+-- Migration: Add Customer Monthly Rollup
+-- Date: 2026-10-18
+-- Description: Per-customer, per-business monthly savings/expense totals that back the
+--              monthly summary endpoint. Maintained incrementally by the application
+--              (RollupRepository) when markings are paid and expenses are recorded.
+-- Rollback: 003_rollback_add_customer_monthly_rollup.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS customer_monthly_rollup (
+    customer_id     INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    business_id     INTEGER NOT NULL REFERENCES businesses(id) ON DELETE CASCADE,
+    month           DATE NOT NULL,
+    savings_total   NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    expense_total   NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (customer_id, business_id, month)
+);
+
+CREATE INDEX IF NOT EXISTS idx_customer_monthly_rollup_customer_month
+    ON customer_monthly_rollup (customer_id, month);
+
+-- Backfill from existing data (savings by marked_date month, expenses by recorded month)
+TRUNCATE customer_monthly_rollup;
+
+INSERT INTO customer_monthly_rollup (customer_id, business_id, month, savings_total, expense_total)
+SELECT customer_id, business_id, month, SUM(savings_total), SUM(expense_total)
+FROM (
+    SELECT sa.customer_id,
+           sa.business_id,
+           date_trunc('month', sm.marked_date)::date AS month,
+           SUM(sm.amount) AS savings_total,
+           0 AS expense_total
+    FROM savings_markings sm
+    JOIN savings_accounts sa ON sa.id = sm.savings_account_id
+    WHERE sm.status = 'paid'
+    GROUP BY sa.customer_id, sa.business_id, date_trunc('month', sm.marked_date)
+
+    UNION ALL
+
+    SELECT ec.customer_id,
+           ec.business_id,
+           date_trunc('month', e.created_at)::date AS month,
+           0 AS savings_total,
+           SUM(e.amount) AS expense_total
+    FROM expenses e
+    JOIN expense_cards ec ON ec.id = e.expense_card_id
+    GROUP BY ec.customer_id, ec.business_id, date_trunc('month', e.created_at)
+) totals
+GROUP BY customer_id, business_id, month;
+
+COMMIT;
+
+-- Verification
+SELECT 'Rollup rows' AS check, COUNT(*) FROM customer_monthly_rollup;
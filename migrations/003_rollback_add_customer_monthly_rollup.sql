@@ -0,0 +1,11 @@
+-- Rollback: Add Customer Monthly Rollup
+-- Date: 2026-10-18
+-- Description: Drops the customer_monthly_rollup table. The monthly summary endpoint
+--              must be reverted to the raw aggregate queries before running this.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_customer_monthly_rollup_customer_month;
+DROP TABLE IF EXISTS customer_monthly_rollup;
+
+COMMIT;
@@ -0,0 +1,33 @@
+-- Migration: Add Payment Settlement Queue
+-- Date: 2026-10-18
+-- Description: Durable queue of Paystack charge events. The webhook verifies the signature
+--              and inserts here; a background settler applies events in batches against
+--              payment_initiations by reference. Verify endpoints become status reads.
+-- Rollback: 004_rollback_add_payment_settlement_queue.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS payment_settlement_events (
+    id              SERIAL PRIMARY KEY,
+    reference       VARCHAR(100) NOT NULL,
+    event           VARCHAR(50) NOT NULL,
+    amount          BIGINT NOT NULL DEFAULT 0,
+    paid_at         TIMESTAMP,
+    payload         JSONB,
+    status          VARCHAR(8) NOT NULL DEFAULT 'pending',
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    last_error      TEXT,
+    received_at     TIMESTAMP NOT NULL DEFAULT NOW(),
+    processed_at    TIMESTAMP,
+    CONSTRAINT uq_payment_settlement_event_reference_event UNIQUE (reference, event)
+);
+
+-- The settler only ever scans pending rows, oldest first
+CREATE INDEX IF NOT EXISTS idx_payment_settlement_events_pending
+    ON payment_settlement_events (id)
+    WHERE status = 'pending';
+
+COMMIT;
+
+-- Verification
+SELECT 'Settlement queue' AS check, COUNT(*) FROM payment_settlement_events;
@@ -0,0 +1,11 @@
+-- Rollback: Add Payment Settlement Queue
+-- Date: 2026-10-18
+-- Description: Drops the payment settlement queue. Any unsettled events are lost;
+--              drain the queue (or let reconciliation pick up pending initiations) first.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_payment_settlement_events_pending;
+DROP TABLE IF EXISTS payment_settlement_events;
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- Migration: Add Tracking Number Sequence
+-- Date: 2026-10-18
+-- Description: Sequence behind savings tracking numbers. utils/tracking_numbers.py maps each
+--              sequence value through a fixed permutation of 0..9999999999, so numbers stay
+--              10 digits and non-sequential without a uniqueness lookup before insert.
+-- Rollback: 005_rollback_add_tracking_number_sequence.sql
+
+BEGIN;
+
+CREATE SEQUENCE IF NOT EXISTS savings_tracking_number_seq
+    START WITH 1
+    MINVALUE 1
+    MAXVALUE 9999999999
+    NO CYCLE;
+
+COMMIT;
+
+-- Verification
+SELECT 'Tracking number sequence' AS check, last_value FROM savings_tracking_number_seq;
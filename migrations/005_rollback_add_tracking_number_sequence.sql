@@ -0,0 +1,10 @@
+-- Rollback: Add Tracking Number Sequence
+-- Date: 2026-10-18
+-- Description: Drops the tracking number sequence. Re-creating it restarts at 1 and would
+--              re-issue numbers already in use, so restore last_value if it is ever re-added.
+
+BEGIN;
+
+DROP SEQUENCE IF EXISTS savings_tracking_number_seq;
+
+COMMIT;
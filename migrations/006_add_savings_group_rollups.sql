@@ -0,0 +1,60 @@
+-- Migration: Add Savings Group Rollups
+-- Date: 2026-10-18
+-- Description: Per-group member/target/collected totals and per-period marking counts
+--              behind the group metrics and cooperative business summary endpoints.
+--              Maintained incrementally by the application (RollupRepository) when
+--              members join and markings are paid.
+-- Rollback: 006_rollback_add_savings_group_rollups.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS savings_group_rollup (
+    group_id        INTEGER PRIMARY KEY REFERENCES savings_groups(id) ON DELETE CASCADE,
+    business_id     INTEGER NOT NULL REFERENCES businesses(id) ON DELETE CASCADE,
+    member_count    INTEGER NOT NULL DEFAULT 0,
+    target_total    NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    collected_total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_savings_group_rollup_business
+    ON savings_group_rollup (business_id);
+
+CREATE TABLE IF NOT EXISTS savings_group_period_rollup (
+    group_id        INTEGER NOT NULL REFERENCES savings_groups(id) ON DELETE CASCADE,
+    period_date     DATE NOT NULL,
+    scheduled_count INTEGER NOT NULL DEFAULT 0,
+    paid_count      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (group_id, period_date)
+);
+
+-- Backfill from existing groups and markings
+TRUNCATE savings_group_rollup, savings_group_period_rollup;
+
+INSERT INTO savings_group_rollup (group_id, business_id, member_count, target_total, collected_total)
+SELECT g.id,
+       g.business_id,
+       COUNT(DISTINCT sa.id),
+       COALESCE(SUM(sm.amount), 0),
+       COALESCE(SUM(sm.amount) FILTER (WHERE sm.status = 'paid'), 0)
+FROM savings_groups g
+LEFT JOIN savings_accounts sa ON sa.group_id = g.id
+LEFT JOIN savings_markings sm ON sm.savings_account_id = sa.id
+GROUP BY g.id, g.business_id;
+
+INSERT INTO savings_group_period_rollup (group_id, period_date, scheduled_count, paid_count)
+SELECT sa.group_id,
+       sm.marked_date,
+       COUNT(*),
+       COUNT(*) FILTER (WHERE sm.status = 'paid')
+FROM savings_markings sm
+JOIN savings_accounts sa ON sa.id = sm.savings_account_id
+WHERE sa.group_id IS NOT NULL
+GROUP BY sa.group_id, sm.marked_date;
+
+COMMIT;
+
+-- Verification
+SELECT 'Group rollup rows' AS check, COUNT(*) FROM savings_group_rollup
+UNION ALL
+SELECT 'Group period rollup rows', COUNT(*) FROM savings_group_period_rollup;
@@ -0,0 +1,12 @@
+-- Rollback: Add Savings Group Rollups
+-- Date: 2026-10-18
+-- Description: Drops the savings group rollup tables. Group metrics and the cooperative
+--              summary read from them, so roll back the application first.
+
+BEGIN;
+
+DROP TABLE IF EXISTS savings_group_period_rollup;
+DROP INDEX IF EXISTS idx_savings_group_rollup_business;
+DROP TABLE IF EXISTS savings_group_rollup;
+
+COMMIT;
@@ -0,0 +1,92 @@
+-- Migration: Add Daily Analytics Facts
+-- Date: 2026-10-18
+-- Description: Daily fact tables for system-wide savings, payment and signup analytics,
+--              refreshed incrementally by the scheduler (RollupRepository.refresh_daily_facts)
+--              from rows changed since each source's watermark.
+-- Rollback: 007_rollback_add_daily_analytics_facts.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS daily_savings_facts (
+    day            DATE NOT NULL,
+    business_id    INTEGER NOT NULL REFERENCES businesses(id) ON DELETE CASCADE,
+    status         VARCHAR(20) NOT NULL,
+    payment_method VARCHAR(20) NOT NULL DEFAULT '',
+    marking_count  INTEGER NOT NULL DEFAULT 0,
+    amount         NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, business_id, status, payment_method)
+);
+
+CREATE TABLE IF NOT EXISTS daily_payment_facts (
+    day           DATE NOT NULL,
+    status        VARCHAR(20) NOT NULL,
+    request_count INTEGER NOT NULL DEFAULT 0,
+    amount        NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, status)
+);
+
+CREATE TABLE IF NOT EXISTS daily_signup_facts (
+    day          DATE NOT NULL,
+    role         VARCHAR(30) NOT NULL,
+    signup_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, role)
+);
+
+CREATE TABLE IF NOT EXISTS analytics_fact_watermarks (
+    source            VARCHAR(50) PRIMARY KEY,
+    refreshed_through TIMESTAMPTZ NOT NULL
+);
+
+-- Find rows written since the last refresh, and re-aggregate a day's rows
+CREATE INDEX IF NOT EXISTS idx_savings_markings_changed_at
+    ON savings_markings ((COALESCE(updated_at, created_at)));
+CREATE INDEX IF NOT EXISTS idx_savings_markings_marked_date
+    ON savings_markings (marked_date);
+CREATE INDEX IF NOT EXISTS idx_payment_requests_changed_at
+    ON payment_requests ((COALESCE(updated_at, created_at)));
+CREATE INDEX IF NOT EXISTS idx_payment_requests_settled_at
+    ON payment_requests ((COALESCE(approval_date, request_date)));
+CREATE INDEX IF NOT EXISTS idx_users_changed_at
+    ON users ((COALESCE(updated_at, created_at)));
+CREATE INDEX IF NOT EXISTS idx_users_created_at
+    ON users (created_at);
+
+-- Backfill from existing rows
+TRUNCATE daily_savings_facts, daily_payment_facts, daily_signup_facts, analytics_fact_watermarks;
+
+INSERT INTO daily_savings_facts (day, business_id, status, payment_method, marking_count, amount)
+SELECT sm.marked_date,
+       sa.business_id,
+       sm.status::text,
+       COALESCE(sm.payment_method::text, ''),
+       COUNT(*),
+       SUM(sm.amount)
+FROM savings_markings sm
+JOIN savings_accounts sa ON sa.id = sm.savings_account_id
+GROUP BY sm.marked_date, sa.business_id, sm.status, sm.payment_method;
+
+INSERT INTO daily_payment_facts (day, status, request_count, amount)
+SELECT COALESCE(approval_date, request_date)::date,
+       status::text,
+       COUNT(*),
+       SUM(amount)
+FROM payment_requests
+GROUP BY COALESCE(approval_date, request_date)::date, status;
+
+INSERT INTO daily_signup_facts (day, role, signup_count)
+SELECT created_at::date, role::text, COUNT(*)
+FROM users
+WHERE created_at IS NOT NULL
+GROUP BY created_at::date, role;
+
+INSERT INTO analytics_fact_watermarks (source, refreshed_through)
+VALUES ('savings_markings', NOW()), ('payment_requests', NOW()), ('users', NOW());
+
+COMMIT;
+
+-- Verification
+SELECT 'Daily savings fact rows' AS check, COUNT(*) FROM daily_savings_facts
+UNION ALL
+SELECT 'Daily payment fact rows', COUNT(*) FROM daily_payment_facts
+UNION ALL
+SELECT 'Daily signup fact rows', COUNT(*) FROM daily_signup_facts;
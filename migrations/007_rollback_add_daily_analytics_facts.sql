@@ -0,0 +1,20 @@
+-- Rollback: Add Daily Analytics Facts
+-- Date: 2026-10-18
+-- Description: Drops the daily analytics fact tables and their source indexes. The
+--              analytics repositories read from these tables, so roll back the application first.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_users_created_at;
+DROP INDEX IF EXISTS idx_users_changed_at;
+DROP INDEX IF EXISTS idx_payment_requests_settled_at;
+DROP INDEX IF EXISTS idx_payment_requests_changed_at;
+DROP INDEX IF EXISTS idx_savings_markings_marked_date;
+DROP INDEX IF EXISTS idx_savings_markings_changed_at;
+
+DROP TABLE IF EXISTS analytics_fact_watermarks;
+DROP TABLE IF EXISTS daily_signup_facts;
+DROP TABLE IF EXISTS daily_payment_facts;
+DROP TABLE IF EXISTS daily_savings_facts;
+
+COMMIT;
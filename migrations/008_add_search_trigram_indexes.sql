@@ -0,0 +1,44 @@
+-- Migration: Add Search Trigram Indexes
+-- Date: 2026-10-18
+-- Description: pg_trgm GIN indexes on the lowercased columns universal search matches
+--              with LIKE '%term%' and ranks by similarity(), so a search no longer scans
+--              users, businesses, savings_accounts and payment_requests.
+-- Rollback: 008_rollback_add_search_trigram_indexes.sql
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Users
+CREATE INDEX IF NOT EXISTS idx_users_full_name_trgm
+    ON users USING gin (lower(full_name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_email_trgm
+    ON users USING gin (lower(email) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_phone_number_trgm
+    ON users USING gin (lower(phone_number) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm
+    ON users USING gin (lower(username) gin_trgm_ops);
+
+-- Businesses
+CREATE INDEX IF NOT EXISTS idx_businesses_name_trgm
+    ON businesses USING gin (lower(name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_businesses_unique_code_trgm
+    ON businesses USING gin (lower(unique_code) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_businesses_address_trgm
+    ON businesses USING gin (lower(address) gin_trgm_ops);
+
+-- Savings accounts and payment requests
+CREATE INDEX IF NOT EXISTS idx_savings_accounts_tracking_number_trgm
+    ON savings_accounts USING gin (lower(tracking_number) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_payment_requests_reference_trgm
+    ON payment_requests USING gin (lower(reference) gin_trgm_ops);
+-- Payment requests matched through their savings account's tracking number
+CREATE INDEX IF NOT EXISTS idx_payment_requests_savings_account_id
+    ON payment_requests (savings_account_id);
+
+COMMIT;
+
+-- Verification
+SELECT indexname FROM pg_indexes
+WHERE indexname LIKE '%\_trgm' OR indexname = 'idx_payment_requests_savings_account_id'
+ORDER BY indexname;
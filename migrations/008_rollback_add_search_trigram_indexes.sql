@@ -0,0 +1,19 @@
+-- Rollback: Add Search Trigram Indexes
+-- Date: 2026-10-18
+-- Description: Drops the universal search indexes. Search keeps working (by scanning),
+--              but similarity() needs pg_trgm, so the extension itself is left installed.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_payment_requests_savings_account_id;
+DROP INDEX IF EXISTS idx_payment_requests_reference_trgm;
+DROP INDEX IF EXISTS idx_savings_accounts_tracking_number_trgm;
+DROP INDEX IF EXISTS idx_businesses_address_trgm;
+DROP INDEX IF EXISTS idx_businesses_unique_code_trgm;
+DROP INDEX IF EXISTS idx_businesses_name_trgm;
+DROP INDEX IF EXISTS idx_users_username_trgm;
+DROP INDEX IF EXISTS idx_users_phone_number_trgm;
+DROP INDEX IF EXISTS idx_users_email_trgm;
+DROP INDEX IF EXISTS idx_users_full_name_trgm;
+
+COMMIT;
@@ -0,0 +1,26 @@
+-- Migration: Add Expense Search Indexes
+-- Date: 2026-10-18
+-- Description: Indexes for the all-expenses listing: pg_trgm GIN indexes on the lowercased
+--              expense description and card name it searches with LIKE '%term%', and a
+--              (expense_card_id, date, id) index for its newest-first keyset pages.
+-- Rollback: 009_rollback_add_expense_search_indexes.sql
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_expenses_description_trgm
+    ON expenses USING gin (lower(description) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_expense_cards_name_trgm
+    ON expense_cards USING gin (lower(name) gin_trgm_ops);
+
+-- Keyset pagination on (date, id) within a customer's cards
+CREATE INDEX IF NOT EXISTS idx_expenses_card_date_id
+    ON expenses (expense_card_id, date DESC, id DESC);
+
+COMMIT;
+
+-- Verification
+SELECT indexname FROM pg_indexes
+WHERE indexname IN ('idx_expenses_description_trgm', 'idx_expense_cards_name_trgm', 'idx_expenses_card_date_id')
+ORDER BY indexname;
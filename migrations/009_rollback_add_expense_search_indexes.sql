@@ -0,0 +1,12 @@
+-- Rollback: Add Expense Search Indexes
+-- Date: 2026-10-18
+-- Description: Drops the all-expenses listing indexes. The listing keeps working by scanning;
+--              pg_trgm is left installed because universal search (008) needs it.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_expenses_card_date_id;
+DROP INDEX IF EXISTS idx_expense_cards_name_trgm;
+DROP INDEX IF EXISTS idx_expenses_description_trgm;
+
+COMMIT;
@@ -0,0 +1,33 @@
+-- Migration: Add Outbound Message Queue
+-- Date: 2026-10-18
+-- Description: Durable queue of outgoing emails and SMS. Handlers insert rows in their own
+--              transaction; a background worker sends due rows in batches over one SMTP
+--              session / pooled Termii client, paced to provider limits, retrying with backoff.
+-- Rollback: 010_rollback_add_outbound_message_queue.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS outbound_messages (
+    id               SERIAL PRIMARY KEY,
+    channel          VARCHAR(5) NOT NULL,
+    recipient        VARCHAR(255) NOT NULL,
+    subject          VARCHAR(255),
+    body             TEXT NOT NULL,
+    text_body        TEXT,
+    status           VARCHAR(7) NOT NULL DEFAULT 'pending',
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at  TIMESTAMP NOT NULL DEFAULT NOW(),
+    last_error       TEXT,
+    created_at       TIMESTAMP NOT NULL DEFAULT NOW(),
+    sent_at          TIMESTAMP
+);
+
+-- The worker only ever scans pending rows per channel, soonest due first
+CREATE INDEX IF NOT EXISTS idx_outbound_messages_due
+    ON outbound_messages (channel, next_attempt_at)
+    WHERE status = 'pending';
+
+COMMIT;
+
+-- Verification
+SELECT 'Outbound queue' AS check, COUNT(*) FROM outbound_messages;
@@ -0,0 +1,11 @@
+-- Rollback: Add Outbound Message Queue
+-- Date: 2026-10-18
+-- Description: Drops the outbound message queue. Any unsent emails and SMS are lost;
+--              let the worker drain the queue first.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_outbound_messages_due;
+DROP TABLE IF EXISTS outbound_messages;
+
+COMMIT;
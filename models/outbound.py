@@ -0,0 +1,64 @@
+from sqlalchemy import Column, Integer, String, Text, Enum, DateTime, Index, text
+from database.postgres_optimized import Base
+from enum import Enum as PyEnum
+from datetime import datetime
+
+
+class OutboundChannel(str, PyEnum):
+    EMAIL = "email"
+    SMS = "sms"
+
+
+class OutboundStatus(str, PyEnum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class OutboundMessage(Base):
+    """
+    Durable queue of emails and SMS awaiting delivery.
+
+    Handlers insert a row in their own transaction and return; the delivery
+    worker sends due rows in batches over one SMTP session / pooled HTTP
+    client per channel, paced to the provider's rate limit, and reschedules
+    failures with exponential backoff through ``next_attempt_at``.
+    """
+    __tablename__ = "outbound_messages"
+
+    id = Column(Integer, primary_key=True)
+    channel = Column(
+        Enum(
+            OutboundChannel,
+            values_callable=lambda cls: [e.value for e in cls],
+            native_enum=False,
+        ),
+        nullable=False,
+    )
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=True)  # email only
+    body = Column(Text, nullable=False)  # HTML for email, the message text for SMS
+    text_body = Column(Text, nullable=True)  # plain-text email alternative
+    status = Column(
+        Enum(
+            OutboundStatus,
+            values_callable=lambda cls: [e.value for e in cls],
+            native_enum=False,
+        ),
+        default=OutboundStatus.PENDING.value,
+        nullable=False,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "idx_outbound_messages_due",
+            "channel",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
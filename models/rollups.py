@@ -0,0 +1,113 @@
+from sqlalchemy import Column, Integer, Date, Numeric, ForeignKey, DateTime, Index, String
+from sqlalchemy.sql import func
+from database.postgres_optimized import Base
+
+
+class CustomerMonthlyRollup(Base):
+    """
+    Per-customer, per-business monthly savings and expense totals.
+
+    Rows are maintained incrementally by RollupRepository whenever markings
+    are paid or expenses are recorded, so summaries never rescan the raw
+    savings_markings / expenses tables.
+    """
+    __tablename__ = "customer_monthly_rollup"
+
+    customer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    business_id = Column(Integer, ForeignKey("businesses.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month
+    savings_total = Column(Numeric(14, 2), nullable=False, default=0)
+    expense_total = Column(Numeric(14, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("idx_customer_monthly_rollup_customer_month", "customer_id", "month"),
+    )
+
+
+class SavingsGroupRollup(Base):
+    """
+    Per-group cooperative totals: members, scheduled (target) and collected amounts.
+
+    Maintained incrementally by RollupRepository as members join and
+    markings are paid. Business summaries add up these rows instead of
+    scanning every marking in the business.
+    """
+    __tablename__ = "savings_group_rollup"
+
+    group_id = Column(Integer, ForeignKey("savings_groups.id", ondelete="CASCADE"), primary_key=True)
+    business_id = Column(Integer, ForeignKey("businesses.id", ondelete="CASCADE"), nullable=False)
+    member_count = Column(Integer, nullable=False, default=0)
+    target_total = Column(Numeric(14, 2), nullable=False, default=0)
+    collected_total = Column(Numeric(14, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("idx_savings_group_rollup_business", "business_id"),
+    )
+
+
+class SavingsGroupPeriodRollup(Base):
+    """
+    Per-group, per-contribution-date marking counts.
+
+    Lets group metrics count scheduled and paid periods from one row per
+    period rather than ``COUNT(DISTINCT marked_date)`` over every member's
+    markings.
+    """
+    __tablename__ = "savings_group_period_rollup"
+
+    group_id = Column(Integer, ForeignKey("savings_groups.id", ondelete="CASCADE"), primary_key=True)
+    period_date = Column(Date, primary_key=True)
+    scheduled_count = Column(Integer, nullable=False, default=0)
+    paid_count = Column(Integer, nullable=False, default=0)
+
+
+class DailySavingsFact(Base):
+    """
+    Savings markings per day, business, status and payment method.
+
+    Rebuilt day by day by ``RollupRepository.refresh_daily_facts`` so
+    system-wide savings analytics read one row per day instead of scanning
+    savings_markings. ``payment_method`` is '' for markings without one.
+    """
+    __tablename__ = "daily_savings_facts"
+
+    day = Column(Date, primary_key=True)  # savings_markings.marked_date
+    business_id = Column(Integer, ForeignKey("businesses.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    payment_method = Column(String(20), primary_key=True, default="")
+    marking_count = Column(Integer, nullable=False, default=0)
+    amount = Column(Numeric(16, 2), nullable=False, default=0)
+
+
+class DailyPaymentFact(Base):
+    """
+    Payment requests per day and status.
+
+    A request is counted on the day it was approved, or the day it was
+    requested while it has no approval date.
+    """
+    __tablename__ = "daily_payment_facts"
+
+    day = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    request_count = Column(Integer, nullable=False, default=0)
+    amount = Column(Numeric(16, 2), nullable=False, default=0)
+
+
+class DailySignupFact(Base):
+    """New users per signup day and (current) role."""
+    __tablename__ = "daily_signup_facts"
+
+    day = Column(Date, primary_key=True)
+    role = Column(String(30), primary_key=True)
+    signup_count = Column(Integer, nullable=False, default=0)
+
+
+class AnalyticsFactWatermark(Base):
+    """How far each daily fact table has been refreshed from its source table."""
+    __tablename__ = "analytics_fact_watermarks"
+
+    source = Column(String(50), primary_key=True)
+    refreshed_through = Column(DateTime(timezone=True), nullable=False)
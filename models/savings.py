@@ -9,6 +9,11 @@ from sqlalchemy import (
     JSON,
     Enum,
     DateTime,
+    BigInteger,
+    Text,
+    Index,
+    Sequence,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -47,6 +52,24 @@ class PaymentInitiationStatus(str, PyEnum):
     CANCELLED = "cancelled"
 
 
+class SettlementEventStatus(str, PyEnum):
+    PENDING = "pending"
+    APPLIED = "applied"
+    IGNORED = "ignored"
+    FAILED = "failed"
+
+
+# Source of tracking numbers; values are scrambled by utils.tracking_numbers
+tracking_number_seq = Sequence(
+    "savings_tracking_number_seq",
+    start=1,
+    minvalue=1,
+    maxvalue=9_999_999_999,
+    cycle=False,
+    metadata=Base.metadata,
+)
+
+
 class SavingsAccount(AuditMixin, Base):
     __tablename__ = "savings_accounts"
     
@@ -159,4 +182,44 @@ class PaymentInitiation(Base):
 
     @property
     def display(self):
-        return self.__repr__()
\ No newline at end of file
+        return self.__repr__()
+
+
+class PaymentSettlementEvent(Base):
+    """
+    Durable queue of Paystack charge events awaiting settlement.
+
+    The webhook only verifies the signature and inserts a row here; the
+    settler applies rows in batches against PaymentInitiation by reference.
+    (reference, event) is unique so Paystack's redeliveries are no-ops.
+    """
+    __tablename__ = "payment_settlement_events"
+
+    id = Column(Integer, primary_key=True)
+    reference = Column(String(100), nullable=False)
+    event = Column(String(50), nullable=False)
+    amount = Column(BigInteger, nullable=False, default=0)  # kobo, as sent by Paystack
+    paid_at = Column(DateTime, nullable=True)
+    payload = Column(JSONB, nullable=True)
+    status = Column(
+        Enum(
+            SettlementEventStatus,
+            values_callable=lambda cls: [e.value for e in cls],
+            native_enum=False,
+        ),
+        default=SettlementEventStatus.PENDING.value,
+        nullable=False,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("reference", "event", name="uq_payment_settlement_event_reference_event"),
+        Index(
+            "idx_payment_settlement_events_pending",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
@@ -68,6 +68,26 @@ class AddGroupMemberRequest(BaseModel):
     start_date: Optional[date] = None
 
 
+class BulkAddGroupMembersRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=500)
+    start_date: Optional[date] = None
+
+
+class BulkGroupMemberResult(BaseModel):
+    user_id: int
+    status: str  # added | already_member | not_found | invalid_role | duplicate
+    savings_account_id: Optional[int] = None
+    tracking_number: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class BulkAddGroupMembersResponse(BaseModel):
+    message: str
+    added: int
+    skipped: int
+    results: List[BulkGroupMemberResult]
+
+
 class GroupMemberResponse(BaseModel):
     user_id: int
     savings_account_id: int
@@ -0,0 +1,190 @@
+"""
+Benchmark BusinessRepository.get_business_performance_metrics.
+
+Seeds businesses with users, units, savings accounts and markings inside a
+transaction, then times the per-dimension aggregate query against the
+previous single fan-out join (kept here as ``fanout_metrics``) and checks
+both against totals computed in Python from the seeded rows. Everything is
+rolled back afterwards.
+
+Usage:
+    python scripts/benchmark_business_performance_metrics.py [--businesses 10] [--users 20] [--units 5] [--accounts 20] [--days 30] [--runs 5]
+"""
+import argparse
+import logging
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add the parent directory to python path to allow imports
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv(current_dir.parent / ".env")
+
+from sqlalchemy import case, create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+import main  # noqa: F401  - registers every model on Base
+from config.settings import settings
+from models.business import Business, Unit
+from models.savings import MarkingStatus, SavingsAccount, SavingsMarking, SavingsStatus, SavingsType
+from models.user import User
+from models.user_business import user_business
+from store.repositories.business import BusinessRepository
+
+logging.disable(logging.INFO)
+
+engine = create_engine(settings.POSTGRES_URI)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def fanout_metrics(db):
+    """The previous implementation: one outer join across every dimension."""
+    total_volume = func.coalesce(func.sum(SavingsMarking.amount), 0)
+    paid_volume = func.coalesce(func.sum(case((SavingsMarking.status == "paid", SavingsMarking.amount), else_=0)), 0)
+    pending_volume = func.coalesce(func.sum(case((SavingsMarking.status == "pending", SavingsMarking.amount), else_=0)), 0)
+    rows = (
+        db.query(
+            Business.id.label("business_id"),
+            func.count(func.distinct(user_business.c.user_id)).label("total_users"),
+            func.count(func.distinct(Unit.id)).label("total_units"),
+            func.count(func.distinct(SavingsAccount.id)).label("total_savings_accounts"),
+            total_volume.label("total_volume"),
+            paid_volume.label("paid_volume"),
+            pending_volume.label("pending_volume"),
+        )
+        .outerjoin(user_business, user_business.c.business_id == Business.id)
+        .outerjoin(Unit, Unit.business_id == Business.id)
+        .outerjoin(SavingsAccount, SavingsAccount.business_id == Business.id)
+        .outerjoin(SavingsMarking, SavingsMarking.savings_account_id == SavingsAccount.id)
+        .group_by(Business.id)
+        .all()
+    )
+    return {row.business_id: row._asdict() for row in rows}
+
+
+def seed(db, businesses: int, users: int, units: int, accounts: int, days: int):
+    now = datetime.now(timezone.utc)
+    tag = uuid.uuid4().hex[:6]
+    start = date.today()
+    amount = Decimal("100")
+    expected = {}
+    for b in range(businesses):
+        agent = User(full_name="Bench Agent", phone_number=f"ba{tag}{b}", email=f"ba{tag}{b}@bench.local",
+                     username=f"ba{tag}{b}", pin="x", role="agent", created_at=now)
+        db.add(agent)
+        db.flush()
+        business = Business(name=f"Bench {tag} {b}", agent_id=agent.id, unique_code=f"b{tag}{b:03d}", created_at=now)
+        db.add(business)
+        db.flush()
+
+        customers = [
+            User(full_name="Bench Customer", phone_number=f"bc{tag}{b}_{u}", email=f"bc{tag}{b}_{u}@bench.local",
+                 username=f"bc{tag}{b}_{u}", pin="x", role="customer", created_at=now)
+            for u in range(users)
+        ]
+        db.add_all(customers)
+        unit_rows = [Unit(name=f"Bench {n}", business_id=business.id) for n in range(units)]
+        db.add_all(unit_rows)
+        db.flush()
+        db.execute(insert(user_business), [{"user_id": c.id, "business_id": business.id} for c in customers])
+
+        account_rows = [
+            SavingsAccount(
+                customer_id=customers[a % users].id, business_id=business.id, unit_id=unit_rows[a % units].id,
+                tracking_number=f"{tag}{b:02d}{a:02d}"[-10:], savings_type=SavingsType.DAILY,
+                daily_amount=amount, duration_months=1, start_date=start,
+                end_date=start + timedelta(days=days - 1), commission_days=30,
+                commission_amount=amount, target_amount=amount * days,
+                marking_status=MarkingStatus.NOT_STARTED, created_at=now,
+            )
+            for a in range(accounts)
+        ]
+        db.add_all(account_rows)
+        db.flush()
+        paid = 0
+        markings = []
+        for account in account_rows:
+            for d in range(days):
+                status = SavingsStatus.PAID if d % 3 == 0 else SavingsStatus.PENDING
+                paid += status == SavingsStatus.PAID
+                markings.append({
+                    "savings_account_id": account.id, "unit_id": account.unit_id,
+                    "marked_date": start + timedelta(days=d), "amount": amount,
+                    "status": status, "created_at": now,
+                })
+        db.execute(insert(SavingsMarking), markings)
+
+        total = len(markings)
+        expected[business.id] = {
+            "total_users": users,
+            "total_units": units,
+            "total_savings_accounts": accounts,
+            "total_volume": amount * total,
+            "paid_volume": amount * paid,
+            "pending_volume": amount * (total - paid),
+        }
+    db.flush()
+    return expected
+
+
+def check(label, rows, expected):
+    fields = list(next(iter(expected.values())))
+    wrong = sum(
+        1 for business_id, totals in expected.items()
+        if any(Decimal(rows[business_id][f] or 0) != Decimal(totals[f]) for f in fields)
+    )
+    sample_id = next(iter(expected))
+    sample = {f: rows[sample_id][f] for f in ("total_volume", "paid_volume", "pending_volume")}
+    print(f"  {label}: {len(expected) - wrong}/{len(expected)} businesses correct, e.g. {sample}")
+
+
+def time_runs(fn, runs: int):
+    fn()  # warm-up
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main_benchmark(businesses: int, users: int, units: int, accounts: int, days: int, runs: int):
+    db = SessionLocal()
+    try:
+        expected = seed(db, businesses, users, units, accounts, days)
+        repo = BusinessRepository(db)
+        print(f"get_business_performance_metrics: {businesses} businesses x "
+              f"{users} users, {units} units, {accounts} accounts x {days} days, {runs} runs")
+        print(f"  expected e.g. {next(iter(expected.values()))}")
+
+        current = {row["business_id"]: row for row in repo.get_business_performance_metrics()}
+        check("aggregated", current, expected)
+        check("fan-out   ", fanout_metrics(db), expected)
+
+        aggregated_ms = time_runs(repo.get_business_performance_metrics, runs)
+        fanout_ms = time_runs(lambda: fanout_metrics(db), runs)
+        print(f"  aggregated median {aggregated_ms:.1f} ms")
+        print(f"  fan-out    median {fanout_ms:.1f} ms ({fanout_ms / aggregated_ms:.1f}x slower)")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--businesses", type=int, default=10)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--units", type=int, default=5)
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main_benchmark(args.businesses, args.users, args.units, args.accounts, args.days, args.runs)
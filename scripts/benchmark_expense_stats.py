@@ -0,0 +1,160 @@
+"""
+Benchmark the savings contribution and payout part of get_expense_stats.
+
+Seeds one customer with many completed savings plans (all markings paid)
+inside a transaction, then times the grouped aggregate used by
+get_expense_stats against the previous per-account implementation (kept
+here as ``legacy_contribution_and_payout``) and checks both agree.
+Everything is rolled back afterwards.
+
+Usage:
+    python scripts/benchmark_expense_stats.py [--accounts 200] [--days 90] [--runs 5]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add the parent directory to python path to allow imports
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv(current_dir.parent / ".env")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import main  # noqa: F401  - registers every model on Base
+from config.settings import settings
+from models.business import Business, Unit
+from models.savings import MarkingStatus, SavingsAccount, SavingsMarking, SavingsStatus, SavingsType
+from models.user import User
+from service.expenses import get_expense_stats
+
+logging.disable(logging.INFO)
+
+engine = create_engine(settings.POSTGRES_URI)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def legacy_contribution_and_payout(db, customer_id: int):
+    """The previous implementation: all paid markings, then three queries per completed account."""
+    markings = db.query(SavingsMarking).join(SavingsAccount).filter(
+        SavingsAccount.customer_id == customer_id,
+        SavingsMarking.status == SavingsStatus.PAID,
+    ).all()
+    accounts = db.query(SavingsAccount).filter(
+        SavingsAccount.customer_id == customer_id,
+        SavingsAccount.marking_status == MarkingStatus.COMPLETED,
+    ).all()
+
+    def paid(account):
+        return db.query(SavingsMarking).filter(
+            SavingsMarking.savings_account_id == account.id,
+            SavingsMarking.status == SavingsStatus.PAID,
+        ).all()
+
+    payout = sum(
+        sum(m.amount for m in paid(account)) - (account.commission_amount * Decimal(
+            ((max(m.marked_date for m in paid(account)) - min(m.marked_date for m in paid(account))).days + 1)
+            / account.commission_days
+        ) if account.commission_days > 0 else 0)
+        for account in accounts
+    )
+    return sum(m.amount for m in markings), payout
+
+
+def seed(db, accounts: int, days: int) -> User:
+    now = datetime.now(timezone.utc)
+    tag = uuid.uuid4().hex[:6]
+    agent = User(full_name="Bench Agent", phone_number=f"ea{tag}", email=f"ea{tag}@bench.local",
+                 username=f"ea{tag}", pin="x", role="agent", created_at=now)
+    customer = User(full_name="Bench Customer", phone_number=f"ec{tag}", email=f"ec{tag}@bench.local",
+                    username=f"ec{tag}", pin="x", role="customer", created_at=now)
+    db.add_all([agent, customer])
+    db.flush()
+    business = Business(name=f"Bench {tag}", agent_id=agent.id, unique_code=f"e{tag}", created_at=now)
+    db.add(business)
+    db.flush()
+    unit = Unit(name="Bench", business_id=business.id)
+    db.add(unit)
+    db.flush()
+
+    start = date.today() - timedelta(days=days * 2)
+    rows = [
+        SavingsAccount(
+            customer_id=customer.id, business_id=business.id, unit_id=unit.id,
+            tracking_number=f"e{tag}{a:03d}"[-10:], savings_type=SavingsType.DAILY,
+            daily_amount=Decimal("150"), duration_months=3, start_date=start,
+            end_date=start + timedelta(days=days - 1), commission_days=30 if a % 5 else 0,
+            commission_amount=Decimal("150"), target_amount=Decimal("150") * days,
+            marking_status=MarkingStatus.COMPLETED, created_at=now,
+        )
+        for a in range(accounts)
+    ]
+    db.add_all(rows)
+    db.flush()
+    db.execute(insert(SavingsMarking), [
+        {
+            "savings_account_id": account.id, "unit_id": unit.id,
+            "marked_date": start + timedelta(days=d), "amount": account.daily_amount,
+            "status": SavingsStatus.PAID, "created_at": now,
+        }
+        for a, account in enumerate(rows)
+        for d in range(days - a % 7)
+    ])
+    db.flush()
+    return customer
+
+
+def time_runs(fn, runs: int):
+    fn()  # warm-up
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main_benchmark(accounts: int, days: int, runs: int):
+    db = SessionLocal()
+    try:
+        customer = seed(db, accounts, days)
+        current_user = {"user_id": customer.id, "role": "customer"}
+
+        def current():
+            return asyncio.run(get_expense_stats(None, None, current_user, db))
+
+        stats = current()
+        contribution, payout = legacy_contribution_and_payout(db, customer.id)
+        print(f"get_expense_stats: 1 customer x {accounts} completed plans x ~{days} paid days, {runs} runs")
+        print(f"  contribution {stats.savings_contribution} (legacy {contribution}) "
+              f"{'OK' if stats.savings_contribution == contribution else 'MISMATCH'}")
+        print(f"  payout       {stats.savings_payout} (legacy {payout}) "
+              f"{'OK' if stats.savings_payout == round(payout, 2) else 'MISMATCH'}")
+
+        current_ms = time_runs(current, runs)
+        legacy_ms = time_runs(lambda: legacy_contribution_and_payout(db, customer.id), runs)
+        print(f"  get_expense_stats median {current_ms:.1f} ms")
+        print(f"  legacy savings part median {legacy_ms:.1f} ms ({legacy_ms / current_ms:.1f}x slower)")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main_benchmark(args.accounts, args.days, args.runs)
@@ -0,0 +1,140 @@
+"""
+Benchmark mark_savings_bulk validation.
+
+Seeds 50 daily savings accounts with 30 pending markings each inside a
+transaction, times a bulk request covering every account and day, then
+rolls everything back. A pending PaymentInitiation with the request's
+idempotency key is seeded so the Paystack call is skipped and only the
+lookup/validation path is measured.
+
+Usage:
+    python scripts/benchmark_mark_savings_bulk.py [--accounts 50] [--days 30] [--runs 20]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add the parent directory to python path to allow imports
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv(current_dir.parent / ".env")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import main  # noqa: F401  - registers every model on Base
+from config.settings import settings
+from models.business import Business, Unit
+from models.savings import (
+    MarkingStatus,
+    PaymentInitiation,
+    PaymentInitiationStatus,
+    PaymentMethod,
+    SavingsAccount,
+    SavingsMarking,
+    SavingsStatus,
+    SavingsType,
+)
+from models.user import User
+from schemas.savings import BulkMarkSavingsRequest, BulkSavingsMarkingRequest
+from service.savings import mark_savings_bulk
+
+logging.disable(logging.INFO)
+
+engine = create_engine(settings.POSTGRES_URI)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def seed(db, accounts: int, days: int):
+    now = datetime.now(timezone.utc)
+    tag = uuid.uuid4().hex[:8]
+    agent = User(full_name="Bench Agent", phone_number=f"ba{tag}", email=f"ba{tag}@bench.local",
+                 username=f"ba{tag}", pin="x", role="agent", created_at=now)
+    customer = User(full_name="Bench Customer", phone_number=f"bc{tag}", email=f"bc{tag}@bench.local",
+                    username=f"bc{tag}", pin="x", role="customer", created_at=now)
+    db.add_all([agent, customer])
+    db.flush()
+    business = Business(name=f"Bench {tag}", agent_id=agent.id, unique_code=f"b{tag}", created_at=now)
+    db.add(business)
+    db.flush()
+    unit = Unit(name="Bench", business_id=business.id)
+    db.add(unit)
+    db.flush()
+
+    start = date.today()
+    amount = Decimal("100")
+    items = []
+    for i in range(accounts):
+        tracking_number = f"{tag[:6]}{i:04d}"
+        savings = SavingsAccount(
+            customer_id=customer.id, business_id=business.id, unit_id=unit.id,
+            tracking_number=tracking_number, savings_type=SavingsType.DAILY,
+            daily_amount=amount, duration_months=1, start_date=start,
+            end_date=start + timedelta(days=days - 1), commission_days=30,
+            commission_amount=amount, target_amount=amount * days,
+            marking_status=MarkingStatus.NOT_STARTED, created_at=now,
+        )
+        db.add(savings)
+        db.flush()
+        db.add_all([
+            SavingsMarking(savings_account_id=savings.id, unit_id=unit.id,
+                           marked_date=start + timedelta(days=d), amount=amount,
+                           status=SavingsStatus.PENDING, created_at=now)
+            for d in range(days)
+        ])
+        items.extend(
+            BulkSavingsMarkingRequest(tracking_number=tracking_number, marked_date=start + timedelta(days=d))
+            for d in range(days)
+        )
+
+    idempotency_key = f"bench-{tag}"
+    db.add(PaymentInitiation(
+        idempotency_key=idempotency_key, reference=f"sv_bulk_bench_{tag}",
+        status=PaymentInitiationStatus.PENDING, user_id=customer.id,
+        payment_method=PaymentMethod.CARD.value, payment_metadata={"type": "bulk"},
+    ))
+    db.flush()
+
+    request = BulkMarkSavingsRequest(
+        payment_method=PaymentMethod.CARD, markings=items, idempotency_key=idempotency_key
+    )
+    current_user = {"user_id": customer.id, "role": "customer"}
+    return request, current_user
+
+
+def main_benchmark(accounts: int, days: int, runs: int):
+    db = SessionLocal()
+    try:
+        request, current_user = seed(db, accounts, days)
+        asyncio.run(mark_savings_bulk(request, current_user, db))  # warm-up
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            asyncio.run(mark_savings_bulk(request, current_user, db))
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"mark_savings_bulk: {accounts} accounts x {days} days, {runs} runs")
+        print(f"  median {statistics.median(timings):.1f} ms")
+        print(f"  min    {min(timings):.1f} ms")
+        print(f"  max    {max(timings):.1f} ms")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    main_benchmark(args.accounts, args.days, args.runs)
@@ -0,0 +1,189 @@
+"""
+Benchmark SearchRepository.search (universal search).
+
+Seeds users (1M by default), businesses, savings accounts and payment
+requests inside a transaction, builds the search indexes from migration 008
+if they are missing, and times the single UNION ALL search against the
+previous four separate LIKE queries (kept here as ``legacy_search``) for a
+few representative terms. Everything is rolled back afterwards.
+
+Requires the pg_trgm extension (``CREATE EXTENSION pg_trgm``).
+
+Usage:
+    python scripts/benchmark_universal_search.py [--users 1000000] [--businesses 1000] [--accounts 200000] [--limit 5] [--runs 5]
+"""
+import argparse
+import logging
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add the parent directory to python path to allow imports
+current_dir = Path(__file__).resolve().parent
+sys.path.append(str(current_dir.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv(current_dir.parent / ".env")
+
+from sqlalchemy import create_engine, func, or_, text
+from sqlalchemy.orm import sessionmaker
+
+import main  # noqa: F401  - registers every model on Base
+from config.settings import settings
+from models.business import Business
+from models.payments import PaymentRequest
+from models.savings import SavingsAccount
+from models.user import User
+from store.repositories.search import SearchRepository
+
+logging.disable(logging.INFO)
+
+engine = create_engine(settings.POSTGRES_URI)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+MIGRATION = current_dir.parent / "migrations" / "008_add_search_trigram_indexes.sql"
+
+
+def legacy_search(db, term: str, limit: int):
+    """The previous implementation: one unindexable LIKE query per group."""
+    pattern = f"%{term.lower()}%"
+    return {
+        "businesses": db.query(Business).filter(or_(
+            func.lower(Business.name).like(pattern),
+            func.lower(Business.unique_code).like(pattern),
+            func.lower(Business.address).like(pattern),
+        )).order_by(Business.created_at.desc()).limit(limit).all(),
+        "users": db.query(User).filter(or_(
+            func.lower(User.full_name).like(pattern),
+            func.lower(User.email).like(pattern),
+            func.lower(User.phone_number).like(pattern),
+            func.lower(User.username).like(pattern),
+        )).order_by(User.created_at.desc()).limit(limit).all(),
+        "savings": db.query(SavingsAccount).filter(
+            func.lower(SavingsAccount.tracking_number).like(pattern),
+        ).order_by(SavingsAccount.created_at.desc()).limit(limit).all(),
+        "payments": db.query(PaymentRequest)
+        .join(SavingsAccount, SavingsAccount.id == PaymentRequest.savings_account_id)
+        .filter(or_(
+            func.lower(PaymentRequest.reference).like(pattern),
+            func.lower(SavingsAccount.tracking_number).like(pattern),
+        )).order_by(PaymentRequest.request_date.desc()).limit(limit).all(),
+    }
+
+
+def seed(db, users: int, businesses: int, accounts: int) -> str:
+    """Bulk-insert synthetic rows with set-based SQL; returns the run tag."""
+    tag = uuid.uuid4().hex[:6]
+    params = {"tag": tag, "users": users, "businesses": businesses, "accounts": accounts}
+    db.execute(text("""
+        INSERT INTO users (full_name, phone_number, email, username, pin, role, token_version, created_at)
+        SELECT 'Bench ' || (ARRAY['Ada','Bola','Chidi','Dayo','Emeka','Funke','Gbenga','Halima'])[1 + g % 8]
+                   || ' ' || md5(g::text || :tag),
+               '+234' || :tag || lpad(g::text, 8, '0'),
+               'bench' || g || '.' || :tag || '@bench.local',
+               'bench_' || :tag || '_' || g,
+               'x', 'customer', 1, NOW() - (g || ' seconds')::interval
+        FROM generate_series(1, :users) AS g
+    """), params)
+    db.execute(text("""
+        INSERT INTO businesses (name, agent_id, unique_code, address, created_at)
+        SELECT 'Bench Business ' || md5(g::text || :tag),
+               (SELECT id FROM users WHERE username = 'bench_' || :tag || '_' || g),
+               left(md5(:tag || g::text), 10),
+               g || ' Bench Street, Lagos',
+               NOW()
+        FROM generate_series(1, :businesses) AS g
+    """), params)
+    db.execute(text("""
+        INSERT INTO savings_accounts (customer_id, business_id, tracking_number, savings_type, daily_amount,
+                                      duration_months, start_date, commission_days, commission_amount,
+                                      marking_status, created_at)
+        SELECT u.id, b.ids[1 + u.rn % :businesses], '7' || lpad(u.rn::text, 9, '0'), 'daily', 100,
+               1, CURRENT_DATE, 30, 100, 'not_started', NOW()
+        FROM (SELECT id, row_number() OVER (ORDER BY id) AS rn FROM users
+              WHERE username LIKE 'bench\\_' || :tag || '\\_%' ORDER BY id LIMIT :accounts) u
+        CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids FROM businesses
+                    WHERE name LIKE 'Bench Business %') b
+    """), params)
+    # Every tenth bench account has a payment request
+    db.execute(text("""
+        WITH bench AS (
+            SELECT sa.id, sa.customer_id FROM savings_accounts sa
+            WHERE sa.tracking_number LIKE '7%0'
+              AND sa.customer_id IN (SELECT id FROM users WHERE username LIKE 'bench\\_' || :tag || '\\_%')
+        ), accounts AS (
+            INSERT INTO payment_accounts (customer_id, created_at)
+            SELECT customer_id, NOW() FROM bench
+            RETURNING id, customer_id
+        ), details AS (
+            INSERT INTO account_details (payment_account_id, account_name, account_number, bank_name, created_at)
+            SELECT id, 'Bench', '0000000000', 'Bench Bank', NOW() FROM accounts
+            RETURNING id, payment_account_id
+        )
+        INSERT INTO payment_requests (payment_account_id, account_details_id, savings_account_id, amount,
+                                      status, request_date, reference, created_at)
+        SELECT a.id, d.id, bench.id, 100, 'pending', NOW(), 'PR-' || upper(left(md5(bench.id::text || :tag), 12)), NOW()
+        FROM bench
+        JOIN accounts a ON a.customer_id = bench.customer_id
+        JOIN details d ON d.payment_account_id = a.id
+    """), params)
+    return tag
+
+
+def build_indexes(db) -> None:
+    """Create migration 008's indexes (inside the transaction) and refresh statistics."""
+    statements = MIGRATION.read_text().split("BEGIN;", 1)[1].split("COMMIT;", 1)[0]
+    db.execute(text(statements))
+    for table in ("users", "businesses", "savings_accounts", "payment_requests"):
+        db.execute(text(f"ANALYZE {table}"))
+
+
+def time_runs(fn, runs: int):
+    fn()  # warm-up
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main_benchmark(users: int, businesses: int, accounts: int, limit: int, runs: int):
+    db = SessionLocal()
+    try:
+        if not db.execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).first():
+            sys.exit("pg_trgm is not available on this server; universal search requires it")
+        started = time.perf_counter()
+        tag = seed(db, users, businesses, accounts)
+        build_indexes(db)
+        print(f"universal search: {users} users, {businesses} businesses, {accounts} savings accounts, "
+              f"limit {limit}, {runs} runs (seeded in {time.perf_counter() - started:.0f}s)")
+
+        repo = SearchRepository(db)
+        terms = ["halima", f"bench{users // 2}.{tag}", "+234" + tag + "0004", f"7{accounts // 2:09d}", "pr-", "lagos", "nomatch-" + tag]
+        for term in terms:
+            results = repo.search(term, limit=limit)
+            legacy = legacy_search(db, term, limit)
+            search_ms = time_runs(lambda: repo.search(term, limit=limit), runs)
+            legacy_ms = time_runs(lambda: legacy_search(db, term, limit), runs)
+            counts = "/".join(str(len(results[group])) for group in results)
+            legacy_counts = "/".join(str(len(legacy[group])) for group in results)
+            print(f"  {term!r:>28}: search {search_ms:7.1f} ms  legacy {legacy_ms:8.1f} ms "
+                  f"({legacy_ms / search_ms:5.1f}x)  hits {counts} (legacy {legacy_counts})")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--businesses", type=int, default=1_000)
+    parser.add_argument("--accounts", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main_benchmark(args.users, args.businesses, args.accounts, args.limit, args.runs)
@@ -0,0 +1,106 @@
+"""
+Local Paystack stub for tests and benchmarks.
+
+Implements the subset of the Paystack API the app calls, keeping
+transactions in memory. Initialized transactions verify as successful for
+the initialized amount.
+
+Usage:
+    python scripts/paystack_stub.py [--port 8099] [--latency-ms 0] [--fail-rate 0.0]
+    PAYSTACK_BASE_URL=http://127.0.0.1:8099 uvicorn main:app
+
+It can also be mounted in-process without a socket:
+    from scripts.paystack_stub import create_app
+    PaystackClient(base_url="http://paystack.stub",
+                   transport=httpx.ASGITransport(app=create_app()))
+"""
+import argparse
+import asyncio
+import random
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(latency_ms: float = 0.0, fail_rate: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Paystack stub")
+    transactions = {}
+    customers = {}
+
+    @app.middleware("http")
+    async def simulate_upstream(request: Request, call_next):
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        if fail_rate and random.random() < fail_rate:
+            return JSONResponse(status_code=503, content={"status": False, "message": "Stub failure"})
+        return await call_next(request)
+
+    @app.post("/transaction/initialize")
+    async def initialize(request: Request):
+        body = await request.json()
+        reference = body.get("reference") or uuid.uuid4().hex[:12]
+        if reference in transactions:
+            return JSONResponse(status_code=400, content={"status": False, "message": "Duplicate Transaction Reference"})
+        transactions[reference] = body
+        return {
+            "status": True,
+            "message": "Authorization URL created",
+            "data": {
+                "authorization_url": f"https://checkout.paystack.stub/{reference}",
+                "access_code": uuid.uuid4().hex[:15],
+                "reference": reference,
+            },
+        }
+
+    @app.get("/transaction/verify/{reference}")
+    async def verify(reference: str):
+        body = transactions.get(reference)
+        if body is None:
+            return JSONResponse(status_code=400, content={"status": False, "message": "Transaction reference not found"})
+        return {
+            "status": True,
+            "message": "Verification successful",
+            "data": {
+                "status": "success",
+                "reference": reference,
+                "amount": int(body.get("amount", 0)),
+                "metadata": body.get("metadata"),
+            },
+        }
+
+    @app.post("/customer")
+    async def create_customer(request: Request):
+        body = await request.json()
+        code = customers.setdefault(body.get("email"), f"CUS_{uuid.uuid4().hex[:10]}")
+        return {"status": True, "message": "Customer created", "data": {"customer_code": code, **body}}
+
+    @app.get("/dedicated_account")
+    async def list_dedicated_accounts(customer: str = ""):
+        return {"status": True, "message": "Managed accounts retrieved", "data": []}
+
+    @app.post("/dedicated_account")
+    async def create_dedicated_account(request: Request):
+        body = await request.json()
+        return {
+            "status": True,
+            "message": "NUBAN successfully created",
+            "data": {
+                "bank": {"name": "Stub Bank"},
+                "account_number": str(random.randint(10 ** 9, 10 ** 10 - 1)),
+                "account_name": f"STUB/{body.get('customer')}",
+            },
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms, args.fail_rate), host=args.host, port=args.port)
@@ -1,9 +1,19 @@
+"""
+Super admin analytics dashboard.
+
+The dashboard is served from a snapshot. Independent metric groups are
+computed concurrently, each on its own pooled connection, then assembled and
+cached for ``SNAPSHOT_TTL_SECONDS``. Requests always get the latest snapshot
+immediately along with its age; once it is older than the TTL, the first
+request to notice triggers a single background rebuild.
+"""
+import asyncio
+from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from fastapi import status
-from sqlalchemy.orm import Session
-
+from database.postgres_optimized import SessionLocal
 from schemas.analytics import (
     DashboardAnalyticsResponse,
     DashboardTotals,
@@ -19,19 +29,31 @@ from schemas.analytics import (
     ChartPoint,
 )
 from store.enums import Role
+from sqlalchemy.orm import Session
+
 from store.repositories import (
     UserRepository,
     BusinessRepository,
     SavingsRepository,
     UnitRepository,
     PaymentsRepository,
+    RollupRepository,
 )
+from utils.cache import get_cache
 from utils.response import success_response, error_response
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_CACHE_KEY = "analytics:super_admin_dashboard"
+SNAPSHOT_TTL_SECONDS = 60
+# Serve a stale snapshot for this long while a rebuild runs; after that, rebuild inline
+SNAPSHOT_MAX_AGE_SECONDS = 15 * 60
+
+_snapshot_lock = asyncio.Lock()
+_refresh_task: Optional[asyncio.Task] = None
+
 
 def _decimal_to_float(value: Decimal | float | int) -> float:
     """Helper to convert Decimals to float for JSON serialization."""
@@ -40,156 +62,87 @@ def _decimal_to_float(value: Decimal | float | int) -> float:
     return float(value or 0)
 
 
-async def get_super_admin_dashboard(
-    *,
-    current_user: Dict,
-    db: Session,
-    user_repo: UserRepository,
-    business_repo: BusinessRepository,
-    savings_repo: SavingsRepository,
-    unit_repo: UnitRepository,
-    payments_repo: PaymentsRepository,
-):
-    """
-    Assemble analytics overview for the super admin dashboard.
-    """
-    if current_user.get("role") != Role.SUPER_ADMIN.value:
-        return error_response(
-            status_code=status.HTTP_403_FORBIDDEN,
-            message="Super admin access required",
-        )
-
-    logger.info(
-        "Generating super admin analytics dashboard for user_id=%s",
-        current_user.get("user_id"),
-    )
-
-    try:
-        savings_metrics = savings_repo.get_system_savings_metrics()
-    except Exception as exc:
-        logger.warning("Failed to retrieve savings metrics: %s", exc)
-        db.rollback()
-        savings_metrics = {
+# Metric groups, each computed on its own connection: repository class and
+# {result key: (repository call, value used if that call fails)}
+METRIC_GROUPS: Dict[str, Tuple[type, Dict[str, Tuple[Callable[[Any], Any], Any]]]] = {
+    "users": (UserRepository, {
+        "total_users": (lambda repo: repo.count_all_users(), 0),
+        "active_users": (lambda repo: repo.count_active_users(), 0),
+        "inactive_users": (lambda repo: repo.count_inactive_users(), 0),
+        "role_counts": (lambda repo: repo.count_users_by_role(), {}),
+        "user_counts_by_business": (lambda repo: repo.get_business_user_counts(), {}),
+        "user_growth_points": (lambda repo: repo.get_monthly_user_growth(months=6), []),
+    }),
+    "businesses": (BusinessRepository, {
+        "business_metrics": (lambda repo: repo.get_business_performance_metrics(), []),
+        "total_businesses": (lambda repo: repo.count(), 0),
+    }),
+    "units": (UnitRepository, {
+        "total_units": (lambda repo: repo.count_all_units(), 0),
+        "unit_counts_by_business": (lambda repo: repo.count_units_by_business(), {}),
+        "units_per_business": (lambda repo: repo.get_units_per_business(), []),
+    }),
+    "savings": (SavingsRepository, {
+        "savings_metrics": (lambda repo: repo.get_system_savings_metrics(), {
             "total_accounts": 0,
             "accounts_by_type": {},
             "total_volume": 0,
             "volume_by_status": {},
-        }
-
+        }),
+        "transfer_metrics": (lambda repo: repo.get_successful_transfer_metrics(), {"count": 0, "amount": 0.0}),
+        "monthly_transfer_volume": (lambda repo: repo.get_monthly_transfer_volume(months=6), []),
+    }),
+    "payments": (PaymentsRepository, {
+        "successful_payment_stats": (lambda repo: repo.get_successful_payment_stats(), {"count": 0, "amount": 0.0}),
+        "payment_status_metrics": (lambda repo: repo.get_status_summary(), []),
+        "monthly_payment_volume": (lambda repo: repo.get_monthly_payment_volume(months=6), []),
+        "total_payment_requests": (lambda repo: repo.count_total_requests(), 0),
+    }),
+}
+
+
+def _run_metric_group(name: str) -> Dict[str, Any]:
+    """Compute one metric group on its own session (runs in a worker thread)."""
+    repo_cls, metrics = METRIC_GROUPS[name]
+    db = SessionLocal()
     try:
-        business_metrics = business_repo.get_business_performance_metrics()
-    except Exception as exc:
-        logger.warning("Failed to retrieve business performance metrics: %s", exc)
-        db.rollback()
-        business_metrics = []
-
-    try:
-        user_counts_by_business = user_repo.get_business_user_counts()
-    except Exception as exc:
-        logger.warning("Failed to retrieve user counts by business: %s", exc)
-        db.rollback()
-        user_counts_by_business = {}
-
-    try:
-        unit_counts_by_business = unit_repo.count_units_by_business()
-    except Exception as exc:
-        logger.warning("Failed to retrieve unit counts by business: %s", exc)
-        db.rollback()
-        unit_counts_by_business = {}
-
-    try:
-        units_per_business = unit_repo.get_units_per_business()
-    except Exception as exc:
-        logger.warning("Failed to retrieve units per business: %s", exc)
-        db.rollback()
-        units_per_business = []
-
-    try:
-        role_counts = user_repo.count_users_by_role()
-    except Exception as exc:
-        logger.warning("Failed to retrieve role counts: %s", exc)
-        db.rollback()
-        role_counts = {}
-
+        repo = repo_cls(db)
+        results = {}
+        for key, (compute, default) in metrics.items():
+            try:
+                results[key] = compute(repo)
+            except Exception as exc:
+                logger.warning("Failed to retrieve %s: %s", key.replace("_", " "), exc)
+                db.rollback()
+                results[key] = default
+        return results
+    finally:
+        db.close()
+
+
+def _assemble_dashboard(
+    *,
+    total_users: int,
+    active_users: int,
+    inactive_users: int,
+    role_counts: Dict[str, int],
+    user_counts_by_business: Dict[int, int],
+    user_growth_points: list,
+    business_metrics: list,
+    total_businesses: int,
+    total_units: int,
+    unit_counts_by_business: Dict[int, int],
+    units_per_business: list,
+    savings_metrics: Dict[str, Any],
+    transfer_metrics: Dict[str, Any],
+    monthly_transfer_volume: list,
+    successful_payment_stats: Dict[str, Any],
+    payment_status_metrics: list,
+    monthly_payment_volume: list,
+    total_payment_requests: int,
+) -> DashboardAnalyticsResponse:
     role_breakdown = {role.value: role_counts.get(role.value, 0) for role in Role}
 
-    try:
-        successful_payment_stats = payments_repo.get_successful_payment_stats()
-    except Exception as exc:
-        logger.warning("Failed to retrieve successful payment stats: %s", exc)
-        db.rollback()
-        successful_payment_stats = {"count": 0, "amount": 0.0}
-
-    try:
-        payment_status_metrics = payments_repo.get_status_summary()
-    except Exception as exc:
-        logger.warning("Failed to retrieve payment status summary: %s", exc)
-        db.rollback()
-        payment_status_metrics = []
-
-    try:
-        monthly_payment_volume = payments_repo.get_monthly_payment_volume(months=6)
-    except Exception as exc:
-        logger.warning("Failed to retrieve monthly payment volume: %s", exc)
-        db.rollback()
-        monthly_payment_volume = []
-
-    try:
-        total_payment_requests = payments_repo.count_total_requests()
-    except Exception as exc:
-        logger.warning("Failed to count payment requests: %s", exc)
-        db.rollback()
-        total_payment_requests = 0
-
-    try:
-        transfer_metrics = savings_repo.get_successful_transfer_metrics()
-    except Exception as exc:
-        logger.warning("Failed to retrieve transfer metrics: %s", exc)
-        db.rollback()
-        transfer_metrics = {"count": 0, "amount": 0.0}
-
-    try:
-        monthly_transfer_volume = savings_repo.get_monthly_transfer_volume(months=6)
-    except Exception as exc:
-        logger.warning("Failed to retrieve monthly transfer volume: %s", exc)
-        db.rollback()
-        monthly_transfer_volume = []
-
-    try:
-        total_users = user_repo.count_all_users()
-    except Exception as exc:
-        logger.warning("Failed to count users: %s", exc)
-        db.rollback()
-        total_users = 0
-
-    try:
-        active_users = user_repo.count_active_users()
-    except Exception as exc:
-        logger.warning("Failed to count active users: %s", exc)
-        db.rollback()
-        active_users = 0
-
-    try:
-        inactive_users = user_repo.count_inactive_users()
-    except Exception as exc:
-        logger.warning("Failed to count inactive users: %s", exc)
-        db.rollback()
-        inactive_users = 0
-
-    try:
-        total_businesses = business_repo.count()
-    except Exception as exc:
-        logger.warning("Failed to count businesses: %s", exc)
-        db.rollback()
-        total_businesses = 0
-
-    try:
-        total_units = unit_repo.count_all_units()
-    except Exception as exc:
-        logger.warning("Failed to count units: %s", exc)
-        db.rollback()
-        total_units = 0
-
     totals = DashboardTotals(
         total_users=total_users,
         active_users=active_users,
@@ -285,13 +238,6 @@ async def get_super_admin_dashboard(
         successful_transfer_amount=float(transfer_metrics.get("amount", 0.0)),
     )
 
-    try:
-        user_growth_points = user_repo.get_monthly_user_growth(months=6)
-    except Exception as exc:
-        logger.warning("Failed to retrieve monthly user growth: %s", exc)
-        db.rollback()
-        user_growth_points = []
-
     charts = DashboardCharts(
         user_growth=[
             ChartSeries(
@@ -334,7 +280,7 @@ async def get_super_admin_dashboard(
         ],
     )
 
-    response_payload = DashboardAnalyticsResponse(
+    return DashboardAnalyticsResponse(
         totals=totals,
         role_breakdown=role_breakdown,
         savings_overview=savings_overview,
@@ -344,10 +290,111 @@ async def get_super_admin_dashboard(
         charts=charts,
     )
 
+
+async def build_dashboard_snapshot() -> Dict[str, Any]:
+    """Compute every metric group concurrently and cache the assembled dashboard."""
+    started = datetime.now(timezone.utc)
+    names = list(METRIC_GROUPS)
+    results = await asyncio.gather(*(asyncio.to_thread(_run_metric_group, name) for name in names))
+
+    metrics: Dict[str, Any] = {}
+    for result in results:
+        metrics.update(result)
+
+    snapshot = {
+        "generated_at": started.isoformat(),
+        "data": _assemble_dashboard(**metrics).model_dump(),
+    }
+    await get_cache().set(SNAPSHOT_CACHE_KEY, snapshot, ttl=SNAPSHOT_MAX_AGE_SECONDS)
+    elapsed_ms = (datetime.now(timezone.utc) - started).total_seconds() * 1000
+    logger.info("Built super admin dashboard snapshot in %.0f ms", elapsed_ms)
+    return snapshot
+
+
+async def _rebuild_snapshot() -> Dict[str, Any]:
+    """Build a snapshot unless another caller is already doing so; then reuse theirs."""
+    async with _snapshot_lock:
+        snapshot = await get_cache().get(SNAPSHOT_CACHE_KEY)
+        if snapshot and _snapshot_age(snapshot) < SNAPSHOT_TTL_SECONDS:
+            return snapshot
+        return await build_dashboard_snapshot()
+
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error("Error in background dashboard snapshot refresh: %s", error, exc_info=error)
+
+
+def _refresh_in_background() -> None:
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_rebuild_snapshot())
+        _refresh_task.add_done_callback(_log_refresh_failure)
+
+
+def _snapshot_age(snapshot: Dict[str, Any]) -> float:
+    generated_at = datetime.fromisoformat(snapshot["generated_at"])
+    return (datetime.now(timezone.utc) - generated_at).total_seconds()
+
+
+async def get_super_admin_dashboard(
+    *,
+    current_user: Dict,
+    refresh: bool = False,
+):
+    """
+    Serve the analytics overview for the super admin dashboard.
+
+    Returns the cached snapshot with ``generated_at`` and ``age_seconds``.
+    ``refresh=True`` waits for a freshly built snapshot instead.
+    """
+    if current_user.get("role") != Role.SUPER_ADMIN.value:
+        return error_response(
+            status_code=status.HTTP_403_FORBIDDEN,
+            message="Super admin access required",
+        )
+
+    logger.info(
+        "Serving super admin analytics dashboard for user_id=%s",
+        current_user.get("user_id"),
+    )
+
+    snapshot = None if refresh else await get_cache().get(SNAPSHOT_CACHE_KEY)
+    if snapshot is None:
+        snapshot = await (build_dashboard_snapshot() if refresh else _rebuild_snapshot())
+    elif _snapshot_age(snapshot) >= SNAPSHOT_TTL_SECONDS:
+        _refresh_in_background()
+
     return success_response(
         status_code=status.HTTP_200_OK,
         message="Super admin analytics loaded successfully",
-        data=response_payload.model_dump(),
+        data={
+            **snapshot["data"],
+            "generated_at": snapshot["generated_at"],
+            "age_seconds": round(_snapshot_age(snapshot), 1),
+        },
     )
 
 
+async def refresh_analytics_facts(db: Session, *, full: bool = False) -> Optional[Dict[str, int]]:
+    """
+    Refresh the daily fact tables the dashboard metrics read from.
+
+    Incremental runs rebuild only the days with changed source rows; ``full``
+    rebuilds every day. Safe to run from several workers at once: only one
+    refresh proceeds, the others return None.
+    """
+    try:
+        written = RollupRepository(db).refresh_daily_facts(full=full)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if written is None:
+        logger.info("Analytics fact refresh skipped: another refresh is running")
+    else:
+        logger.info("Analytics facts refreshed (full=%s): %s", full, written)
+    return written
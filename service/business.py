@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.sql import insert
 from sqlalchemy import select, or_, func
 import urllib.parse
-from fastapi import BackgroundTasks, status
+from fastapi import status
 from models.business import Business, PendingBusinessRequest, Unit, user_units, AdminCredentials, BusinessPermission, BusinessType
 from models.user_business import user_business
 from models.user import User, user_permissions
@@ -26,10 +26,11 @@ import random
 import uuid
 from datetime import timezone, timedelta
 from utils.email_service import (
-    send_business_created_email,
-    send_business_invitation_email,
-    send_setup_account_email,
+    business_created_email_content,
+    business_invitation_email_content,
+    setup_account_email_content,
 )
+from service.outbound import queue_sms, queue_template_email
 from utils.cache import cached, get_cache
 from config.settings import settings
 from typing import Optional
@@ -212,9 +213,16 @@ async def create_business(
             delivery_status += "whatsapp"
         if user.email and notification_method in ["email", "both"]:
             delivery_status += "_and_email"
-            await send_business_created_email(
-                user.email, user.full_name, business.name, unique_code, business.created_at.isoformat()
+            queue_template_email(
+                session,
+                user.email,
+                business_created_email_content,
+                user.full_name,
+                business.name,
+                unique_code,
+                business.created_at.isoformat(),
             )
+            session.commit()
         if not user.phone_number and not user.email:
             delivery_status = "pending"
 
@@ -252,7 +260,6 @@ async def add_customer_to_business(
     request: CustomerInvite,
     current_user: dict,
     db: Session,
-    background_tasks: BackgroundTasks,
     *,
     user_repo: UserRepository | None = None,
     business_repo: BusinessRepository | None = None,
@@ -458,17 +465,19 @@ async def add_customer_to_business(
         if recipient:
             # Prefer email if available
             if business.business_type == BusinessType.COOPERATIVE:
-                background_tasks.add_task(
-                    send_setup_account_email,
+                queue_template_email(
+                    session,
                     recipient,
+                    setup_account_email_content,
                     customer.full_name or "Member",
                     business.name,
                     setup_url
                 )
             else:
-                background_tasks.add_task(
-                    send_business_invitation_email,
+                queue_template_email(
+                    session,
                     recipient,
+                    business_invitation_email_content,
                     customer.full_name or "Member",
                     business.name,
                     accept_url,
@@ -476,17 +485,13 @@ async def add_customer_to_business(
                 )
         elif customer.phone_number:
             # Fallback to Termii SMS if no email
-            from utils.sms_service import send_termii_sms_async
             sms_text = (
                 f"Welcome to {business.name}!\n"
                 f"Set up your account: {setup_url}\n"
                 f"This link expires in 24 hours."
             )
-            background_tasks.add_task(
-                send_termii_sms_async,
-                customer.phone_number,
-                sms_text
-            )
+            queue_sms(session, customer.phone_number, sms_text)
+        session.commit()
 
         message = "Member added successfully. Setup link generated."
         if is_linked:
@@ -0,0 +1,160 @@
+"""
+Customer expense frame shared by the expense stats, advice and analytics endpoints.
+
+The frame holds a customer's expenses for a date range as NumPy arrays
+(date, amount, category) plus their expense-card income figures, so each
+endpoint derives its totals, distribution, counts, volatility and trend
+from one load instead of re-querying.
+
+Frames are memoized per process by (user, range, data version). The data
+version lives in the shared cache and is bumped by ``touch_expense_data``
+on every expense or expense-card write, so with Redis as the shared cache a
+write on any worker retires the frames every worker holds for that customer.
+On the in-memory fallback the version is per process: only the writing
+worker retires its frames, and other workers may serve a stale frame for up
+to ``FRAME_TTL_SECONDS``.
+"""
+from __future__ import annotations
+
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from cachetools import TTLCache
+
+from store.repositories import ExpenseCardRepository, ExpenseRepository
+from utils.cache import get_cache
+
+UNCATEGORIZED = "Uncategorized"
+FRAME_CACHE_SIZE = 1024
+FRAME_TTL_SECONDS = 300
+VERSION_TTL_SECONDS = 86400
+
+_frames: TTLCache = TTLCache(maxsize=FRAME_CACHE_SIZE, ttl=FRAME_TTL_SECONDS)
+
+
+def _version_key(user_id: int) -> str:
+    # Kept outside the "expenses:" prefix so clearing the customer's cached
+    # reads with clear_pattern(f"expenses:{user_id}:*") does not reset it.
+    return f"expense_frame:version:{user_id}"
+
+
+class ExpenseFrame:
+    """A customer's expenses in a date range, column-wise."""
+
+    def __init__(
+        self,
+        *,
+        dates: np.ndarray,
+        amounts: np.ndarray,
+        categories: np.ndarray,
+        total_income: Decimal,
+        card_count: int,
+        income_card_count: int,
+    ):
+        self.dates = dates  # datetime64[D]
+        self.amounts = amounts  # int64, in kobo so totals stay exact
+        self.categories = categories  # str, UNCATEGORIZED for null
+        self.total_income = total_income
+        self.card_count = card_count
+        self.income_card_count = income_card_count
+        for array in (dates, amounts, categories):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_rows(cls, rows, *, total_income: Decimal, card_count: int, income_card_count: int):
+        dates, amounts, categories = zip(*rows) if rows else ((), (), ())
+        return cls(
+            dates=np.array(dates, dtype="datetime64[D]"),
+            amounts=np.array([int(amount * 100) for amount in amounts], dtype=np.int64),
+            categories=np.array([c or UNCATEGORIZED for c in categories], dtype=object),
+            total_income=total_income,
+            card_count=card_count,
+            income_card_count=income_card_count,
+        )
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    @property
+    def total_expenses(self) -> Decimal:
+        if not len(self):
+            return Decimal(0)
+        return Decimal(int(self.amounts.sum())).scaleb(-2)
+
+    def _by_category(self):
+        names, index = np.unique(self.categories, return_inverse=True)
+        return names, index
+
+    def totals_by_category(self) -> Dict[str, Decimal]:
+        names, index = self._by_category()
+        sums = np.bincount(index, weights=self.amounts, minlength=len(names))
+        return {
+            str(name): Decimal(int(total)).scaleb(-2) for name, total in zip(names, sums)
+        }
+
+    def counts_by_category(self) -> Dict[str, int]:
+        names, index = self._by_category()
+        counts = np.bincount(index, minlength=len(names))
+        return {str(name): int(count) for name, count in zip(names, counts)}
+
+    def volatility(self) -> float:
+        """Population standard deviation of the expense amounts."""
+        return float(np.std(self.amounts / 100)) if len(self) else 0.0
+
+    def trend_slope(self) -> float:
+        """Least-squares slope of amount against days since the first expense."""
+        if len(self) < 2:
+            return 0.0
+        days = (self.dates - self.dates.min()).astype(np.int64).astype(float)
+        amounts = self.amounts / 100
+        spread = days - days.mean()
+        variance = float(spread @ spread)
+        if variance == 0:
+            return 0.0
+        return float(spread @ (amounts - amounts.mean()) / variance)
+
+    def monthly_totals(self) -> pd.Series:
+        """Expense totals per calendar month, months without expenses as 0."""
+        series = pd.Series(self.amounts / 100, index=pd.to_datetime(self.dates))
+        return series.resample("ME").sum().fillna(0)
+
+
+async def touch_expense_data(user_id: int) -> None:
+    """Retire every memoized frame for ``user_id``; call after expense writes."""
+    await get_cache().set(_version_key(user_id), time.time_ns(), ttl=VERSION_TTL_SECONDS)
+
+
+async def _data_version(user_id: int) -> int:
+    cache = get_cache()
+    version = await cache.get(_version_key(user_id))
+    if version is None:
+        version = time.time_ns()
+        await cache.set(_version_key(user_id), version, ttl=VERSION_TTL_SECONDS)
+    return version
+
+
+async def load_expense_frame(
+    user_id: int,
+    from_date: Optional[date],
+    to_date: Optional[date],
+    *,
+    expense_repo: ExpenseRepository,
+    expense_card_repo: ExpenseCardRepository,
+) -> ExpenseFrame:
+    """Return the customer's expense frame for the range, loading it at most once per data version."""
+    key = (user_id, from_date, to_date, await _data_version(user_id))
+    frame = _frames.get(key)
+    if frame is None:
+        total_income, card_count, income_card_count = expense_card_repo.get_income_summary(user_id)
+        frame = ExpenseFrame.from_rows(
+            expense_repo.get_frame_rows(user_id=user_id, from_date=from_date, to_date=to_date),
+            total_income=total_income,
+            card_count=card_count,
+            income_card_count=income_card_count,
+        )
+        _frames[key] = frame
+    return frame
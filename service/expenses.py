@@ -1,6 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from models.expenses import ExpenseCard, Expense, IncomeType, ExpenseCategory, CardStatus
+from models.expenses import ExpenseCard, Expense, IncomeType, ExpenseCategory
 from models.savings import SavingsAccount, SavingsMarking, SavingsStatus, MarkingStatus
 from schemas.expenses import (
     ExpenseCardCreate,
@@ -17,17 +16,18 @@ from models.user import User
 from datetime import datetime, timezone, date
 from decimal import Decimal
 import logging
-import pandas as pd
 from statsmodels.tsa.arima.model import ARIMA
-from sklearn.linear_model import LinearRegression
-import numpy as np
 from store.repositories import (
     ExpenseCardRepository,
     ExpenseRepository,
     UserRepository,
     SavingsRepository,
+    RollupRepository,
 )
 from utils.cache import cached, get_cache
+from utils.export import EXPORT_BATCH_ROWS, export_response, session_rows
+from store.repositories.expenses import EXPENSE_EXPORT_COLUMNS
+from service.expense_frame import ExpenseFrame, load_expense_frame, touch_expense_data
 
 logging.basicConfig(
     filename="expenses.log",
@@ -40,6 +40,17 @@ logger = logging.getLogger(__name__)
 def _resolve_repo(repo, repo_cls, db: Session):
     return repo if repo is not None else repo_cls(db)
 
+
+def _customer_scope(arguments: dict) -> int:
+    """Key cached expense reads by customer so writes can drop just theirs."""
+    return arguments["current_user"]["user_id"]
+
+
+async def _expense_data_changed(user_id: int) -> None:
+    """Drop a customer's cached expense reads and memoized expense frames."""
+    await get_cache().clear_pattern(f"expenses:{user_id}:*")
+    await touch_expense_data(user_id)
+
 async def create_expense_card(
     request: ExpenseCardCreate,
     current_user: dict,
@@ -175,10 +186,10 @@ async def create_expense_card(
         expense_card.id,
         current_user["user_id"],
     )
-    await get_cache().clear_pattern("expenses:*")
+    await _expense_data_changed(current_user["user_id"])
     return ExpenseCardResponse.from_orm(expense_card)
 
-@cached(ttl=300, key_prefix="expenses")
+@cached(ttl=300, key_prefix="expenses", scope=_customer_scope)
 async def get_expense_cards(
     limit: int,
     offset: int,
@@ -222,28 +233,36 @@ async def record_expense(
     expense_repo = _resolve_repo(expense_repo, ExpenseRepository, db)
     session = expense_repo.db
 
-    card = expense_card_repo.get_by_id_for_user(card_id, current_user["user_id"])
-    if not card:
-        return error_response(status_code=404, message="Expense card not found")
     if request.amount <= 0:
+        if not expense_card_repo.get_by_id_for_user(card_id, current_user["user_id"]):
+            return error_response(status_code=404, message="Expense card not found")
         return error_response(status_code=400, message="Amount must be positive")
-    if request.amount > card.balance:
-        return error_response(status_code=400, message="Insufficient balance")
 
-    expense = expense_repo.create(
+    recorded = expense_repo.record_debit(
+        card_id,
+        current_user["user_id"],
         {
-            "expense_card_id": card_id,
             "category": request.category,
             "description": request.description,
             "amount": request.amount,
             "date": request.date,
             "created_by": current_user["user_id"],
             "created_at": datetime.now(timezone.utc),
-        }
+        },
+    )
+    if not recorded:
+        session.rollback()
+        if not expense_card_repo.get_by_id_for_user(card_id, current_user["user_id"]):
+            return error_response(status_code=404, message="Expense card not found")
+        return error_response(status_code=400, message="Insufficient balance")
+
+    expense = expense_repo.get_by_id(recorded.id)
+    RollupRepository(session).apply_expense(
+        customer_id=recorded.customer_id,
+        business_id=recorded.business_id,
+        recorded_on=expense.created_at.date(),
+        amount=request.amount,
     )
-    card.balance -= request.amount
-    card.updated_at = datetime.now(timezone.utc)
-    card.updated_by = current_user["user_id"]
     session.commit()
     session.refresh(expense)
 
@@ -255,7 +274,7 @@ async def record_expense(
         user_id=current_user["user_id"],
         notification_type=NotificationType.EXPENSE_RECORDED,
         title="Expense Recorded",
-        message=f"Expense of {request.amount:.2f} recorded in '{card.name}'. Remaining balance: {card.balance:.2f}",
+        message=f"Expense of {request.amount:.2f} recorded in '{recorded.name}'. Remaining balance: {recorded.balance:.2f}",
         priority=NotificationPriority.LOW,
         db=session,
         notification_repo=UserNotificationRepository(session),
@@ -269,7 +288,7 @@ async def record_expense(
         card_id,
         current_user["user_id"],
     )
-    await get_cache().clear_pattern("expenses:*")
+    await _expense_data_changed(current_user["user_id"])
     return ExpenseResponse.from_orm(expense)
 
 async def top_up_expense_card(
@@ -283,18 +302,19 @@ async def top_up_expense_card(
     expense_card_repo = _resolve_repo(expense_card_repo, ExpenseCardRepository, db)
     session = expense_card_repo.db
 
-    card = expense_card_repo.get_by_id_for_user(card_id, current_user["user_id"])
+    card = (
+        expense_card_repo.credit_balance(card_id, current_user["user_id"], request.amount)
+        if request.amount > 0
+        else None
+    )
     if not card:
-        return error_response(status_code=404, message="Expense card not found")
-    if request.amount <= 0:
-        return error_response(status_code=400, message="Top-up amount must be positive")
-    if card.income_type == IncomeType.SAVINGS:
+        session.rollback()
+        card = expense_card_repo.get_by_id_for_user(card_id, current_user["user_id"])
+        if not card:
+            return error_response(status_code=404, message="Expense card not found")
+        if request.amount <= 0:
+            return error_response(status_code=400, message="Top-up amount must be positive")
         return error_response(status_code=400, message="Cannot top up savings-linked expense card")
-
-    card.income_amount += request.amount
-    card.balance += request.amount
-    card.updated_at = datetime.now(timezone.utc)
-    card.updated_by = current_user["user_id"]
     session.commit()
     session.refresh(card)
 
@@ -304,10 +324,10 @@ async def top_up_expense_card(
         request.amount,
         current_user["user_id"],
     )
-    await get_cache().clear_pattern("expenses:*")
+    await _expense_data_changed(current_user["user_id"])
     return ExpenseCardResponse.from_orm(card)
 
-@cached(ttl=300, key_prefix="expenses")
+@cached(ttl=300, key_prefix="expenses", scope=_customer_scope)
 async def get_expenses_by_card(
     card_id: int,
     limit: int,
@@ -414,7 +434,7 @@ async def update_expense_card(
     session.refresh(card)
 
     logger.info(f"Updated expense card {card_id} for user {current_user['user_id']}")
-    await get_cache().clear_pattern("expenses:*")
+    await _expense_data_changed(current_user["user_id"])
     return ExpenseCardResponse.from_orm(card)
 
 async def delete_expense_card(
@@ -431,6 +451,7 @@ async def delete_expense_card(
     if not card:
         return error_response(status_code=404, message="Expense card not found")
 
+    RollupRepository(session).remove_card_expenses(card.id)
     session.delete(card)
     session.commit()
 
@@ -439,13 +460,32 @@ async def delete_expense_card(
         card_id,
         current_user["user_id"],
     )
-    await get_cache().clear_pattern("expenses:*")
+    await _expense_data_changed(current_user["user_id"])
     return success_response(
         status_code=200,
         message="Expense card deleted successfully",
         data={"card_id": card_id},
     )
 
+def _savings_payout(rows) -> Decimal:
+    """
+    Total payout of completed savings accounts from
+    ``SavingsRepository.get_completed_payout_inputs`` rows: each account's
+    paid total less ``commission_amount`` per ``commission_days`` of the
+    span between its first and last paid marking.
+    """
+    payout = Decimal(0)
+    for paid, first, last, commission, commission_days in rows:
+        total_commission = Decimal(0)
+        if commission_days:
+            # Rounded per account, as get_customer_payments reports it
+            total_commission = round(
+                (commission or Decimal(0)) * Decimal(((last - first).days + 1) / commission_days), 2
+            )
+        payout += paid - total_commission
+    return payout
+
+
 async def get_expense_stats(
     from_date: date | None,
     to_date: date | None,
@@ -454,78 +494,47 @@ async def get_expense_stats(
     *,
     expense_card_repo: ExpenseCardRepository | None = None,
     expense_repo: ExpenseRepository | None = None,
+    savings_repo: SavingsRepository | None = None,
+    frame: ExpenseFrame | None = None,
 ):
     expense_card_repo = _resolve_repo(expense_card_repo, ExpenseCardRepository, db)
     expense_repo = _resolve_repo(expense_repo, ExpenseRepository, db)
-    session = expense_card_repo.db
+    savings_repo = _resolve_repo(savings_repo, SavingsRepository, db)
 
-    cards = expense_card_repo.get_all_for_user(current_user["user_id"])
-    savings_markings = session.query(SavingsMarking).join(SavingsAccount).filter(
-        SavingsAccount.customer_id == current_user["user_id"],
-        SavingsMarking.status == SavingsStatus.PAID,
+    if frame is None:
+        frame = await load_expense_frame(
+            current_user["user_id"],
+            from_date,
+            to_date,
+            expense_repo=expense_repo,
+            expense_card_repo=expense_card_repo,
+        )
+    savings_contribution = savings_repo.sum_paid_by_customer(
+        current_user["user_id"], from_date=from_date, to_date=to_date
     )
-    if from_date:
-        savings_markings = savings_markings.filter(SavingsMarking.marked_date >= from_date)
-    if to_date:
-        savings_markings = savings_markings.filter(SavingsMarking.marked_date <= to_date)
-    savings_markings = savings_markings.all()
-
-    savings_accounts = session.query(SavingsAccount).filter(
-        SavingsAccount.customer_id == current_user["user_id"],
-        SavingsAccount.marking_status == MarkingStatus.COMPLETED
-    ).all()
-    savings_payout = sum(
-        sum(marking.amount for marking in session.query(SavingsMarking).filter(
-            SavingsMarking.savings_account_id == account.id,
-            SavingsMarking.status == SavingsStatus.PAID
-        ).all()) - (account.commission_amount * Decimal(
-            ((max(m.marked_date for m in session.query(SavingsMarking).filter(
-                SavingsMarking.savings_account_id == account.id,
-                SavingsMarking.status == SavingsStatus.PAID
-            ).all()) - min(m.marked_date for m in session.query(SavingsMarking).filter(
-                SavingsMarking.savings_account_id == account.id,
-                SavingsMarking.status == SavingsStatus.PAID
-            ).all())).days + 1) / account.commission_days
-        ) if account.commission_days > 0 else 0)
-        for account in savings_accounts
+    savings_payout = _savings_payout(
+        savings_repo.get_completed_payout_inputs(current_user["user_id"])
     )
 
-    if not cards:
+    if not frame.card_count:
         return ExpenseStatsResponse(
             total_income=Decimal(0),
             total_expenses=Decimal(0),
             net_balance=Decimal(0),
             expenses_by_category={},
-            savings_contribution=sum(marking.amount for marking in savings_markings),
+            savings_contribution=savings_contribution,
             savings_payout=savings_payout
         )
 
-    total_income = sum(card.income_amount for card in cards)
-
-    total_expenses = expense_repo.sum_by_user(
-        user_id=current_user["user_id"],
-        from_date=from_date,
-        to_date=to_date,
-    )
-
-    expenses_by_category_query = expense_repo.grouped_by_category(
-        user_id=current_user["user_id"],
-        from_date=from_date,
-        to_date=to_date,
-    )
-
-    expenses_by_category = {
-        cat.value if cat else "Uncategorized": amt for cat, amt in expenses_by_category_query
-    }
-    savings_contribution = sum(marking.amount for marking in savings_markings)
-
+    total_income = frame.total_income
+    total_expenses = frame.total_expenses
     net_balance = total_income - total_expenses
 
     return ExpenseStatsResponse(
         total_income=total_income,
         total_expenses=total_expenses,
         net_balance=net_balance,
-        expenses_by_category=expenses_by_category,
+        expenses_by_category=frame.totals_by_category(),
         savings_contribution=savings_contribution,
         savings_payout=savings_payout
     )
@@ -541,8 +550,14 @@ async def get_financial_advice(
 ):
     expense_repo = _resolve_repo(expense_repo, ExpenseRepository, db)
     expense_card_repo = _resolve_repo(expense_card_repo, ExpenseCardRepository, db)
-    session = expense_repo.db
 
+    frame = await load_expense_frame(
+        current_user["user_id"],
+        from_date,
+        to_date,
+        expense_repo=expense_repo,
+        expense_card_repo=expense_card_repo,
+    )
     stats = await get_expense_stats(
         from_date,
         to_date,
@@ -550,27 +565,15 @@ async def get_financial_advice(
         db,
         expense_card_repo=expense_card_repo,
         expense_repo=expense_repo,
+        frame=frame,
     )
 
-    expenses_query = session.query(Expense).join(ExpenseCard).filter(
-        ExpenseCard.customer_id == current_user["user_id"]
-    )
-    if from_date:
-        expenses_query = expenses_query.filter(Expense.date >= from_date)
-    if to_date:
-        expenses_query = expenses_query.filter(Expense.date <= to_date)
-    expenses = expenses_query.all()
-
     projected_expenses = Decimal(0)
-    if len(expenses) >= 3:
+    if len(frame) >= 3:
         try:
-            data = [{'date': exp.date, 'amount': float(exp.amount)} for exp in expenses]
-            df = pd.DataFrame(data)
-            df['date'] = pd.to_datetime(df['date'])
-            df.set_index('date', inplace=True)
-            df = df.resample('M').sum().fillna(0)
-            if len(df) >= 3:
-                model = ARIMA(df['amount'], order=(1, 0, 0))
+            monthly = frame.monthly_totals()
+            if len(monthly) >= 3:
+                model = ARIMA(monthly, order=(1, 0, 0))
                 model_fit = model.fit()
                 forecast = model_fit.forecast(steps=1)
                 projected_expenses = Decimal(forecast.iloc[0]).quantize(Decimal("0.01"))
@@ -582,24 +585,12 @@ async def get_financial_advice(
     else:
         projected_expenses = stats.total_expenses * Decimal("1.05")
 
-    spending_trend_slope = 0.0
+    spending_trend_slope = frame.trend_slope()
     spending_trend = "stable"
-    if len(expenses) >= 2:
-        try:
-            base_date = min(exp.date for exp in expenses)
-            dates = [(exp.date - base_date).days for exp in expenses]
-            amounts = [float(exp.amount) for exp in expenses]
-            X = np.array(dates).reshape(-1, 1)
-            y = np.array(amounts)
-            model = LinearRegression()
-            model.fit(X, y)
-            spending_trend_slope = float(model.coef_[0])
-            if spending_trend_slope > 0.1:
-                spending_trend = "increasing"
-            elif spending_trend_slope < -0.1:
-                spending_trend = "decreasing"
-        except Exception as e:
-            logger.warning(f"Linear regression failed: {str(e)}")
+    if spending_trend_slope > 0.1:
+        spending_trend = "increasing"
+    elif spending_trend_slope < -0.1:
+        spending_trend = "decreasing"
 
     savings_ratio = float((stats.savings_contribution / stats.total_income * 100) if stats.total_income > 0 else 0)
 
@@ -666,8 +657,14 @@ async def get_financial_analytics(
 ):
     expense_repo = _resolve_repo(expense_repo, ExpenseRepository, db)
     expense_card_repo = _resolve_repo(expense_card_repo, ExpenseCardRepository, db)
-    session = expense_repo.db
 
+    frame = await load_expense_frame(
+        current_user["user_id"],
+        from_date,
+        to_date,
+        expense_repo=expense_repo,
+        expense_card_repo=expense_card_repo,
+    )
     stats = await get_expense_stats(
         from_date,
         to_date,
@@ -675,55 +672,22 @@ async def get_financial_analytics(
         db,
         expense_card_repo=expense_card_repo,
         expense_repo=expense_repo,
+        frame=frame,
     )
 
-    expenses_query = session.query(Expense).join(ExpenseCard).filter(
-        ExpenseCard.customer_id == current_user["user_id"]
-    )
-    if from_date:
-        expenses_query = expenses_query.filter(Expense.date >= from_date)
-    if to_date:
-        expenses_query = expenses_query.filter(Expense.date <= to_date)
-    expenses = expenses_query.all()
-
-    expense_distribution = {}
-    for expense in expenses:
-        category = expense.category.value if expense.category else "Uncategorized"
-        expense_distribution[category] = expense_distribution.get(category, Decimal(0)) + expense.amount
     expense_distribution = {
         k: float((v / stats.total_expenses * 100) if stats.total_expenses > 0 else 0)
-        for k, v in expense_distribution.items()
+        for k, v in frame.totals_by_category().items()
     }
+    transaction_counts = frame.counts_by_category()
 
-    transaction_counts = {}
-    for expense in expenses:
-        category = expense.category.value if expense.category else "Uncategorized"
-        transaction_counts[category] = transaction_counts.get(category, 0) + 1
-
-    income_count = db.query(ExpenseCard).filter(
-        ExpenseCard.customer_id == current_user["user_id"],
-        ExpenseCard.income_amount > 0
-    ).count()
-    expense_count = len(expenses)
+    income_count = frame.income_card_count
+    expense_count = len(frame)
     avg_income = Decimal(stats.total_income / income_count if income_count > 0 else 0).quantize(Decimal("0.01"))
     avg_expense = Decimal(stats.total_expenses / expense_count if expense_count > 0 else 0).quantize(Decimal("0.01"))
 
-    spending_trend_slope = 0.0
-    if len(expenses) >= 2:
-        try:
-            base_date = min(exp.date for exp in expenses)
-            dates = [(exp.date - base_date).days for exp in expenses]
-            amounts = [float(exp.amount) for exp in expenses]
-            X = np.array(dates).reshape(-1, 1)
-            y = np.array(amounts)
-            model = LinearRegression()
-            model.fit(X, y)
-            spending_trend_slope = float(model.coef_[0])
-        except Exception as e:
-            logger.warning(f"Linear regression failed: {str(e)}")
-
-    amounts = [float(exp.amount) for exp in expenses]
-    expense_volatility = float(np.std(amounts)) if amounts else 0.0
+    spending_trend_slope = frame.trend_slope()
+    expense_volatility = frame.volatility()
 
     top_expense_category = None
     top_expense_percentage = 0.0
@@ -919,7 +883,7 @@ async def get_eligible_savings(
         data={"savings": results, "count": len(results)}
     )
 
-@cached(ttl=300, key_prefix="expenses")
+@cached(ttl=300, key_prefix="expenses", scope=_customer_scope)
 async def get_all_expenses(
     limit: int,
     offset: int,
@@ -931,50 +895,49 @@ async def get_all_expenses(
     search: str | None,
     current_user: dict,
     db: Session,
+    after_date: date | None = None,
+    after_id: int | None = None,
     *,
     expense_repo: ExpenseRepository | None = None,
 ):
-    """Get all expenses across all cards with advanced filtering"""
+    """
+    Get all expenses across all cards with advanced filtering.
+
+    Pass ``after_date``/``after_id`` from the previous page's ``next_cursor``
+    to page by keyset instead of offset; those pages skip the totals.
+    """
 
     expense_repo = _resolve_repo(expense_repo, ExpenseRepository, db)
-    session = expense_repo.db
 
-    # Base query
-    query = session.query(Expense).join(ExpenseCard).filter(
-        ExpenseCard.customer_id == current_user["user_id"]
-    )
-    
-    # Apply filters
-    if from_date:
-        query = query.filter(Expense.date >= from_date)
-    if to_date:
-        query = query.filter(Expense.date <= to_date)
+    cat = None
     if category:
         try:
             cat = ExpenseCategory[category.upper()]
-            query = query.filter(Expense.category == cat)
         except KeyError:
             pass
-    if min_amount is not None:
-        query = query.filter(Expense.amount >= min_amount)
-    if max_amount is not None:
-        query = query.filter(Expense.amount <= max_amount)
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            (Expense.description.ilike(search_pattern)) |
-            (ExpenseCard.name.ilike(search_pattern))
-        )
-    
-    # Count and fetch
-    total_count = query.count()
-    total_amount = query.with_entities(func.sum(Expense.amount)).scalar() or Decimal(0)
-    
-    expenses = query.order_by(Expense.date.desc()).offset(offset).limit(limit).all()
+
+    after = (after_date, after_id) if after_date is not None and after_id is not None else None
+    expenses, total_count, total_amount = expense_repo.search_for_user(
+        user_id=current_user["user_id"],
+        limit=limit,
+        offset=offset,
+        after=after,
+        from_date=from_date,
+        to_date=to_date,
+        category=cat,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        search=search,
+    )
     
     # Format response
     from schemas.expenses import ExpenseResponse
     response_data = [ExpenseResponse.from_orm(exp) for exp in expenses]
+    next_cursor = (
+        {"after_date": expenses[-1].date, "after_id": expenses[-1].id}
+        if len(expenses) == limit
+        else None
+    )
     
     logger.info(f"Retrieved {len(response_data)} expenses for user {current_user['user_id']}")
     return success_response(
@@ -983,12 +946,52 @@ async def get_all_expenses(
         data={
             "expenses": response_data,
             "total_count": total_count,
-            "total_amount": float(total_amount),
+            "total_amount": float(total_amount) if total_amount is not None else None,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor,
         }
     )
 
+async def export_expenses(
+    fmt: str,
+    from_date: date | None,
+    to_date: date | None,
+    category: str | None,
+    min_amount: Decimal | None,
+    max_amount: Decimal | None,
+    search: str | None,
+    current_user: dict,
+):
+    """Stream the customer's expenses matching the get_all_expenses filters as CSV or NDJSON"""
+    cat = None
+    if category:
+        try:
+            cat = ExpenseCategory[category.upper()]
+        except KeyError:
+            pass
+    filters = {
+        "user_id": current_user["user_id"],
+        "from_date": from_date,
+        "to_date": to_date,
+        "category": cat,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+        "search": search,
+    }
+
+    logger.info(f"Exporting expenses as {fmt} for user {current_user['user_id']}")
+    return export_response(
+        session_rows(
+            lambda session: ExpenseRepository(session).stream_for_user(
+                batch_size=EXPORT_BATCH_ROWS, **filters
+            )
+        ),
+        EXPENSE_EXPORT_COLUMNS,
+        fmt,
+        f"expenses-{date.today().isoformat()}",
+    )
+
 async def update_expense(
     expense_id: int,
     updates: dict,
@@ -1017,7 +1020,6 @@ async def update_expense(
         return error_response(status_code=404, message="Expense not found or access denied")
     
     card = expense.expense_card
-    old_amount = expense.amount
     
     # Update fields
     if 'category' in updates and updates['category'] is not None:
@@ -1031,24 +1033,27 @@ async def update_expense(
         if new_amount <= 0:
             return error_response(status_code=400, message="Amount must be positive")
         
-        # Adjust card balance
-        amount_diff = new_amount - old_amount
-        if amount_diff > card.balance:
+        # Adjust card balance against the stored amount in the same statement
+        old_amount = expense_repo.change_amount(expense_id, current_user["user_id"], new_amount)
+        if old_amount is None:
+            session.rollback()
             return error_response(status_code=400, message="Insufficient card balance for this update")
         
-        card.balance -= amount_diff
-        expense.amount = new_amount
+        RollupRepository(session).apply_expense(
+            customer_id=card.customer_id,
+            business_id=card.business_id,
+            recorded_on=expense.created_at.date(),
+            amount=new_amount - old_amount,
+        )
     
     expense.updated_at = datetime.now(timezone.utc)
     expense.updated_by = current_user["user_id"]
-    card.updated_at = datetime.now(timezone.utc)
-    card.updated_by = current_user["user_id"]
     
     session.commit()
     session.refresh(expense)
     
     logger.info(f"Updated expense {expense_id} for user {current_user['user_id']}")
-    await get_cache().clear_pattern("expenses:*")
+    await _expense_data_changed(current_user["user_id"])
     return ExpenseResponse.from_orm(expense)
 
 async def delete_expense(
@@ -1063,32 +1068,22 @@ async def delete_expense(
     expense_repo = _resolve_repo(expense_repo, ExpenseRepository, db)
     session = expense_repo.db
 
-    expense = (
-        session.query(Expense)
-        .join(ExpenseCard)
-        .filter(
-            Expense.id == expense_id,
-            ExpenseCard.customer_id == current_user["user_id"],
-        )
-        .first()
-    )
-    
-    if not expense:
+    # Delete and refund to card balance in one statement
+    removed = expense_repo.delete_with_refund(expense_id, current_user["user_id"])
+    if not removed:
         return error_response(status_code=404, message="Expense not found or access denied")
     
-    card = expense.expense_card
-    refund_amount = expense.amount
-    
-    # Refund to card balance
-    card.balance += refund_amount
-    card.updated_at = datetime.now(timezone.utc)
-    card.updated_by = current_user["user_id"]
-    
-    session.delete(expense)
+    card_id, refund_amount, customer_id, business_id, created_at = removed
+    RollupRepository(session).apply_expense(
+        customer_id=customer_id,
+        business_id=business_id,
+        recorded_on=created_at.date(),
+        amount=-refund_amount,
+    )
     session.commit()
     
-    logger.info(f"Deleted expense {expense_id}, refunded {refund_amount} to card {card.id}")
-    await get_cache().clear_pattern("expenses:*")
+    logger.info(f"Deleted expense {expense_id}, refunded {refund_amount} to card {card_id}")
+    await _expense_data_changed(current_user["user_id"])
     return success_response(
         status_code=200,
         message="Expense deleted successfully",
@@ -1156,26 +1151,19 @@ async def create_planner_card(
     )
     session.flush()
     
-    # Create planned expenses
-    for expense_data in planned_expenses:
-        expense_repo.create(
-            {
-                "expense_card_id": expense_card.id,
-                "category": expense_data['category'],
-                "amount": expense_data['amount'],
-                "planned_amount": expense_data['amount'],
-                "purpose": expense_data.get('purpose', ''),
-                "description": expense_data.get('purpose', ''),
-                "date": datetime.now(timezone.utc).date(),
-                "is_planned": True,
-                "is_completed": False,
-                "created_by": current_user["user_id"],
-                "created_at": datetime.now(timezone.utc),
-            }
-        )
+    expense_repo.add_planned_items(
+        expense_card.id, planned_expenses, created_by=current_user["user_id"]
+    )
+    RollupRepository(session).apply_expense(
+        customer_id=current_user["user_id"],
+        business_id=business_id,
+        recorded_on=datetime.now(timezone.utc).date(),
+        amount=total_planned,
+    )
  
     session.commit()
     session.refresh(expense_card)
+    await _expense_data_changed(current_user["user_id"])
     
     # Generate AI advice (reuse existing logic)
     advice_parts = []
@@ -1263,6 +1251,7 @@ async def activate_planner_card(
     session.refresh(card)
     
     logger.info(f"Activated planner card {card_id} for user {current_user['user_id']}")
+    await _expense_data_changed(current_user["user_id"])
     
     return ExpenseCardResponse.from_orm(card)
 
@@ -1309,6 +1298,12 @@ async def complete_planned_item(
             return error_response(status_code=400, message="Insufficient balance for actual amount")
         
         card.balance -= difference
+        RollupRepository(session).apply_expense(
+            customer_id=card.customer_id,
+            business_id=card.business_id,
+            recorded_on=expense.created_at.date(),
+            amount=difference,
+        )
     
     expense.updated_at = datetime.now(timezone.utc)
     expense.updated_by = current_user["user_id"]
@@ -1319,94 +1314,47 @@ async def complete_planned_item(
     session.refresh(expense)
     
     logger.info(f"Completed planned item {expense_id} for user {current_user['user_id']}")
+    await _expense_data_changed(current_user["user_id"])
     
     return ExpenseResponse.from_orm(expense)
 
-@cached(ttl=300, key_prefix="expenses")
+@cached(ttl=300, key_prefix="expenses", scope=_customer_scope)
 async def get_expense_metrics(
     current_user: dict,
     db: Session,
     business_id: int = None,
     *,
-    expense_card_repo: ExpenseCardRepository | None = None,
     expense_repo: ExpenseRepository | None = None,
-    user_repo: UserRepository | None = None,
 ):
     """Get aggregated expense metrics for dashboard and Expenses page"""
-    from models.user import User
-    from datetime import datetime
     from dateutil.relativedelta import relativedelta
-    
-    expense_card_repo = _resolve_repo(expense_card_repo, ExpenseCardRepository, db)
-    expense_repo = _resolve_repo(expense_repo, ExpenseRepository, db)
-    user_repo = _resolve_repo(user_repo, UserRepository, db)
-    session = expense_card_repo.db
 
+    expense_repo = _resolve_repo(expense_repo, ExpenseRepository, db)
     user_id = current_user["user_id"]
-    
-    # Get user to determine active_business_id if not provided
-    user = user_repo.get_by_id(user_id)
-    target_business_id = business_id or (user.active_business_id if user else None)
-    
-    today = datetime.now()
-    month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    month_end = month_start + relativedelta(months=1)
-    
-    # Base query for expense cards with business filter
-    cards_query = session.query(ExpenseCard).filter(ExpenseCard.customer_id == user_id)
-    if target_business_id:
-        cards_query = cards_query.filter(ExpenseCard.business_id == target_business_id)
-    
-    cards = cards_query.all()
-    
-    # Total income from all cards
-    total_income = sum(card.income_amount for card in cards) if cards else Decimal(0)
-    
-    # Total expenses (all-time)
-    expenses_all_time_query = session.query(func.coalesce(func.sum(Expense.amount), 0))\
-        .join(ExpenseCard, Expense.expense_card_id == ExpenseCard.id)\
-        .filter(ExpenseCard.customer_id == user_id)
-    
-    if target_business_id:
-        expenses_all_time_query = expenses_all_time_query.filter(ExpenseCard.business_id == target_business_id)
-    
-    total_expenses_all_time = expenses_all_time_query.scalar() or Decimal(0)
-    
-    # This month expenses
-    expenses_this_month_query = session.query(func.coalesce(func.sum(Expense.amount), 0))\
-        .join(ExpenseCard, Expense.expense_card_id == ExpenseCard.id)\
-        .filter(
-            ExpenseCard.customer_id == user_id,
-            Expense.created_at >= month_start,
-            Expense.created_at < month_end
-        )
-    
-    if target_business_id:
-        expenses_this_month_query = expenses_this_month_query.filter(ExpenseCard.business_id == target_business_id)
-    
-    this_month_expenses = expenses_this_month_query.scalar() or Decimal(0)
-    
-    # Total expense cards
-    total_expense_cards = len(cards)
-    
-    # Active cards
-    active_cards = sum(1 for card in cards if card.status == CardStatus.ACTIVE)
-    
-    logger.info(f"Aggregated expense metrics for user {user_id}, business {target_business_id}: "
-                f"total_expenses_all_time={total_expenses_all_time}, "
-                f"this_month_expenses={this_month_expenses}, total_expense_cards={total_expense_cards}, "
-                f"active_cards={active_cards}")
-    
+
+    month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    metrics = expense_repo.get_metrics(
+        user_id=user_id,
+        business_id=business_id,
+        month_start=month_start,
+        month_end=month_start + relativedelta(months=1),
+    )
+
+    logger.info(f"Aggregated expense metrics for user {user_id}, business {metrics.business_id}: "
+                f"total_expenses_all_time={metrics.total_expenses}, "
+                f"this_month_expenses={metrics.month_expenses}, total_expense_cards={metrics.card_count}, "
+                f"active_cards={metrics.active_cards}")
+
     return success_response(
         status_code=200,
         message="Expense metrics retrieved successfully",
         data={
-            "business_id": target_business_id,
-            "total_expenses_all_time": float(total_expenses_all_time),
-            "this_month_expenses": float(this_month_expenses),
-            "total_expense_cards": total_expense_cards,
-            "active_cards": active_cards,
-            "total_income": float(total_income)
+            "business_id": metrics.business_id,
+            "total_expenses_all_time": float(metrics.total_expenses),
+            "this_month_expenses": float(metrics.month_expenses),
+            "total_expense_cards": metrics.card_count,
+            "active_cards": metrics.active_cards,
+            "total_income": float(metrics.total_income)
         }
     )
 
@@ -1437,51 +1385,33 @@ async def get_planner_progress(
     if not card:
         return error_response(status_code=404, message="Planner card not found")
     
-    # Get all planned expenses
-    expenses = session.query(Expense).filter(
-        Expense.expense_card_id == card_id,
-        Expense.is_planned == True
-    ).all()
-    
-    if not expenses:
+    by_category = expense_repo.planner_progress_by_category(card_id)
+    if not by_category:
         return error_response(status_code=404, message="No planned expenses found")
-    
-    # Calculate totals
-    planned_total = sum(exp.planned_amount or exp.amount for exp in expenses)
-    actual_total = sum(exp.amount if exp.is_completed else Decimal(0) for exp in expenses)
-    completed_items = sum(1 for exp in expenses if exp.is_completed)
-    total_items = len(expenses)
+
+    planned_total = sum((row.planned for row in by_category), Decimal(0))
+    actual_total = sum((row.actual for row in by_category), Decimal(0))
+    completed_items = sum(row.completed for row in by_category)
+    total_items = sum(row.items for row in by_category)
     completion_percentage = (completed_items / total_items * 100) if total_items > 0 else 0
-    
-    # Variance by category
-    variance_by_category = {}
-    for expense in expenses:
-        category = expense.category.value if expense.category else "Uncategorized"
-        if category not in variance_by_category:
-            variance_by_category[category] = {
-                "planned": Decimal(0),
-                "actual": Decimal(0),
-                "variance": Decimal(0)
-            }
-        
-        variance_by_category[category]["planned"] += (expense.planned_amount or expense.amount)
-        if expense.is_completed:
-            variance_by_category[category]["actual"] += expense.amount
-            variance_by_category[category]["variance"] += (expense.planned_amount or expense.amount) - expense.amount
-    
-    # Items list
+
+    variance_by_category = {
+        row.category: {"planned": row.planned, "actual": row.actual, "variance": row.variance}
+        for row in by_category
+    }
+
     items = [
         {
-            "id": exp.id,
-            "category": exp.category.value if exp.category else "Uncategorized",
-            "purpose": exp.purpose or exp.description,
-            "planned_amount": float(exp.planned_amount or exp.amount),
-            "actual_amount": float(exp.amount) if exp.is_completed else None,
-            "is_completed": exp.is_completed,
-            "variance": float((exp.planned_amount or exp.amount) - exp.amount) if exp.is_completed else 0,
-            "date": exp.date.isoformat()
+            "id": item.id,
+            "category": item.category.value if item.category else "Uncategorized",
+            "purpose": item.purpose,
+            "planned_amount": float(item.planned_amount),
+            "actual_amount": float(item.amount) if item.is_completed else None,
+            "is_completed": item.is_completed,
+            "variance": float(item.planned_amount - item.amount) if item.is_completed else 0,
+            "date": item.date.isoformat()
         }
-        for exp in expenses
+        for item in expense_repo.planner_items(card_id)
     ]
     
     logger.info(f"Retrieved progress for planner card {card_id}")
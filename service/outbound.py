@@ -0,0 +1,210 @@
+"""
+Queued email and SMS delivery.
+
+Handlers call ``queue_email`` / ``queue_sms``, which only insert an
+``outbound_messages`` row in the handler's transaction, so a response no
+longer waits on an SMTP handshake or a Termii round-trip, and a message is
+never sent for a change that was rolled back.
+
+The scheduler drains each channel with ``run_outbound_batch``: due messages
+are leased in batches, emails go out over one SMTP session per batch and SMS
+over the shared Termii client, each paced to the provider's rate limit.
+Failures are retried with exponential backoff (see
+``OutboundMessageRepository.mark_failed``); permanent rejections (5xx SMTP
+replies, Termii 4xx) fail immediately. Delivery is at-least-once: a worker
+that dies between sending and committing leaves its batch to be resent when
+the lease expires.
+"""
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+import aiosmtplib
+import httpx
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.outbound import OutboundChannel, OutboundMessage
+from store.repositories import OutboundMessageRepository
+from utils.email_service import (
+    EmailContent,
+    build_email_message,
+    open_smtp_connection,
+    smtp_configured,
+)
+from utils.sms_service import TermiiError, deliver_termii_sms
+
+logger = logging.getLogger(__name__)
+
+OUTBOUND_BATCH_SIZE = 50
+# Extra wait before the next SMS after Termii answers 429
+SMS_RATE_LIMITED_PAUSE_SECONDS = 5.0
+
+
+class _Pacer:
+    """Spaces sends so a channel stays under ``rate`` messages per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_at = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        if self.next_at > now:
+            await asyncio.sleep(self.next_at - now)
+            now = self.next_at
+        self.next_at = now + self.interval
+
+    def pause(self, seconds: float) -> None:
+        self.next_at = max(self.next_at, time.monotonic()) + seconds
+
+
+# Per process and kept across batches, so back-to-back batches stay paced
+_pacers: Dict[OutboundChannel, _Pacer] = {
+    OutboundChannel.EMAIL: _Pacer(settings.EMAIL_SEND_RATE_PER_SECOND),
+    OutboundChannel.SMS: _Pacer(settings.SMS_SEND_RATE_PER_SECOND),
+}
+
+
+def queue_email(
+    db: Session,
+    to_email: str,
+    subject: str,
+    html_body: str,
+    text_body: Optional[str] = None,
+) -> OutboundMessage:
+    """Queue an email; it is sent once the caller commits."""
+    return OutboundMessageRepository(db).enqueue(
+        channel=OutboundChannel.EMAIL,
+        recipient=to_email,
+        subject=subject,
+        body=html_body,
+        text_body=text_body,
+    )
+
+
+def queue_template_email(
+    db: Session,
+    to_email: str,
+    render: Callable[..., EmailContent],
+    *args,
+) -> Optional[OutboundMessage]:
+    """
+    Render with ``render(*args)`` (one of the ``utils.email_service``
+    ``*_email_content`` builders) and queue the result. A template error is
+    logged rather than raised so it can't fail the handler.
+    """
+    try:
+        content = render(*args)
+    except Exception as e:
+        logger.error(f"[OUTBOUND] Could not render {render.__name__} for {to_email}: {str(e)}")
+        return None
+    return queue_email(db, to_email, *content)
+
+
+def queue_sms(db: Session, to_phone: str, message: str) -> OutboundMessage:
+    """Queue an SMS; it is sent once the caller commits."""
+    return OutboundMessageRepository(db).enqueue(
+        channel=OutboundChannel.SMS,
+        recipient=to_phone,
+        body=message,
+    )
+
+
+def _smtp_retryable(error: Exception) -> bool:
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(refused.code < 500 for refused in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return error.code < 500
+    return True
+
+
+async def _send_emails(repo: OutboundMessageRepository, messages: List[OutboundMessage]) -> None:
+    if not smtp_configured():
+        for message in messages:
+            repo.mark_failed(message, "Email service not configured", retry=False)
+        return
+
+    pacer = _pacers[OutboundChannel.EMAIL]
+    smtp: Optional[aiosmtplib.SMTP] = None
+    try:
+        for index, message in enumerate(messages):
+            if smtp is None or not smtp.is_connected:
+                try:
+                    smtp = await open_smtp_connection()
+                except Exception as e:
+                    # Server unreachable or login refused: retry the rest later
+                    error = f"SMTP connection failed: {type(e).__name__}: {str(e)}"
+                    logger.error(f"[OUTBOUND] {error}")
+                    for pending in messages[index:]:
+                        repo.mark_failed(pending, error)
+                    smtp = None
+                    return
+
+            await pacer.wait()
+            try:
+                await smtp.send_message(
+                    build_email_message(message.recipient, message.subject, message.body, message.text_body)
+                )
+                repo.mark_sent(message)
+            except Exception as e:
+                logger.warning(f"[OUTBOUND] Email {message.id} to {message.recipient} failed: {str(e)}")
+                repo.mark_failed(message, f"{type(e).__name__}: {str(e)}", retry=_smtp_retryable(e))
+                if isinstance(e, OSError):
+                    # Disconnected or timed out; reconnect for the next message
+                    smtp.close()
+                    smtp = None
+    finally:
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except Exception:
+                smtp.close()
+
+
+async def _send_sms(repo: OutboundMessageRepository, messages: List[OutboundMessage]) -> None:
+    pacer = _pacers[OutboundChannel.SMS]
+
+    async def send(message: OutboundMessage) -> None:
+        try:
+            await deliver_termii_sms(message.recipient, message.body)
+            repo.mark_sent(message)
+        except TermiiError as e:
+            logger.warning(f"[OUTBOUND] SMS {message.id} to {message.recipient} failed: {str(e)}")
+            if e.status_code == 429:
+                pacer.pause(SMS_RATE_LIMITED_PAUSE_SECONDS)
+            repo.mark_failed(message, str(e), retry=e.retryable)
+        except httpx.HTTPError as e:
+            logger.warning(f"[OUTBOUND] SMS {message.id} to {message.recipient} failed: {str(e)}")
+            repo.mark_failed(message, f"{type(e).__name__}: {str(e)}")
+
+    # Requests overlap on the pooled client; the pacer alone sets the rate
+    sends = []
+    for message in messages:
+        await pacer.wait()
+        sends.append(asyncio.create_task(send(message)))
+    await asyncio.gather(*sends)
+
+
+async def run_outbound_batch(
+    db: Session,
+    channel: OutboundChannel,
+    batch_size: int = OUTBOUND_BATCH_SIZE,
+) -> int:
+    """Send up to ``batch_size`` due messages on ``channel``; returns how many were claimed."""
+    repo = OutboundMessageRepository(db)
+    messages = repo.claim_due(channel, batch_size)
+    db.commit()
+    if not messages:
+        return 0
+
+    if channel == OutboundChannel.EMAIL:
+        await _send_emails(repo, messages)
+    else:
+        await _send_sms(repo, messages)
+    db.commit()
+
+    sent = sum(1 for message in messages if message.sent_at is not None)
+    logger.info(f"[OUTBOUND] {channel.value}: sent {sent}/{len(messages)}")
+    return len(messages)
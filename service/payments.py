@@ -9,7 +9,6 @@ from sqlalchemy import func, or_
 from models.payments import (
     AccountDetails,
     PaymentAccount,
-    Commission,
     PaymentRequest,
     PaymentRequestStatus,
 )
@@ -44,6 +43,8 @@ from store.repositories import (
 from models.financial_advisor import NotificationType, NotificationPriority
 from service.notifications import notify_user, notify_business_admin
 from utils.cache import cached, get_cache
+from utils.export import EXPORT_BATCH_ROWS, export_response, session_rows
+from store.repositories.payments import PAYMENT_REQUEST_EXPORT_COLUMNS
 
 logging.basicConfig(
     filename="payments.log",
@@ -757,36 +758,31 @@ async def create_payment_request(
         logger.error(f"Failed to create payment request: {str(e)}")
         return error_response(status_code=500, message=f"Failed to create payment request: {str(e)}")
 
-@cached(ttl=60, key_prefix="payment_requests")
-async def get_payment_requests(
-    business_id: Optional[int] = None,
-    customer_id: Optional[int] = None,
-    status: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    search: Optional[str] = None,
-    limit: int = 20,
-    offset: int = 0,
-    current_user: dict = None,
-    db: Session = None,
+def _payment_request_filters(
     *,
-    payments_repo: PaymentsRepository | None = None,
-    user_repo: UserRepository | None = None,
-    business_repo: BusinessRepository | None = None,
+    business_id: Optional[int],
+    customer_id: Optional[int],
+    status_filter: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    search: Optional[str],
+    current_user: dict,
+    user_repo: UserRepository,
+    business_repo: BusinessRepository,
 ):
-    """Retrieve payment requests based on user role and filters."""
-
-    payments_repo = _resolve_repo(payments_repo, PaymentsRepository, db)
-    user_repo = _resolve_repo(user_repo, UserRepository, db)
-    business_repo = _resolve_repo(business_repo, BusinessRepository, db)
-    session = payments_repo.db
+    """
+    Resolve the caller's role scope and the request filters into keyword
+    arguments for the PaymentsRepository listing/export queries.
 
+    Returns ``(filters, None)``, or ``(None, error_response)`` when the
+    caller may not see the requested payment requests or a filter is invalid.
+    """
     current_user_obj = user_repo.get_by_id(current_user["user_id"])
     if not current_user_obj:
-        return error_response(status_code=404, message="User not found")
+        return None, error_response(status_code=404, message="User not found")
 
     if current_user["role"] in ["agent", "sub_agent"]:
-        return error_response(
+        return None, error_response(
             status_code=403,
             message="Agents and sub-agents cannot view payment requests. Please use the Commissions tab instead.",
         )
@@ -798,7 +794,7 @@ async def get_payment_requests(
 
     if current_user["role"] == "customer":
         if customer_id and customer_id != current_user["user_id"]:
-            return error_response(status_code=403, message="Customers can only view their own payment requests")
+            return None, error_response(status_code=403, message="Customers can only view their own payment requests")
         base_conditions.append(PaymentAccount.customer_id == current_user["user_id"])
         base_conditions.append(
             PaymentRequest.status.in_([
@@ -809,24 +805,24 @@ async def get_payment_requests(
     elif current_user["role"] == "admin":
         admin_business = business_repo.get_by_admin_id(current_user["user_id"])
         if not admin_business:
-            return error_response(status_code=403, message="Admin is not assigned to any business")
+            return None, error_response(status_code=403, message="Admin is not assigned to any business")
         business_filter = admin_business.id
     elif current_user["role"] == "super_admin":
         business_filter = business_id
     else:
-        return error_response(status_code=403, message="Unauthorized role")
+        return None, error_response(status_code=403, message="Unauthorized role")
 
     if customer_id:
         customer = user_repo.find_one_by(id=customer_id, role="customer")
         if not customer:
-            return error_response(status_code=400, message=f"User {customer_id} is not a customer")
+            return None, error_response(status_code=400, message=f"User {customer_id} is not a customer")
         customer_filter = customer_id
 
-    if status:
+    if status_filter:
         try:
-            status_enum = PaymentRequestStatus(status.lower())
+            status_enum = PaymentRequestStatus(status_filter.lower())
         except ValueError:
-            return error_response(status_code=400, message=f"Invalid status: {status}")
+            return None, error_response(status_code=400, message=f"Invalid status: {status_filter}")
 
     start_dt = None
     end_dt = None
@@ -834,46 +830,84 @@ async def get_payment_requests(
         try:
             start_dt = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
         except ValueError:
-            return error_response(status_code=400, message=f"Invalid start_date format: {start_date}")
+            return None, error_response(status_code=400, message=f"Invalid start_date format: {start_date}")
 
     if end_date:
         try:
             end_dt = datetime.fromisoformat(end_date.replace("Z", "+00:00")) + timedelta(days=1)
         except ValueError:
-            return error_response(status_code=400, message=f"Invalid end_date format: {end_date}")
+            return None, error_response(status_code=400, message=f"Invalid end_date format: {end_date}")
+
+    return {
+        "base_conditions": base_conditions,
+        "status": status_enum,
+        "customer_id": customer_filter,
+        "business_id": business_filter,
+        "search": search,
+        "start_dt": start_dt,
+        "end_dt": end_dt,
+    }, None
 
-    payment_requests, total_count = payments_repo.get_payment_requests_with_filters(
-        base_conditions=base_conditions,
-        status=status_enum,
-        customer_id=customer_filter,
-        business_id=business_filter,
+@cached(ttl=60, key_prefix="payment_requests")
+async def get_payment_requests(
+    business_id: Optional[int] = None,
+    customer_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    current_user: dict = None,
+    db: Session = None,
+    *,
+    payments_repo: PaymentsRepository | None = None,
+    user_repo: UserRepository | None = None,
+    business_repo: BusinessRepository | None = None,
+):
+    """Retrieve payment requests based on user role and filters."""
+
+    payments_repo = _resolve_repo(payments_repo, PaymentsRepository, db)
+    user_repo = _resolve_repo(user_repo, UserRepository, db)
+    business_repo = _resolve_repo(business_repo, BusinessRepository, db)
+    session = payments_repo.db
+
+    filters, error = _payment_request_filters(
+        business_id=business_id,
+        customer_id=customer_id,
+        status_filter=status,
+        start_date=start_date,
+        end_date=end_date,
         search=search,
-        start_dt=start_dt,
-        end_dt=end_dt,
+        current_user=current_user,
+        user_repo=user_repo,
+        business_repo=business_repo,
+    )
+    if error:
+        return error
+
+    payment_requests, total_count = payments_repo.get_payment_requests_with_filters(
+        **filters,
         limit=limit,
         offset=offset,
     )
 
-    response_data = []
-    for request_obj in payment_requests:
-        payment_account = request_obj.payment_account
-        savings_account = request_obj.savings_account
-        customer = payment_account.customer if payment_account else None
-        response_data.append(
-            PaymentRequestResponse(
-                id=request_obj.id,
-                payment_account_id=request_obj.payment_account_id,
-                account_details_id=request_obj.account_details_id,
-                savings_account_id=request_obj.savings_account_id,
-                amount=request_obj.amount,
-                status=request_obj.status,
-                request_date=request_obj.request_date,
-                approval_date=request_obj.approval_date,
-                rejection_reason=request_obj.rejection_reason,
-                customer_name=customer.full_name if customer else "Unknown",
-                tracking_number=savings_account.tracking_number if savings_account else None,
-            ).model_dump()
-        )
+    response_data = [
+        PaymentRequestResponse(
+            id=row.id,
+            payment_account_id=row.payment_account_id,
+            account_details_id=row.account_details_id,
+            savings_account_id=row.savings_account_id,
+            amount=row.amount,
+            status=row.status,
+            request_date=row.request_date,
+            approval_date=row.approval_date,
+            rejection_reason=row.rejection_reason,
+            customer_name=row.customer_name,
+            tracking_number=row.tracking_number,
+        ).model_dump()
+        for row in payment_requests
+    ]
 
     logger.info(
         "Retrieved %s payment requests for user %s",
@@ -891,6 +925,51 @@ async def get_payment_requests(
         },
     )
 
+async def export_payment_requests(
+    fmt: str,
+    business_id: Optional[int] = None,
+    customer_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    search: Optional[str] = None,
+    current_user: dict = None,
+    db: Session = None,
+    *,
+    user_repo: UserRepository | None = None,
+    business_repo: BusinessRepository | None = None,
+):
+    """Stream the payment requests get_payment_requests would list as CSV or NDJSON."""
+
+    user_repo = _resolve_repo(user_repo, UserRepository, db)
+    business_repo = _resolve_repo(business_repo, BusinessRepository, db)
+
+    filters, error = _payment_request_filters(
+        business_id=business_id,
+        customer_id=customer_id,
+        status_filter=status_filter,
+        start_date=start_date,
+        end_date=end_date,
+        search=search,
+        current_user=current_user,
+        user_repo=user_repo,
+        business_repo=business_repo,
+    )
+    if error:
+        return error
+
+    logger.info("Exporting payment requests as %s for user %s", fmt, current_user["user_id"])
+    return export_response(
+        session_rows(
+            lambda session: PaymentsRepository(session).stream_payment_requests(
+                batch_size=EXPORT_BATCH_ROWS, **filters
+            )
+        ),
+        PAYMENT_REQUEST_EXPORT_COLUMNS,
+        fmt,
+        f"payment-requests-{datetime.now(timezone.utc).date().isoformat()}",
+    )
+
 async def approve_payment_request(
     request_id: int,
     current_user: dict,
@@ -899,6 +978,7 @@ async def approve_payment_request(
     payments_repo: PaymentsRepository | None = None,
     user_repo: UserRepository | None = None,
     notification_repo: UserNotificationRepository | None = None,
+    commission_repo: CommissionRepository | None = None,
 ):
     """Approve a payment request with business-scoped validation."""
 
@@ -906,16 +986,17 @@ async def approve_payment_request(
 
     payments_repo = _resolve_repo(payments_repo, PaymentsRepository, db)
     notification_repo = _resolve_repo(notification_repo, UserNotificationRepository, db)
+    commission_repo = _resolve_repo(commission_repo, CommissionRepository, db)
     session = payments_repo.db
 
     payment_request = payments_repo.get_by_id_with_relations(request_id)
     if not payment_request:
         return error_response(status_code=404, message="Payment request not found")
 
-    if payment_request.status != PaymentRequestStatus.PENDING.value:
+    if payment_request.status != PaymentRequestStatus.PENDING:
         return error_response(
             status_code=400,
-            message=f"Payment request is in {payment_request.status} status",
+            message=f"Payment request is in {payment_request.status.value} status",
         )
 
     savings_account = payment_request.savings_account
@@ -956,26 +1037,21 @@ async def approve_payment_request(
             )
         
         # Notify agent about commission paid (if commission exists for this payment request)
-        if payment_request.savings_account_id:
-            savings_account = payment_request.savings_account
-            if savings_account:
-                # Get commission for this payment request
-                commission = session.query(Commission).filter(
-                    Commission.savings_account_id == payment_request.savings_account_id
-                ).order_by(Commission.created_at.desc()).first()
-                
-                if commission and commission.agent_id:
-                    await notify_user(
-                        user_id=commission.agent_id,
-                        notification_type=NotificationType.COMMISSION_PAID,
-                        title="Commission Paid",
-                        message=f"Commission of {commission.amount:.2f} has been paid to your account from savings account {savings_account.tracking_number}",
-                        priority=NotificationPriority.HIGH,
-                        db=session,
-                        notification_repo=notification_repo,
-                        related_entity_id=commission.id,
-                        related_entity_type="commission",
-            )
+        if savings_account:
+            # Get commission for this payment request
+            commission = commission_repo.get_latest_for_savings_account(savings_account.id)
+            if commission and commission.agent_id:
+                await notify_user(
+                    user_id=commission.agent_id,
+                    notification_type=NotificationType.COMMISSION_PAID,
+                    title="Commission Paid",
+                    message=f"Commission of {commission.amount:.2f} has been paid to your account from savings account {savings_account.tracking_number}",
+                    priority=NotificationPriority.HIGH,
+                    db=session,
+                    notification_repo=notification_repo,
+                    related_entity_id=commission.id,
+                    related_entity_type="commission",
+                )
         
         await get_cache().clear_pattern("payment_requests:*")
         await get_cache().clear_pattern("agent_commissions:*")
@@ -1011,10 +1087,10 @@ async def reject_payment_request(
     if not payment_request:
         return error_response(status_code=404, message="Payment request not found")
 
-    if payment_request.status != PaymentRequestStatus.PENDING.value:
+    if payment_request.status != PaymentRequestStatus.PENDING:
         return error_response(
             status_code=400,
-            message=f"Payment request is in {payment_request.status} status",
+            message=f"Payment request is in {payment_request.status.value} status",
         )
 
     savings_account = payment_request.savings_account
@@ -1196,23 +1272,20 @@ async def get_agent_commissions(
         offset=offset,
     )
 
-    response_data = []
-    for commission in commissions:
-        savings_account = commission.savings_account
-        customer = savings_account.customer if savings_account else None
-        response_data.append(
-            CommissionResponse(
-                id=commission.id,
-                savings_account_id=commission.savings_account_id,
-                agent_id=commission.agent_id,
-                amount=commission.amount,
-                commission_date=commission.commission_date,
-                customer_id=customer.id if customer else None,
-                customer_name=customer.full_name if customer else "Unknown",
-                savings_type=savings_account.savings_type if savings_account else None,
-                tracking_number=savings_account.tracking_number if savings_account else None,
-            ).model_dump()
-        )
+    response_data = [
+        CommissionResponse(
+            id=row.id,
+            savings_account_id=row.savings_account_id,
+            agent_id=row.agent_id,
+            amount=row.amount,
+            commission_date=row.commission_date,
+            customer_id=row.customer_id,
+            customer_name=row.customer_name,
+            savings_type=row.savings_type,
+            tracking_number=row.tracking_number,
+        ).model_dump()
+        for row in commissions
+    ]
 
     logger.info(
         "Retrieved %s commissions for user %s",
@@ -1282,7 +1355,7 @@ async def get_customer_payments(
             return error_response(status_code=404, message="Savings account not found")
         base_conditions.append(PaymentRequest.savings_account_id == savings_account_id)
 
-    payment_requests, total_count = payments_repo.get_payment_requests_with_filters(
+    payment_requests, total_count = payments_repo.get_customer_payments_with_filters(
         base_conditions=base_conditions,
         customer_id=customer_filter,
         business_id=business_filter,
@@ -1292,50 +1365,35 @@ async def get_customer_payments(
     )
 
     response_data = []
-    for request_obj in payment_requests:
-        savings_account = request_obj.savings_account
-        customer = request_obj.payment_account.customer if request_obj.payment_account else None
-        paid_markings = (
-            session.query(SavingsMarking)
-            .filter(
-                SavingsMarking.savings_account_id == savings_account.id,
-                SavingsMarking.status == SavingsStatus.PAID,
-            )
-            .order_by(SavingsMarking.marking_date)
-            .all()
-        )
-        total_amount = sum(marking.amount for marking in paid_markings)
-
-        if not paid_markings:
+    for row in payment_requests:
+        if row.first_paid is None:
             total_commission = Decimal(0)
             payout_amount = Decimal(0)
         else:
-            earliest_date = paid_markings[0].marking_date
-            latest_date = paid_markings[-1].marking_date
-            total_savings_days = (latest_date - earliest_date).days + 1
-            if savings_account.commission_days == 0:
+            total_savings_days = (row.last_paid - row.first_paid).days + 1
+            if row.commission_days == 0:
                 total_commission = Decimal(0)
             else:
-                total_commission = savings_account.commission_amount * Decimal(
-                    total_savings_days / savings_account.commission_days
+                total_commission = row.commission_amount * Decimal(
+                    total_savings_days / row.commission_days
                 )
                 total_commission = round(total_commission, 2)
-            payout_amount = total_amount - total_commission
+            payout_amount = row.paid_total - total_commission
 
         response_data.append(
             CustomerPaymentResponse(
-                payment_request_id=request_obj.id,
-                savings_account_id=savings_account.id,
-                customer_id=customer.id if customer else None,
-                customer_name=customer.full_name if customer else "Unknown",
-                savings_type=savings_account.savings_type,
-                tracking_number=savings_account.tracking_number,
-                total_amount=total_amount,
+                payment_request_id=row.id,
+                savings_account_id=row.savings_account_id,
+                customer_id=row.customer_id,
+                customer_name=row.customer_name,
+                savings_type=row.savings_type,
+                tracking_number=row.tracking_number,
+                total_amount=row.paid_total,
                 total_commission=total_commission,
                 payout_amount=payout_amount,
-                status=request_obj.status,
-                created_at=request_obj.created_at,
-                updated_at=request_obj.updated_at,
+                status=row.status,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
             ).model_dump()
         )
 
@@ -14,7 +14,6 @@ from schemas.savings import (
     SavingsTargetCalculationResponse,
     SavingsMetricsResponse,
 )
-from models.expenses import ExpenseCard, Expense
 from datetime import datetime
 from utils.response import success_response, error_response
 from models.user import User, Permission
@@ -22,12 +21,9 @@ from datetime import timedelta, date
 from decimal import Decimal
 import logging
 import os
-from paystackapi.transaction import Transaction
-from paystackapi.paystack import Paystack
 from dateutil.relativedelta import relativedelta
 from models.business import Unit, user_units
 from sqlalchemy.sql import exists
-import requests
 import uuid
 import math
 from store.repositories import (
@@ -37,12 +33,15 @@ from store.repositories import (
     UserBusinessRepository,
     UserRepository,
     UserNotificationRepository,
+    RollupRepository,
 )
 from models.financial_advisor import NotificationType, NotificationPriority
 from service.notifications import notify_user, notify_business_admin
 from utils.cache import cached, get_cache
-
-paystack = Paystack(secret_key=os.getenv("PAYSTACK_SECRET_KEY"))
+from utils.paystack import get_paystack_client
+from utils.tracking_numbers import allocate_tracking_number
+from utils.export import EXPORT_BATCH_ROWS, export_response, session_rows
+from store.repositories.savings import MARKING_EXPORT_COLUMNS
 
 logging.basicConfig(
     filename="savings.log",
@@ -68,10 +67,7 @@ def _resolve_repo(repo, repo_cls, db: Session):
 
 async def initiate_virtual_account_payment(amount: Decimal, email: str, customer_id: int, reference: str, db: Session):
     try:
-        headers = {
-            "Authorization": f"Bearer {os.getenv('PAYSTACK_SECRET_KEY')}",
-            "Content-Type": "application/json",
-        }
+        paystack_client = get_paystack_client()
         user = db.query(User).filter(User.id == customer_id).first()
         if not user:
             logger.error(f"User {customer_id} not found in database")
@@ -83,11 +79,7 @@ async def initiate_virtual_account_payment(amount: Decimal, email: str, customer
                 "first_name": "Customer",
                 "last_name": f"ID_{customer_id}",
             }
-            customer_response = requests.post(
-                "https://api.paystack.co/customer",
-                headers=headers,
-                json=customer_payload,
-            )
+            customer_response = await paystack_client.request("POST", "/customer", json=customer_payload)
             customer_data = customer_response.json()
             logger.info(f"Paystack customer creation response: {customer_data}")
             if customer_response.status_code != 200 or not customer_data.get("status"):
@@ -112,9 +104,8 @@ async def initiate_virtual_account_payment(amount: Decimal, email: str, customer
             }
             logger.info(f"Generated mock virtual account: {virtual_account}")
         else:
-            dedicated_response = requests.get(
-                f"https://api.paystack.co/dedicated_account?customer={payment_provider_customer_id}",
-                headers=headers,
+            dedicated_response = await paystack_client.request(
+                "GET", "/dedicated_account", params={"customer": payment_provider_customer_id}
             )
             dedicated_data = dedicated_response.json()
             logger.info(f"Paystack dedicated account check response: {dedicated_data}")
@@ -137,11 +128,7 @@ async def initiate_virtual_account_payment(amount: Decimal, email: str, customer
                     "customer": payment_provider_customer_id,
                     "preferred_bank": "wema-bank",
                 }
-                response = requests.post(
-                    "https://api.paystack.co/dedicated_account",
-                    headers=headers,
-                    json=payload,
-                )
+                response = await paystack_client.request("POST", "/dedicated_account", json=payload)
                 response_data = response.json()
                 logger.info(f"Paystack dedicated account creation response: {response_data}")
                 if response.status_code == 200 and response_data.get("status"):
@@ -162,7 +149,7 @@ async def initiate_virtual_account_payment(amount: Decimal, email: str, customer
                         status_code=response.status_code,
                         message=f"Failed to initiate virtual account: {response_data.get('message', 'Dedicated NUBAN creation failed')}",
                     )
-        transaction = Transaction.initialize(
+        transaction = await paystack_client.initialize_transaction(
             reference=reference,
             amount=int(amount * 100),
             email=email,
@@ -192,14 +179,6 @@ def _calculate_total_days(start_date: date, duration_months: int) -> int:
     return total_days
 
 
-def _generate_unique_tracking_number(db: Session, model) -> str:
-    import random
-    while True:
-        number = ''.join([str(random.randint(0, 9)) for _ in range(10)])
-        if not db.query(model).filter(model.tracking_number == number).first():
-            return number
-
-
 def _adjust_savings_markings(savings: SavingsAccount, markings: list[SavingsMarking], db: Session):
     total_days = _calculate_total_days(savings.start_date, savings.duration_months)
     existing_days = len(markings)
@@ -301,7 +280,7 @@ async def create_savings_daily(
     commission_amount = request.commission_amount if request.commission_amount is not None else request.daily_amount
     if commission_amount < 0:
         return error_response(status_code=400, message="Commission amount cannot be negative")
-    tracking_number = _generate_unique_tracking_number(session, SavingsAccount)
+    tracking_number = allocate_tracking_number(session)
     end_date = request.start_date + relativedelta(months=request.duration_months) - timedelta(days=1)
     savings = SavingsAccount(
         customer_id=customer_id,
@@ -355,7 +334,6 @@ async def create_savings_daily(
     # Invalidate caches
     await get_cache().clear_pattern(f"savings:{tracking_number}")
     await get_cache().clear_pattern("savings:*")
-    await get_cache().clear_pattern("monthly_summary:*")
 
     return _savings_response(savings)
 
@@ -419,7 +397,7 @@ async def create_savings_target(
     if not unit_exists:
         return error_response(status_code=400, message=f"Customer {customer_id} is not associated with unit {request.unit_id} in business {request.business_id}")
     duration_months = (request.end_date.year - request.start_date.year) * 12 + request.end_date.month - request.start_date.month + 1
-    tracking_number = _generate_unique_tracking_number(session, SavingsAccount)
+    tracking_number = allocate_tracking_number(session)
     daily_amount = request.target_amount / Decimal(total_days)
     commission_amount = request.commission_amount if request.commission_amount is not None else daily_amount.quantize(Decimal("0.01"))
     if commission_amount < 0:
@@ -472,7 +450,6 @@ async def create_savings_target(
     # Invalidate caches
     await get_cache().clear_pattern(f"savings:{tracking_number}")
     await get_cache().clear_pattern("savings:*")
-    await get_cache().clear_pattern("monthly_summary:*")
 
     return _savings_response(savings)
 
@@ -529,7 +506,6 @@ async def extend_savings(
     
     # Invalidate caches
     await get_cache().clear_pattern("savings:*")
-    await get_cache().clear_pattern("monthly_summary:*")
 
     return _savings_response(savings)
 
@@ -627,7 +603,6 @@ async def update_savings(
 
     # Invalidate caches
     await get_cache().clear_pattern("savings:*")
-    await get_cache().clear_pattern("monthly_summary:*")
 
     return _savings_response(savings)
 
@@ -666,7 +641,11 @@ async def delete_savings(
     tracking_number = savings.tracking_number
     customer_id = savings.customer_id
     business_id = savings.business_id
+    group_id = savings.group_id
     session.delete(savings)
+    if group_id:
+        session.flush()
+        RollupRepository(session).refresh_group_rollups([group_id])
     session.commit()
     logger.info(f"Deleted savings account {tracking_number} (ID: {savings_id}) for customer {customer_id}")
     
@@ -699,7 +678,6 @@ async def delete_savings(
     # Invalidate caches
     await get_cache().clear_pattern(f"savings:{tracking_number}")
     await get_cache().clear_pattern("savings:*")
-    await get_cache().clear_pattern("monthly_summary:*")
 
     return success_response(
         status_code=200,
@@ -708,6 +686,43 @@ async def delete_savings(
     )
 
 
+def _savings_scope(current_user: dict, business_id: int | None, business_repo: BusinessRepository):
+    """
+    Resolve which customer and business the caller's savings queries are
+    limited to. Customers see only their own savings; agents only businesses
+    they belong to; admins and super admins fall back to the active business.
+
+    Returns ``({"customer_id": ..., "business_id": ...}, None)``, or
+    ``(None, error_response)`` when the caller may not see that business.
+    """
+    customer_id: int | None = None
+    target_business_id: int | None = None
+    role = current_user["role"]
+    if role == "customer":
+        customer_id = current_user["user_id"]
+        target_business_id = business_id or current_user.get("active_business_id")
+    elif role in {"agent", "sub_agent"}:
+        business_ids = [b.id for b in business_repo.get_user_businesses_with_units(current_user["user_id"]) or []]
+        if not business_ids:
+            return None, error_response(status_code=400, message="No business associated with user")
+        if business_id:
+            if business_id not in business_ids:
+                return None, error_response(status_code=403, message="You don't have access to this business")
+            target_business_id = business_id
+        elif current_user.get("active_business_id") and current_user["active_business_id"] in business_ids:
+            target_business_id = current_user["active_business_id"]
+        else:
+            return None, error_response(status_code=400, message="Please specify a business_id or set an active business")
+    elif role == "admin":
+        target_business_id = business_id or current_user.get("active_business_id")
+        if not target_business_id:
+            return None, error_response(status_code=400, message="Please specify a business_id parameter")
+    elif role == "super_admin":
+        target_business_id = business_id or current_user.get("active_business_id")
+    else:
+        return None, error_response(status_code=401, message="Unauthorized role")
+    return {"customer_id": customer_id, "business_id": target_business_id}, None
+
 @cached(ttl=300, key_prefix="savings")
 async def get_all_savings(
     customer_id: int | None,
@@ -726,39 +741,14 @@ async def get_all_savings(
     user_business_repo: UserBusinessRepository | None = None,
     unit_repo: UnitRepository | None = None,
 ):
-    target_business_id: int | None = None
-    effective_customer_id: int | None = None
     role = current_user["role"]
-    if role == "customer":
-        if customer_id and customer_id != current_user["user_id"]:
-            return error_response(status_code=403, message="Customers can only view their own savings")
-        effective_customer_id = current_user["user_id"]
-        if business_id:
-            # Note: current_user_obj is not defined here - assuming it's available or fix in caller
-            # For safety, we'll skip business check or assume it's handled upstream
-            target_business_id = business_id
-        elif current_user.get("active_business_id"):
-            target_business_id = current_user["active_business_id"]
-    elif role in {"agent", "sub_agent"}:
-        business_ids = [b.id for b in business_repo.get_user_businesses_with_units(current_user["user_id"]) or []]
-        if not business_ids:
-            return error_response(status_code=400, message="No business associated with user")
-        if business_id:
-            if business_id not in business_ids:
-                return error_response(status_code=403, message="You don't have access to this business")
-            target_business_id = business_id
-        elif current_user.get("active_business_id") and current_user["active_business_id"] in business_ids:
-            target_business_id = current_user["active_business_id"]
-        else:
-            return error_response(status_code=400, message="Please specify a business_id or set an active business")
-    elif role == "admin":
-        target_business_id = business_id or current_user.get("active_business_id")
-        if not target_business_id:
-            return error_response(status_code=400, message="Please specify a business_id parameter")
-    elif role == "super_admin":
-        target_business_id = business_id or current_user.get("active_business_id")
-    else:
-        return error_response(status_code=401, message="Unauthorized role")
+    if role == "customer" and customer_id and customer_id != current_user["user_id"]:
+        return error_response(status_code=403, message="Customers can only view their own savings")
+    scope, error = _savings_scope(current_user, business_id, business_repo)
+    if error:
+        return error
+    target_business_id = scope["business_id"]
+    effective_customer_id = scope["customer_id"]
     if customer_id and role != "customer":
         customer = user_repo.find_one_by(id=customer_id, role="customer")
         if not customer:
@@ -865,7 +855,7 @@ async def mark_savings_payment(
         ref_suffix = str(uuid.uuid4())[:8]
         reference = f"sv_{tracking_number}_{ref_suffix}"
         total_kobo = int(total_amount * 100)
-        resp = Transaction.initialize(
+        resp = await get_paystack_client().initialize_transaction(
             reference=reference,
             amount=total_kobo,
             email=customer.email,
@@ -927,51 +917,84 @@ async def mark_savings_bulk(
         tn = item.tracking_number
         markings_by_tracking.setdefault(tn, []).append(item)
     
-    all_markings = []
-    total_amount = Decimal("0")
-    tracking_numbers = set()
-    
+    # One query for every account, carrying its earliest pending date and
+    # whether it has a schedule at all, instead of a query per tracking number.
+    earliest_pending_q = (
+        db.query(func.min(SavingsMarking.marked_date))
+        .filter(
+            SavingsMarking.savings_account_id == SavingsAccount.id,
+            SavingsMarking.status == SavingsStatus.PENDING,
+        )
+        .correlate(SavingsAccount)
+        .scalar_subquery()
+    )
+    has_schedule_q = (
+        exists()
+        .where(SavingsMarking.savings_account_id == SavingsAccount.id)
+        .correlate(SavingsAccount)
+    )
+    account_rows = db.query(SavingsAccount, earliest_pending_q, has_schedule_q).filter(
+        SavingsAccount.tracking_number.in_(list(markings_by_tracking))
+    ).all()
+    accounts = {row[0].tracking_number: row for row in account_rows}
+
+    windows = []
     for tn, items in markings_by_tracking.items():
-        savings = db.query(SavingsAccount).filter(
-            SavingsAccount.tracking_number == tn
-        ).first()
-        if not savings:
+        if tn not in accounts:
             raise HTTPException(404, f"Savings {tn} not found")
+        savings, earliest_pending, has_schedule = accounts[tn]
         if current_user["role"] == "customer" and savings.customer_id != current_user["user_id"]:
             raise HTTPException(403, f"Not your savings: {tn}")
-        account_markings = db.query(SavingsMarking).filter(
-            SavingsMarking.savings_account_id == savings.id
-        ).order_by(SavingsMarking.marked_date.asc()).all()
-        if not account_markings:
+        if not has_schedule:
             raise HTTPException(400, f"No schedule for {tn}")
-        earliest_pending = next(
-            (m.marked_date for m in account_markings if m.status == SavingsStatus.PENDING),
-            None
-        )
         if not earliest_pending:
             raise HTTPException(400, f"No pending markings for {tn}")
-        requested_dates = sorted([item.marked_date for item in items])
+        requested_dates = sorted(item.marked_date for item in items)
         if requested_dates[0] != earliest_pending:
             raise HTTPException(
                 400, f"Must start with earliest pending {earliest_pending} for {tn}"
             )
-        current_expected = earliest_pending
+        windows.append((tn, savings, requested_dates))
+
+    # Second query: only the pending markings between each account's earliest
+    # pending date and its last requested date.
+    pending = db.query(SavingsMarking).filter(
+        SavingsMarking.status == SavingsStatus.PENDING,
+        or_(*[
+            (SavingsMarking.savings_account_id == savings.id)
+            & (SavingsMarking.marked_date <= requested_dates[-1])
+            for _, savings, requested_dates in windows
+        ]),
+    ).all()
+    pending_by_account = {}
+    for marking in pending:
+        pending_by_account.setdefault(marking.savings_account_id, {})[marking.marked_date] = marking
+
+    all_markings = []
+    total_amount = Decimal("0")
+    tracking_numbers = []
+
+    for tn, savings, requested_dates in windows:
+        window = pending_by_account.get(savings.id, {})
+        for previous, req_date in zip(requested_dates, requested_dates[1:]):
+            if req_date == previous:
+                raise HTTPException(400, f"Non-sequential: {req_date} expected {previous + timedelta(days=1)} for {tn}")
         for req_date in requested_dates:
-            marking = next((m for m in account_markings if m.marked_date == req_date), None)
-            if not marking or marking.status != SavingsStatus.PENDING:
+            if req_date not in window:
                 raise HTTPException(400, f"Invalid/marked date {req_date} for {tn}")
-            while current_expected < req_date:
-                inter = next((m for m in account_markings if m.marked_date == current_expected), None)
-                if inter and inter.status == SavingsStatus.PENDING:
-                    raise HTTPException(400, f"Gap: pending {current_expected} before {req_date} for {tn}")
-                current_expected += timedelta(days=1)
-            if req_date != current_expected:
-                raise HTTPException(400, f"Non-sequential: {req_date} expected {current_expected} for {tn}")
-            current_expected += timedelta(days=1)
+        # Every requested date is pending and unique, so the run is contiguous
+        # exactly when the window holds no other pending marking.
+        if len(window) != len(requested_dates):
+            requested = set(requested_dates)
+            gap = min(d for d in window if d not in requested)
+            following = next(d for d in requested_dates if d > gap)
+            raise HTTPException(400, f"Gap: pending {gap} before {following} for {tn}")
+        for req_date in requested_dates:
+            marking = window[req_date]
             all_markings.append(marking)
             total_amount += marking.amount
-        tracking_numbers.add(tn)
-    
+        tracking_numbers.append(tn)
+
     if total_amount <= 0:
         raise HTTPException(400, "Total amount must be positive")
     
@@ -989,14 +1012,12 @@ async def mark_savings_bulk(
     if not reference:
         ref_suffix = str(uuid.uuid4())[:8]
         reference = f"sv_bulk_{ref_suffix}"
-        first_savings = db.query(SavingsAccount).filter(
-            SavingsAccount.tracking_number == list(tracking_numbers)[0]
-        ).first()
+        first_savings = accounts[tracking_numbers[0]][0]
         customer = db.query(User).filter(User.id == first_savings.customer_id).first()
         if not customer or not customer.email:
             raise HTTPException(400, "Customer email required")
         total_kobo = int(total_amount * 100)
-        resp = Transaction.initialize(
+        resp = await get_paystack_client().initialize_transaction(
             reference=reference,
             amount=total_kobo,
             email=customer.email,
@@ -1041,7 +1062,16 @@ async def mark_savings_bulk(
 
 
 async def verify_savings_payment(reference: str, db: Session):
-    logger.info(f"[SAVINGS-VERIFY] Starting verification for reference: {reference}")
+    """
+    Report the settlement status of a savings payment.
+
+    Payments are settled from Paystack webhooks by the settlement queue
+    (service/settlements.py); this only reads the initiation, applying a
+    queued event for the reference inline if the settler hasn't yet.
+    """
+    from service.settlements import settle_reference
+
+    logger.info(f"[SAVINGS-VERIFY] Checking settlement for reference: {reference}")
     initiation = db.query(PaymentInitiation).filter(
         PaymentInitiation.reference == reference
     ).first()
@@ -1049,95 +1079,27 @@ async def verify_savings_payment(reference: str, db: Session):
         logger.error(f"[SAVINGS-VERIFY] Initiation not found for reference {reference}")
         raise HTTPException(404, "Payment initiation not found")
     
-    if initiation.status == PaymentInitiationStatus.COMPLETED.value:
-        logger.info(f"[SAVINGS-VERIFY] Already completed - idempotent success")
-        return success_response(200, "Payment already verified")
-    
-    if initiation.status != PaymentInitiationStatus.PENDING.value:
-        logger.warning(f"[SAVINGS-VERIFY] Invalid state for {reference}: {initiation.status}")
-        raise HTTPException(400, "Initiation not in pending state")
-    
-    resp = Transaction.verify(reference=reference)
-    if not resp["status"] or resp["data"]["status"] != "success":
-        logger.error(f"[SAVINGS-VERIFY] Paystack verification failed: {resp.get('message')}")
-        initiation.status = PaymentInitiationStatus.FAILED.value
-        db.commit()
-        raise HTTPException(400, "Payment verification failed")
-    
-    paid_amount = Decimal(resp["data"]["amount"]) / 100
-    logger.info(f"[SAVINGS-VERIFY] Paid amount: {paid_amount}")
+    if initiation.status == PaymentInitiationStatus.PENDING.value:
+        await settle_reference(reference, db)
+        db.refresh(initiation)
     
     metadata = initiation.payment_metadata or {}
-    marking_ids = metadata.get("marking_ids", []) or [metadata.get("marking_id")]
-    if not marking_ids:
-        logger.error("[SAVINGS-VERIFY] No marking_ids in metadata")
-        initiation.status = PaymentInitiationStatus.FAILED.value
-        db.commit()
-        raise HTTPException(400, "No markings associated with this initiation")
-    
-    markings = db.query(SavingsMarking).filter(
-        SavingsMarking.id.in_(marking_ids),
-        SavingsMarking.status == SavingsStatus.PENDING
-    ).all()
-    expected = sum(m.amount for m in markings)
-    if paid_amount < expected:
-        logger.error(f"[SAVINGS-VERIFY] Underpayment: {paid_amount} < {expected}")
-        initiation.status = PaymentInitiationStatus.FAILED.value
-        db.commit()
-        raise HTTPException(400, f"Underpayment: {paid_amount} < {expected}")
-    
-    for marking in markings:
-        marking.status = SavingsStatus.PAID
-        marking.payment_reference = reference
-        marking.updated_at = datetime.utcnow()
-    
-    db.commit()
-    logger.info(f"[SAVINGS-VERIFY] Updated {len(markings)} markings to PAID")
-    
-    savings_ids = {m.savings_account_id for m in markings}
-    completion_messages = []
-    for savings_id in savings_ids:
-        savings = db.query(SavingsAccount).get(savings_id)
-        if not savings:
-            continue
-        pending_count = db.query(SavingsMarking).filter(
-            SavingsMarking.savings_account_id == savings_id,
-            SavingsMarking.status == SavingsStatus.PENDING
-        ).count()
-        if pending_count == 0 and savings.marking_status != MarkingStatus.COMPLETED:
-            savings.marking_status = MarkingStatus.COMPLETED
-            total_commission = calculate_total_commission(savings)
-            completion_messages.append(
-                f"Congratulations! You have successfully completed savings plan {savings.tracking_number}! "
-                f"Total commission: {total_commission}"
-            )
-    
-    db.commit()
-    
-    initiation.status = PaymentInitiationStatus.COMPLETED.value
-    db.commit()
-    logger.info(f"[SAVINGS-VERIFY] Initiation marked COMPLETED")
+    if initiation.status == PaymentInitiationStatus.COMPLETED.value:
+        return success_response(
+            status_code=200,
+            message="Payment verified successfully",
+            data=metadata.get("settlement") or {"reference": reference, "status": "PAID"},
+        )
     
-    response_data = {
-        "reference": reference,
-        "status": "PAID",
-        "paid_amount": float(paid_amount),
-        "markings_updated": len(markings),
-        "tracking_numbers": list({m.savings_account.tracking_number for m in markings if m.savings_account}),
-        "marked_dates": [m.marked_date.isoformat() for m in markings],
-    }
-    if completion_messages:
-        response_data["completion_message"] = " ".join(completion_messages)
+    if initiation.status == PaymentInitiationStatus.PENDING.value:
+        return success_response(
+            status_code=202,
+            message="Payment pending confirmation",
+            data={"reference": reference, "status": "PENDING"},
+        )
     
-    # Invalidate caches
-    await get_cache().clear_pattern("savings:*")
-    await get_cache().clear_pattern("savings_markings:*")
-
-    return success_response(
-        status_code=200,
-        message="Payment verified successfully",
-        data=response_data
-    )
+    logger.warning(f"[SAVINGS-VERIFY] Invalid state for {reference}: {initiation.status}")
+    raise HTTPException(400, metadata.get("failure_reason") or "Payment verification failed")
 
 
 async def confirm_bank_transfer(reference: str, current_user: dict, db: Session):
@@ -1184,6 +1146,7 @@ async def confirm_bank_transfer(reference: str, current_user: dict, db: Session)
             message=f"Paid amount {total_paid} less than expected {total_amount}"
         )
     
+    newly_paid_ids = []
     for marking in markings:
         if marking.status != SavingsStatus.PENDING:
             logger.warning(f"Marking for date {marking.marked_date} is not PENDING (status: {marking.status})")
@@ -1192,6 +1155,8 @@ async def confirm_bank_transfer(reference: str, current_user: dict, db: Session)
         marking.marked_by_id = current_user["user_id"]
         marking.updated_at = datetime.now()
         marking.updated_by = current_user["user_id"]
+        newly_paid_ids.append(marking.id)
+    RollupRepository(db).apply_paid_markings(newly_paid_ids)
     
     completion_message = None
     for savings_id in {m.savings_account_id for m in markings}:
@@ -1223,7 +1188,6 @@ async def confirm_bank_transfer(reference: str, current_user: dict, db: Session)
     # Invalidate caches after bank transfer confirmation
     await get_cache().clear_pattern("savings:*")
     await get_cache().clear_pattern("savings_markings:*")
-    await get_cache().clear_pattern("monthly_summary:*")
     
     return success_response(
         status_code=200,
@@ -1258,7 +1222,6 @@ async def end_savings_markings(tracking_number: str, current_user: dict, db: Ses
     await get_cache().clear_pattern(f"savings:{tracking_number}")
     await get_cache().clear_pattern("savings:*")
     await get_cache().clear_pattern("savings_markings:*")
-    await get_cache().clear_pattern("monthly_summary:*")
 
     return success_response(
         status_code=200,
@@ -1300,6 +1263,51 @@ async def get_savings_markings_by_tracking_number(
     logger.info(f"Retrieved {len(savings_schedule)} markings for savings {tracking_number}")
     return success_response(status_code=200, message="Savings schedule retrieved successfully", data=response_data.model_dump())
 
+async def export_savings_markings(
+    fmt: str,
+    business_id: int | None,
+    tracking_number: str | None,
+    marking_status: str | None,
+    from_date: date | None,
+    to_date: date | None,
+    current_user: dict,
+    db: Session,
+    *,
+    business_repo: BusinessRepository | None = None,
+):
+    """Stream savings markings as CSV or NDJSON, scoped by role as in get_all_savings."""
+    business_repo = _resolve_repo(business_repo, BusinessRepository, db)
+
+    scope, error = _savings_scope(current_user, business_id, business_repo)
+    if error:
+        return error
+
+    status_enum = None
+    if marking_status:
+        try:
+            status_enum = SavingsStatus(marking_status.lower())
+        except ValueError:
+            return error_response(status_code=400, message=f"Invalid status: {marking_status}")
+
+    filters = {
+        **scope,
+        "tracking_number": tracking_number,
+        "status": status_enum,
+        "from_date": from_date,
+        "to_date": to_date,
+    }
+    logger.info(f"Exporting savings markings as {fmt} for user {current_user['user_id']}")
+    return export_response(
+        session_rows(
+            lambda session: SavingsRepository(session).stream_markings(
+                batch_size=EXPORT_BATCH_ROWS, **filters
+            )
+        ),
+        MARKING_EXPORT_COLUMNS,
+        fmt,
+        f"savings-markings-{date.today().isoformat()}",
+    )
+
 async def get_savings_metrics(
     user_id: str,
     db: Session,
@@ -1503,73 +1511,35 @@ async def get_savings_metrics(
     )
 
 
-@cached(ttl=300, key_prefix="monthly_summary")
-async def get_monthly_summary(current_user: dict, db: Session, business_id: int | None = None):
-    """Get monthly summary of savings and expenses for the current month, plus all-time totals"""
-    
+async def get_monthly_summary(
+    current_user: dict,
+    db: Session,
+    business_id: int | None = None,
+    start_month: date | None = None,
+    end_month: date | None = None,
+    *,
+    rollup_repo: RollupRepository | None = None,
+):
+    """Get monthly summary of savings and expenses for the current month, plus all-time totals.
+
+    Served from ``customer_monthly_rollup``; pass ``start_month``/``end_month`` to
+    also return a per-month history for that range.
+    """
+    rollup_repo = _resolve_repo(rollup_repo, RollupRepository, db)
+
     now = datetime.now()
-    month_start = datetime(now.year, now.month, 1)
-    if now.month == 12:
-        month_end = datetime(now.year + 1, 1, 1) - timedelta(seconds=1)
-    else:
-        month_end = datetime(now.year, now.month + 1, 1) - timedelta(seconds=1)
-    
     user_id = current_user["user_id"]
-    
-    total_savings_current_month = db.query(
-        func.coalesce(func.sum(SavingsMarking.amount), 0)
-    ).join(
-        SavingsAccount, SavingsMarking.savings_account_id == SavingsAccount.id
-    ).filter(
-        SavingsAccount.customer_id == user_id,
-        SavingsMarking.status == SavingsStatus.PAID,
-        SavingsMarking.marked_date >= month_start.date(),
-        SavingsMarking.marked_date <= month_end.date()
-    ).scalar() or Decimal('0')
-    
-    if business_id:
-        total_savings_current_month = db.query(
-            func.coalesce(func.sum(SavingsMarking.amount), 0)
-        ).join(
-            SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id
-        ).filter(
-            SavingsAccount.customer_id == user_id,
-            SavingsAccount.business_id == business_id,
-            SavingsMarking.status == SavingsStatus.PAID,
-            SavingsMarking.marked_date >= month_start.date(),
-            SavingsMarking.marked_date <= month_end.date(),
-        ).scalar() or Decimal("0")
-    
-    total_expenses_current_month = db.query(
-        func.coalesce(func.sum(Expense.amount), 0)
-    ).join(
-        ExpenseCard, Expense.expense_card_id == ExpenseCard.id
-    ).filter(
-        ExpenseCard.customer_id == user_id,
-        Expense.created_at >= month_start,
-        Expense.created_at <= month_end
-    ).scalar() or Decimal('0')
-    
-    total_savings_all_time_query = db.query(
-        func.coalesce(func.sum(SavingsMarking.amount), 0)
-    ).join(
-        SavingsAccount, SavingsMarking.savings_account_id == SavingsAccount.id
-    ).filter(
-        SavingsAccount.customer_id == user_id,
-        SavingsMarking.status == SavingsStatus.PAID
+
+    totals = rollup_repo.get_customer_summary(
+        customer_id=user_id,
+        month=now.date(),
+        business_id=business_id,
     )
-    if business_id:
-        total_savings_all_time_query = total_savings_all_time_query.filter(SavingsAccount.business_id == business_id)
-    total_savings_all_time = total_savings_all_time_query.scalar() or Decimal("0")
-    
-    total_expenses_all_time = db.query(
-        func.coalesce(func.sum(Expense.amount), 0)
-    ).join(
-        ExpenseCard, Expense.expense_card_id == ExpenseCard.id
-    ).filter(
-        ExpenseCard.customer_id == user_id
-    ).scalar() or Decimal('0')
-    
+    total_savings_current_month = totals["savings_month"]
+    total_expenses_current_month = totals["expenses_month"]
+    total_savings_all_time = totals["savings_all_time"]
+    total_expenses_all_time = totals["expenses_all_time"]
+
     response_data = {
         "month": now.strftime("%B %Y"),
         "total_savings": float(total_savings_current_month),
@@ -1579,11 +1549,29 @@ async def get_monthly_summary(current_user: dict, db: Session, business_id: int
         "total_expenses_all_time": float(total_expenses_all_time),
         "net_balance_all_time": float(total_savings_all_time - total_expenses_all_time)
     }
-    
-    # Invalidate caches when savings/expenses change (handled in other functions via broad patterns)
-    
+
+    if start_month or end_month:
+        range_start = start_month or end_month
+        range_end = end_month or now.date()
+        if range_start > range_end:
+            return error_response(status_code=400, message="start_month must not be after end_month")
+        response_data["months"] = [
+            {
+                "month": row["month"].strftime("%B %Y"),
+                "total_savings": float(row["savings"]),
+                "total_expenses": float(row["expenses"]),
+                "net_balance": float(row["savings"] - row["expenses"]),
+            }
+            for row in rollup_repo.get_customer_months(
+                customer_id=user_id,
+                from_month=range_start,
+                to_month=range_end,
+                business_id=business_id,
+            )
+        ]
+
     return success_response(
         status_code=200,
         message="Monthly summary retrieved successfully",
         data=response_data
-    )
\ No newline at end of file
+    )
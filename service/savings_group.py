@@ -4,11 +4,10 @@ from fastapi import HTTPException
 from sqlalchemy import func, distinct
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional, Any
-from datetime import date, datetime
+from datetime import date
 from decimal import Decimal
 import uuid
 import logging
-import requests
 from dateutil.relativedelta import relativedelta
 
 from models.savings_group import SavingsGroup, GroupFrequency
@@ -19,6 +18,7 @@ from models.business import BusinessType
 from schemas.savings_group import (
     SavingsGroupCreate,
     AddGroupMemberRequest,
+    BulkAddGroupMembersRequest,
     SavingsGroupResponse,
     CreateSavingsGroupResponse,
     SavingsGroupMarkingPaystackInit,
@@ -28,75 +28,24 @@ from store.repositories.savings_group import SavingsGroupRepository
 from store.repositories.savings import SavingsRepository
 from store.repositories.business import BusinessRepository
 from store.repositories.user import UserRepository
+from store.repositories.rollups import RollupRepository
 from utils.response import success_response, error_response
 
-from paystackapi.transaction import Transaction
-from paystackapi.paystack import Paystack
+from utils.group_calendar import GroupCalendar
+from utils.tracking_numbers import allocate_tracking_number, allocate_tracking_numbers
+from utils.paystack import get_paystack_client
 import os
 
 logger = logging.getLogger(__name__)
 
-paystack = Paystack(secret_key=os.getenv("PAYSTACK_SECRET_KEY"))
-
 
 def _resolve_repo(repo, repo_cls, db: Session):
     return repo if repo is not None else repo_cls(db)
 
 
-def _generate_group_grid_dates(
-    start_date: date,
-    frequency: GroupFrequency,
-    limit: int,
-    offset: int,
-    end_date: Optional[date] = None
-) -> List[date]:
-    """
-    Generate paginated list of contribution dates based on group frequency.
-    """
-    dates = []
-    current_date = start_date
-
-    # Skip offset dates
-    skipped = 0
-    while skipped < offset:
-        if end_date and current_date > end_date:
-            break
-        if frequency == GroupFrequency.WEEKLY:
-            current_date += relativedelta(weeks=1)
-        elif frequency == GroupFrequency.BI_WEEKLY:
-            current_date += relativedelta(weeks=2)
-        elif frequency == GroupFrequency.MONTHLY:
-            current_date += relativedelta(months=1)
-        elif frequency == GroupFrequency.QUARTERLY:
-            current_date += relativedelta(months=3)
-        skipped += 1
-
-    # Collect up to limit dates
-    collected = 0
-    while collected < limit:
-        if end_date and current_date > end_date:
-            break
-        dates.append(current_date)
-
-        if frequency == GroupFrequency.WEEKLY:
-            current_date += relativedelta(weeks=1)
-        elif frequency == GroupFrequency.BI_WEEKLY:
-            current_date += relativedelta(weeks=2)
-        elif frequency == GroupFrequency.MONTHLY:
-            current_date += relativedelta(months=1)
-        elif frequency == GroupFrequency.QUARTERLY:
-            current_date += relativedelta(months=3)
-        collected += 1
-
-    return dates
-
-
 async def initiate_virtual_account_payment(amount: Decimal, email: str, customer_id: int, reference: str, db: Session):
     try:
-        headers = {
-            "Authorization": f"Bearer {os.getenv('PAYSTACK_SECRET_KEY')}",
-            "Content-Type": "application/json",
-        }
+        paystack_client = get_paystack_client()
         user = db.query(User).filter(User.id == customer_id).first()
         if not user:
             logger.error(f"User {customer_id} not found in database")
@@ -109,11 +58,7 @@ async def initiate_virtual_account_payment(amount: Decimal, email: str, customer
                 "first_name": "Customer",
                 "last_name": f"ID_{customer_id}",
             }
-            customer_response = requests.post(
-                "https://api.paystack.co/customer",
-                headers=headers,
-                json=customer_payload,
-            )
+            customer_response = await paystack_client.request("POST", "/customer", json=customer_payload)
             customer_data = customer_response.json()
             logger.info(f"Paystack customer creation response: {customer_data}")
             if customer_response.status_code != 200 or not customer_data.get("status"):
@@ -139,9 +84,8 @@ async def initiate_virtual_account_payment(amount: Decimal, email: str, customer
             }
             logger.info(f"Generated mock virtual account: {virtual_account}")
         else:
-            dedicated_response = requests.get(
-                f"https://api.paystack.co/dedicated_account?customer={payment_provider_customer_id}",
-                headers=headers,
+            dedicated_response = await paystack_client.request(
+                "GET", "/dedicated_account", params={"customer": payment_provider_customer_id}
             )
             dedicated_data = dedicated_response.json()
             logger.info(f"Paystack dedicated account check response: {dedicated_data}")
@@ -165,11 +109,7 @@ async def initiate_virtual_account_payment(amount: Decimal, email: str, customer
                     "customer": payment_provider_customer_id,
                     "preferred_bank": "wema-bank",
                 }
-                response = requests.post(
-                    "https://api.paystack.co/dedicated_account",
-                    headers=headers,
-                    json=payload,
-                )
+                response = await paystack_client.request("POST", "/dedicated_account", json=payload)
                 response_data = response.json()
                 logger.info(f"Paystack dedicated account creation response: {response_data}")
                 if response.status_code == 200 and response_data.get("status"):
@@ -191,7 +131,7 @@ async def initiate_virtual_account_payment(amount: Decimal, email: str, customer
                         message=f"Failed to initiate virtual account: {response_data.get('message', 'Dedicated NUBAN creation failed')}",
                     )
 
-        transaction = Transaction.initialize(
+        transaction = await paystack_client.initialize_transaction(
             reference=reference,
             amount=int(amount * 100),
             email=email,
@@ -224,7 +164,6 @@ async def create_group(
     group_repo = _resolve_repo(group_repo, SavingsGroupRepository, db)
     business_repo = _resolve_repo(business_repo, BusinessRepository, db)
     user_repo = _resolve_repo(user_repo, UserRepository, db)
-    savings_repo = _resolve_repo(savings_repo, SavingsRepository, db)
 
     user_id = current_user["user_id"]
     role = current_user["role"]
@@ -260,33 +199,23 @@ async def create_group(
 
     group = group_repo.create_group(group_data)
 
-    created_accounts = []
-    for member_id in member_ids:
-        try:
-            req = AddGroupMemberRequest(user_id=member_id, start_date=group.start_date)
-            account = await add_member_to_group(
-                group_id=group.id,
-                request=req,
-                current_user=current_user,
-                db=db,
-                group_repo=group_repo,
-                business_repo=business_repo,
-                user_repo=user_repo,
-                savings_repo=savings_repo,
-            )
-            created_accounts.append(account)
-        except Exception as e:
-            logger.warning(f"Failed to add member {member_id}: {str(e)}", exc_info=True)
-            try:
-                db.rollback()
-            except Exception:
-                pass
-            continue
+    results = _enroll_members(
+        group,
+        member_ids,
+        group.start_date,
+        created_by=user_id,
+        db=db,
+        group_repo=group_repo,
+        user_repo=user_repo,
+    )
+    for result in results:
+        if result["status"] != "added":
+            logger.warning(f"Failed to add member {result['user_id']}: {result['detail']}")
 
     return CreateSavingsGroupResponse(
         message="Savings group created successfully",
         group=SavingsGroupResponse.from_orm(group),
-        created_members_count=len(created_accounts)
+        created_members_count=sum(1 for r in results if r["status"] == "added")
     )
 
 
@@ -353,19 +282,21 @@ async def list_groups(
             limit=limit,
         )
 
+    memberships = group_repo.get_member_accounts_for_groups([g.id for g in groups], user_id)
+
     response_data = []
-    
     for group in groups:
         group_resp = SavingsGroupResponse.from_orm(group)
-        member_account = group_repo.get_member_account_for_user(group.id, user_id)
+        membership = memberships.get(group.id)
 
-        if member_account:
+        if membership:
+            account_id, tracking_number = membership
             group_resp.user_relationship = {
-                "tracking_number": member_account.tracking_number,
-                "savings_account_id": member_account.id,
+                "tracking_number": tracking_number,
+                "savings_account_id": account_id,
                 "status": "active" # or check account status
             }
-            
+
         response_data.append(group_resp)
 
     result = {
@@ -398,6 +329,10 @@ async def get_group(
     return SavingsGroupResponse.from_orm(group)
 
 
+# Allow customer, agent, and cooperative_member roles to join savings groups
+GROUP_MEMBER_ROLES = ["customer", "agent", "cooperative_member"]
+
+
 async def add_member_to_group(
     group_id: int,
     request: AddGroupMemberRequest,
@@ -431,9 +366,7 @@ async def add_member_to_group(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Allow customer, agent, and cooperative_member roles to join savings groups
-    allowed_roles = ["customer", "agent", "cooperative_member"]
-    if user.role.lower() not in allowed_roles:
+    if user.role.lower() not in GROUP_MEMBER_ROLES:
         raise HTTPException(
             status_code=400,
             detail=f"Only customers, agents, and cooperative members can join savings groups (user role: {user.role})"
@@ -442,7 +375,7 @@ async def add_member_to_group(
     if group_repo.member_exists_in_group(group_id, request.user_id):
         raise HTTPException(status_code=400, detail="User is already a member of this group")
     
-    tracking_number = str(uuid.uuid4())[:10].upper()
+    tracking_number = allocate_tracking_number(db)
 
     start_date = request.start_date or group.start_date
 
@@ -452,10 +385,128 @@ async def add_member_to_group(
         tracking_number=tracking_number,
         start_date=start_date,
     )
+    RollupRepository(db).apply_group_accounts([account.id])
+    db.commit()
 
     return account
 
 
+def _enroll_members(
+    group: SavingsGroup,
+    user_ids: List[int],
+    start_date: date,
+    *,
+    created_by: int,
+    db: Session,
+    group_repo: SavingsGroupRepository,
+    user_repo: UserRepository,
+) -> List[Dict[str, Any]]:
+    """
+    Validate and enroll ``user_ids`` into ``group`` in one transaction.
+
+    Users are checked with two set-based lookups (roles, existing
+    memberships) and the eligible ones are inserted together. Returns one
+    result per requested id, in request order.
+    """
+    roles = user_repo.get_roles_by_ids(user_ids)
+    existing = group_repo.get_member_user_ids(group.id, user_ids)
+
+    results: List[Dict[str, Any]] = []
+    eligible: List[int] = []
+    seen = set()
+    for member_id in user_ids:
+        result = {"user_id": member_id, "status": "added", "detail": None}
+        role = roles.get(member_id)
+        if member_id in seen:
+            result.update(status="duplicate", detail="User listed more than once")
+        elif role is None:
+            result.update(status="not_found", detail="User not found")
+        elif role.lower() not in GROUP_MEMBER_ROLES:
+            result.update(
+                status="invalid_role",
+                detail=f"Only customers, agents, and cooperative members can join savings groups (user role: {role})",
+            )
+        elif member_id in existing:
+            result.update(status="already_member", detail="User is already a member of this group")
+        else:
+            eligible.append(member_id)
+        seen.add(member_id)
+        results.append(result)
+
+    if not eligible:
+        return results
+
+    tracking_numbers = allocate_tracking_numbers(db, len(eligible))
+    try:
+        accounts = group_repo.add_members_bulk(
+            group,
+            [(member_id, tracking, start_date) for member_id, tracking in zip(eligible, tracking_numbers)],
+            created_by=created_by,
+        )
+        RollupRepository(db).apply_group_accounts([a["savings_account_id"] for a in accounts])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to enroll {len(eligible)} members into group {group.id}: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to add members to group")
+
+    by_user = {a["user_id"]: a for a in accounts}
+    for result in results:
+        if result["status"] == "added":
+            account = by_user[result["user_id"]]
+            result["savings_account_id"] = account["savings_account_id"]
+            result["tracking_number"] = account["tracking_number"]
+    return results
+
+
+async def add_members_to_group_bulk(
+    group_id: int,
+    request: BulkAddGroupMembersRequest,
+    current_user: dict,
+    db: Session,
+    *,
+    group_repo: Optional[SavingsGroupRepository] = None,
+    business_repo: Optional[BusinessRepository] = None,
+    user_repo: Optional[UserRepository] = None,
+) -> Dict[str, Any]:
+    group_repo = _resolve_repo(group_repo, SavingsGroupRepository, db)
+    business_repo = _resolve_repo(business_repo, BusinessRepository, db)
+    user_repo = _resolve_repo(user_repo, UserRepository, db)
+
+    user_id = current_user["user_id"]
+    role = current_user["role"]
+
+    if role not in ["admin", "super_admin", "agent", "cooperative_admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized to add members")
+
+    group = group_repo.get_active_group(group_id)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found or inactive")
+
+    business = business_repo.get_by_agent_id(user_id) or business_repo.get_by_admin_id(user_id)
+    if not business or business.id != group.business_id:
+        raise HTTPException(status_code=403, detail="Not authorized to manage this group")
+
+    results = _enroll_members(
+        group,
+        request.user_ids,
+        request.start_date or group.start_date,
+        created_by=user_id,
+        db=db,
+        group_repo=group_repo,
+        user_repo=user_repo,
+    )
+    added = sum(1 for r in results if r["status"] == "added")
+    logger.info(f"[SERVICE] add_members_to_group_bulk - group {group_id}: {added}/{len(results)} added")
+
+    return {
+        "message": f"{added} member(s) added",
+        "added": added,
+        "skipped": len(results) - added,
+        "results": results,
+    }
+
+
 async def get_group_members(
     group_id: int,
     current_user: dict,
@@ -528,14 +579,23 @@ async def delete_group_service(
         raise HTTPException(status_code=500, detail="Internal server error during deletion")
 
 
+# Status codes for the compact "columnar" grid encoding: one character per date
+GRID_STATUS_CODES = {None: "0", SavingsStatus.PENDING: "1", SavingsStatus.PAID: "2"}
+GRID_STATUS_LEGEND = {"0": None, "1": SavingsStatus.PENDING.value, "2": SavingsStatus.PAID.value}
+
 async def get_group_grid_data(
     group_id: int,
     db: Session,
     date_page: int = 1,
-    date_limit: int = 10
+    date_limit: int = 10,
+    encoding: str = "map",
 ) -> Dict[str, Any]:
     """
     Fetch grid data: Members x Dates matrix.
+
+    ``encoding="map"`` returns ``markings`` as {tracking_number: {date: status}};
+    ``encoding="columnar"`` returns ``status_rows`` instead, one string per
+    member (aligned with ``members``) holding one status code per date.
     """
     group = db.query(SavingsGroup).filter(SavingsGroup.id == group_id).first()
     if not group:
@@ -545,93 +605,76 @@ async def get_group_grid_data(
     offset = (date_page - 1) * date_limit
     projection_end_date = group.end_date or (group.start_date + relativedelta(years=1))
     
-    dates = _generate_group_grid_dates(
-        start_date=group.start_date,
-        frequency=group.frequency,
-        limit=date_limit,
-        offset=offset,
-        end_date=projection_end_date
-    )
-    
-    total_dates_approx = 0
-    temp_date = group.start_date
-    while temp_date <= projection_end_date:
-        total_dates_approx += 1
-        if group.frequency == GroupFrequency.WEEKLY:
-            temp_date += relativedelta(weeks=1)
-        elif group.frequency == GroupFrequency.BI_WEEKLY:
-            temp_date += relativedelta(weeks=2)
-        elif group.frequency == GroupFrequency.MONTHLY:
-            temp_date += relativedelta(months=1)
-        elif group.frequency == GroupFrequency.QUARTERLY:
-            temp_date += relativedelta(months=3)
-            
+    calendar = GroupCalendar(group.start_date, group.frequency, projection_end_date)
+    dates = calendar.dates(offset=offset, limit=date_limit)
+    total_dates_approx = calendar.count()
     has_next_page = (offset + len(dates)) < total_dates_approx
 
-    savings_accounts = db.query(SavingsAccount).join(User, SavingsAccount.customer_id == User.id)\
-        .filter(SavingsAccount.group_id == group_id)\
+    members = (
+        db.query(
+            SavingsAccount.id,
+            SavingsAccount.tracking_number,
+            SavingsAccount.customer_id,
+            User.full_name,
+            User.username,
+            User.email,
+        )
+        .join(User, SavingsAccount.customer_id == User.id)
+        .filter(SavingsAccount.group_id == group_id)
+        .order_by(SavingsAccount.id)
         .all()
-        
-    members_data = []
-    markings_map = {}
-
-    if dates:
-        start_range = dates[0]
-        end_range = dates[-1]
-
-        account_ids = [acc.id for acc in savings_accounts]
-        
-        if account_ids:
-            markings = db.query(SavingsMarking)\
-                .filter(
-                    SavingsMarking.savings_account_id.in_(account_ids),
-                    SavingsMarking.marked_date >= start_range,
-                    SavingsMarking.marked_date <= end_range
-                ).all()
-                
-            for marking in markings:
-                acc = next((a for a in savings_accounts if a.id == marking.savings_account_id), None)
-                if acc:
-                    if acc.tracking_number not in markings_map:
-                        markings_map[acc.tracking_number] = {}
-                    markings_map[acc.tracking_number][str(marking.marked_date)] = marking.status.value
-
-    # SAFE full_name handling - adapt to your actual User model
-    for acc in savings_accounts:
-        user = db.query(User).filter(User.id == acc.customer_id).first()
-        
-        full_name = "Unknown User"
-        if user:
-            # Option 1: most common - use full_name
-            if hasattr(user, 'full_name') and user.full_name and user.full_name.strip():
-                full_name = user.full_name.strip()
-            # Option 2: fallback to name if exists
-            elif hasattr(user, 'name') and user.name and user.name.strip():
-                full_name = user.name.strip()
-            # Option 3: username/email/id
-            else:
-                full_name = (
-                    user.username or
-                    user.email or
-                    f"User {user.id}"
-                )
+    )
 
+    statuses_by_account: Dict[int, Dict[date, SavingsStatus]] = {}
+    if dates and members:
+        markings = (
+            db.query(SavingsMarking.savings_account_id, SavingsMarking.marked_date, SavingsMarking.status)
+            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
+            .filter(
+                SavingsAccount.group_id == group_id,
+                SavingsMarking.marked_date >= dates[0],
+                SavingsMarking.marked_date <= dates[-1],
+            )
+            .all()
+        )
+        for account_id, marked_date, marking_status in markings:
+            statuses_by_account.setdefault(account_id, {})[marked_date] = marking_status
+
+    members_data = []
+    for member in members:
+        full_name = (member.full_name or "").strip() or member.username or member.email or f"User {member.customer_id}"
         members_data.append({
-            "user_id": acc.customer_id,
+            "user_id": member.customer_id,
             "full_name": full_name,
-            "tracking_number": acc.tracking_number,
-            "savings_account_id": acc.id
+            "tracking_number": member.tracking_number,
+            "savings_account_id": member.id
         })
-        
-        if acc.tracking_number not in markings_map:
-            markings_map[acc.tracking_number] = {}
+
+    grid: Dict[str, Any] = {}
+    if encoding == "columnar":
+        grid["status_legend"] = GRID_STATUS_LEGEND
+        grid["status_rows"] = [
+            "".join(
+                GRID_STATUS_CODES[statuses_by_account.get(member.id, {}).get(d)]
+                for d in dates
+            )
+            for member in members
+        ]
+    else:
+        grid["markings"] = {
+            member.tracking_number: {
+                str(marked_date): marking_status.value
+                for marked_date, marking_status in statuses_by_account.get(member.id, {}).items()
+            }
+            for member in members
+        }
 
     return {
         "group_name": group.name,
         "contribution_amount": group.contribution_amount,
         "members": members_data,
         "dates": [d.isoformat() for d in dates],
-        "markings": markings_map,
+        **grid,
         "pagination": {
             "current_page": date_page,
             "limit": date_limit,
@@ -711,7 +754,7 @@ async def initiate_group_marking_payment(
         email = payer.email if payer and payer.email else "fallback@kopkad.com"
 
         total_kobo = int(total_amount * 100)
-        resp = Transaction.initialize(
+        resp = await get_paystack_client().initialize_transaction(
             reference=reference,
             amount=total_kobo,
             email=email,
@@ -765,8 +808,11 @@ async def initiate_group_marking_payment(
 
 async def verify_group_marking_payment(reference: str, db: Session):
     """
-    Verify Paystack payment for group markings with idempotency safety.
+    Report the settlement status of a group marking payment.
+    Settlement itself happens from the Paystack webhook via the settlement queue.
     """
+    from service.settlements import settle_reference
+
     initiation = db.query(PaymentInitiation).filter(
         PaymentInitiation.reference == reference
     ).first()
@@ -774,59 +820,27 @@ async def verify_group_marking_payment(reference: str, db: Session):
     if not initiation:
         raise HTTPException(404, "Payment initiation not found")
 
-    if initiation.status == PaymentInitiationStatus.COMPLETED.value:
-        return success_response(200, "Payment already verified")
-
-    if initiation.status != PaymentInitiationStatus.PENDING.value:
-        raise HTTPException(400, "Initiation not in pending state")
-
-    resp = Transaction.verify(reference=reference)
-    if not resp["status"] or resp["data"]["status"] != "success":
-        initiation.status = PaymentInitiationStatus.FAILED.value
-        db.commit()
-        raise HTTPException(400, "Payment verification failed")
-
-    paid_amount = Decimal(resp["data"]["amount"]) / 100
+    if initiation.status == PaymentInitiationStatus.PENDING.value:
+        await settle_reference(reference, db)
+        db.refresh(initiation)
 
     metadata = initiation.payment_metadata or {}
-    marking_ids = metadata.get("marking_ids", [])
-    if not marking_ids:
-        initiation.status = PaymentInitiationStatus.FAILED.value
-        db.commit()
-        raise HTTPException(400, "No markings associated with this initiation")
-
-    markings = db.query(SavingsMarking).filter(
-        SavingsMarking.id.in_(marking_ids),
-        SavingsMarking.status == SavingsStatus.PENDING
-    ).all()
-
-    expected = sum(m.amount for m in markings)
-    if paid_amount < expected:
-        initiation.status = PaymentInitiationStatus.FAILED.value
-        db.commit()
-        raise HTTPException(400, f"Underpayment: {paid_amount} < {expected}")
-
-    for marking in markings:
-        marking.status = SavingsStatus.PAID
-        marking.marked_by_id = initiation.user_id
-        marking.updated_at = datetime.utcnow()
-        marking.payment_reference = reference
-
-    db.commit()
+    if initiation.status == PaymentInitiationStatus.COMPLETED.value:
+        settlement = metadata.get("settlement") or {"reference": reference, "status": "PAID"}
+        return success_response(
+            status_code=200,
+            message=f"Marked {settlement.get('markings_updated', 0)} group contributions as paid",
+            data=settlement,
+        )
 
-    initiation.status = PaymentInitiationStatus.COMPLETED.value
-    db.commit()
+    if initiation.status == PaymentInitiationStatus.PENDING.value:
+        return success_response(
+            status_code=202,
+            message="Payment pending confirmation",
+            data={"reference": reference, "status": "PENDING"},
+        )
 
-    return success_response(
-        status_code=200,
-        message=f"Marked {len(markings)} group contributions as paid",
-        data={
-            "reference": reference,
-            "status": "PAID",
-            "paid_amount": float(paid_amount),
-            "markings_updated": len(markings)
-        }
-    )
+    raise HTTPException(400, metadata.get("failure_reason") or "Payment verification failed")
 
 
 async def get_group_savings_metrics(
@@ -835,10 +849,10 @@ async def get_group_savings_metrics(
     db: Session,
     *,
     group_repo: Optional[SavingsGroupRepository] = None,
-    savings_repo: Optional[SavingsRepository] = None,
+    rollup_repo: Optional[RollupRepository] = None,
 ):
     group_repo = _resolve_repo(group_repo, SavingsGroupRepository, db)
-    savings_repo = _resolve_repo(savings_repo, SavingsRepository, db)
+    rollup_repo = _resolve_repo(rollup_repo, RollupRepository, db)
 
     group = group_repo.get_active_group(group_id)
     if not group:
@@ -853,39 +867,21 @@ async def get_group_savings_metrics(
         if not membership_exists:
             raise HTTPException(403, "Not authorized to view this group's metrics")
 
-    # 1. Total members → from repo
-    total_members = group_repo.get_member_count(group_id)
+    totals = rollup_repo.get_group_totals(group_id)
+    total_members = totals["member_count"]
 
     contribution_amount = group.contribution_amount or Decimal("0")
 
-    # 2. Total scheduled dates → from repo
-    total_scheduled_dates = savings_repo.get_total_scheduled_dates_for_group(group_id)
+    total_scheduled_dates = totals["scheduled_periods"]
 
     # Fallback projection if zero (no markings yet)
     if total_scheduled_dates == 0:
         end_date = group.end_date or (group.start_date + relativedelta(years=1))
-        current = group.start_date
-        projected = 0
-        while current <= end_date:
-            projected += 1
-            if group.frequency == GroupFrequency.WEEKLY:
-                current += relativedelta(weeks=1)
-            elif group.frequency == GroupFrequency.BI_WEEKLY:
-                current += relativedelta(weeks=2)
-            elif group.frequency == GroupFrequency.MONTHLY:
-                current += relativedelta(months=1)
-            elif group.frequency == GroupFrequency.QUARTERLY:
-                current += relativedelta(months=3)
-        total_scheduled_dates = projected
-
-    # 3. Total target
-    total_target = contribution_amount * Decimal(total_members) * Decimal(total_scheduled_dates)
-
-    # 4. Total contributed → from repo
-    total_contributed = savings_repo.get_total_contributed_for_group(group_id)
+        total_scheduled_dates = GroupCalendar(group.start_date, group.frequency, end_date).count()
 
-    # 5. Unique paid dates → from repo
-    unique_paid_dates = savings_repo.get_unique_paid_dates_count_for_group(group_id)
+    total_target = contribution_amount * Decimal(total_members) * Decimal(total_scheduled_dates)
+    total_contributed = totals["collected_total"]
+    unique_paid_dates = totals["paid_periods"]
 
     remaining_days = max(0, total_scheduled_dates - unique_paid_dates)
 
@@ -0,0 +1,390 @@
+"""
+Webhook-driven payment settlement.
+
+Paystack charge events are verified and queued by the webhook
+(``enqueue_paystack_event``) and applied in batches by the background
+settler (``run_settlement_batch``). The verify endpoints only read the
+PaymentInitiation status, settling a queued event for their reference inline
+if the settler hasn't reached it yet, so a payment costs a single gateway
+call (initialize) in the normal case. ``reconcile_stale_initiations`` is the
+safety net for lost webhooks: it re-verifies each stale initiation with
+backoff until Paystack reports a final state or the initiation expires.
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import partial
+from typing import Any, Dict, List, Optional
+import logging
+
+from fastapi import HTTPException
+from sqlalchemy import exists, or_
+from sqlalchemy.orm import Session
+
+from models.financial_advisor import NotificationType, NotificationPriority
+from models.savings import (
+    MarkingStatus,
+    PaymentInitiation,
+    PaymentInitiationStatus,
+    PaymentSettlementEvent,
+    SavingsMarking,
+    SavingsStatus,
+    SettlementEventStatus,
+)
+from service.notifications import notify_user, notify_business_admin
+from service.savings import calculate_total_commission
+from store.repositories import (
+    BusinessRepository,
+    RollupRepository,
+    SavingsRepository,
+    SettlementRepository,
+    UserNotificationRepository,
+)
+from store.repositories.settlements import MAX_SETTLEMENT_ATTEMPTS
+from utils.cache import get_cache
+from utils.paystack import get_paystack_client
+
+logger = logging.getLogger(__name__)
+
+SETTLEMENT_EVENTS = {"charge.success", "transfer.success"}
+# Paystack verify statuses that end reconciliation without a charge
+RECONCILE_FAILED_STATUSES = {"failed", "reversed"}
+# Unsettled initiations are re-verified 15, 30, 60, ... (at most 240) minutes
+# apart until they are this old
+RECONCILE_BACKOFF_BASE_MINUTES = 15
+RECONCILE_BACKOFF_MAX_MINUTES = 240
+INITIATION_EXPIRY_HOURS = 24
+
+
+class SettlementRejected(Exception):
+    """The event is genuine but can't be applied (e.g. underpayment)."""
+
+
+def _parse_paid_at(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def enqueue_paystack_event(payload: Dict[str, Any], db: Session) -> bool:
+    """Queue a signature-verified webhook payload. Returns True if newly queued."""
+    event = payload.get("event")
+    data = payload.get("data") or {}
+    reference = data.get("reference")
+    if not reference:
+        raise HTTPException(status_code=400, detail="No reference provided")
+    if event not in SETTLEMENT_EVENTS:
+        return False
+
+    queued = SettlementRepository(db).enqueue(
+        reference=reference,
+        event=event,
+        amount=int(data.get("amount") or 0),
+        paid_at=_parse_paid_at(data.get("paid_at")),
+        payload=data,
+    )
+    db.commit()
+    logger.info(f"[SETTLEMENT] {'Queued' if queued else 'Duplicate'} {event} for {reference}")
+    return queued
+
+
+def _settle_initiation(db: Session, initiation: PaymentInitiation, paid_amount: Decimal) -> Dict[str, Any]:
+    """Apply a confirmed payment to the markings recorded on its initiation."""
+    metadata = dict(initiation.payment_metadata or {})
+    marking_ids = metadata.get("marking_ids") or [metadata.get("marking_id")]
+    marking_ids = [marking_id for marking_id in marking_ids if marking_id is not None]
+    if not marking_ids:
+        raise SettlementRejected("No markings associated with this initiation")
+
+    is_group = metadata.get("type") == "group_bulk"
+    savings_repo = SavingsRepository(db)
+    markings = savings_repo.mark_markings_paid(
+        marking_ids,
+        reference=initiation.reference,
+        marked_by_id=initiation.user_id if is_group else None,
+    )
+    expected = sum((m.amount for m in markings), Decimal("0"))
+    if paid_amount < expected:
+        raise SettlementRejected(f"Underpayment: {paid_amount} < {expected}")
+    RollupRepository(db).apply_paid_markings([m.id for m in markings])
+
+    summary: Dict[str, Any] = {
+        "reference": initiation.reference,
+        "status": "PAID",
+        "paid_amount": float(paid_amount),
+        "markings_updated": len(markings),
+        "marked_dates": [m.marked_date.isoformat() for m in markings],
+    }
+    if not is_group:
+        accounts = savings_repo.get_accounts_with_pending_counts(
+            list({m.savings_account_id for m in markings})
+        )
+        finished = [
+            account for account in accounts
+            if account.pending_count == 0 and account.marking_status != MarkingStatus.COMPLETED
+        ]
+        savings_repo.mark_accounts_completed([account.id for account in finished])
+        summary["tracking_numbers"] = [account.tracking_number for account in accounts]
+        if finished:
+            summary["completion_message"] = " ".join(
+                f"Congratulations! You have successfully completed savings plan {account.tracking_number}! "
+                f"Total commission: {calculate_total_commission(account)}"
+                for account in finished
+            )
+
+    metadata["settlement"] = summary
+    initiation.payment_metadata = metadata
+    initiation.status = PaymentInitiationStatus.COMPLETED.value
+    return summary
+
+
+def _settle_marking_reference(
+    db: Session,
+    event: PaymentSettlementEvent,
+    paid_amount: Decimal,
+    notification_repo: UserNotificationRepository,
+    business_repo: BusinessRepository,
+) -> Optional[List[partial]]:
+    """
+    Settle markings tagged with the payment reference directly (flows that
+    predate PaymentInitiation). Returns the notifications to send once the
+    batch has committed, or None if there was nothing to settle.
+    """
+    markings = (
+        db.query(SavingsMarking)
+        .filter(SavingsMarking.payment_reference == event.reference)
+        .all()
+    )
+    if not markings or any(m.status == SavingsStatus.PAID for m in markings):
+        return None
+
+    expected = sum((m.amount for m in markings), Decimal("0"))
+    if paid_amount < expected:
+        raise SettlementRejected(f"Underpayment: {paid_amount} < {expected}")
+
+    accounts = {m.savings_account_id: m.savings_account for m in markings}
+    payer_id = markings[0].savings_account.customer_id
+    paid_at = event.paid_at or datetime.utcnow()
+    for marking in markings:
+        marking.status = SavingsStatus.PAID
+        marking.marked_by_id = payer_id
+        marking.updated_by = payer_id
+        marking.updated_at = paid_at
+    db.flush()
+    RollupRepository(db).apply_paid_markings([m.id for m in markings])
+
+    savings_repo = SavingsRepository(db)
+    finished_ids = {
+        account.id
+        for account in savings_repo.get_accounts_with_pending_counts(list(accounts))
+        if account.pending_count == 0 and account.marking_status != MarkingStatus.COMPLETED
+    }
+    for account_id in finished_ids:
+        accounts[account_id].marking_status = MarkingStatus.COMPLETED
+
+    notify = partial(notify_user, db=db, notification_repo=notification_repo)
+    notices: List[partial] = []
+    if len(accounts) > 1:
+        for customer_id in {account.customer_id for account in accounts.values()}:
+            notices.append(partial(
+                notify,
+                user_id=customer_id,
+                notification_type=NotificationType.SAVINGS_BULK_MARKED,
+                title="Multiple Payments Confirmed",
+                message="Multiple payments have been marked for your savings accounts",
+                priority=NotificationPriority.MEDIUM,
+                related_entity_id=None,
+                related_entity_type="savings_marking",
+            ))
+    elif not finished_ids:
+        account = next(iter(accounts.values()))
+        notices.append(partial(
+            notify,
+            user_id=account.customer_id,
+            notification_type=NotificationType.SAVINGS_PAYMENT_MARKED,
+            title="Payment Confirmed",
+            message=f"Your payment of {paid_amount:.2f} for savings account {account.tracking_number} has been confirmed.",
+            priority=NotificationPriority.MEDIUM,
+            related_entity_id=markings[0].id,
+            related_entity_type="savings_marking",
+        ))
+
+    for account_id in finished_ids:
+        account = accounts[account_id]
+        notices.append(partial(
+            notify,
+            user_id=account.customer_id,
+            notification_type=NotificationType.SAVINGS_ACCOUNT_COMPLETED,
+            title="Savings Account Completed",
+            message=f"Congratulations! Your savings account {account.tracking_number} has been completed successfully!",
+            priority=NotificationPriority.HIGH,
+            related_entity_id=account.id,
+            related_entity_type="savings_account",
+        ))
+        if account.business_id:
+            notices.append(partial(
+                notify_business_admin,
+                business_id=account.business_id,
+                notification_type=NotificationType.SAVINGS_ACCOUNT_COMPLETED,
+                title="Savings Account Completed",
+                message=f"Savings account {account.tracking_number} has been completed.",
+                priority=NotificationPriority.MEDIUM,
+                db=db,
+                business_repo=business_repo,
+                notification_repo=notification_repo,
+                related_entity_id=account.id,
+                related_entity_type="savings_account",
+            ))
+    return notices
+
+
+async def settle_events(db: Session, events: List[PaymentSettlementEvent]) -> int:
+    """
+    Apply claimed events in one transaction; returns how many were applied.
+
+    Each event runs in a savepoint so a bad event can't roll back the rest
+    of the batch. Notifications go out after the batch commits.
+    """
+    if not events:
+        return 0
+    settlement_repo = SettlementRepository(db)
+    notification_repo = UserNotificationRepository(db)
+    business_repo = BusinessRepository(db)
+    initiations = {
+        initiation.reference: initiation
+        for initiation in db.query(PaymentInitiation)
+        .filter(PaymentInitiation.reference.in_({event.reference for event in events}))
+        .with_for_update()
+        .all()
+    }
+
+    applied = 0
+    notices: List[partial] = []
+    for event in events:
+        paid_amount = Decimal(event.amount or 0) / 100
+        initiation = initiations.get(event.reference)
+        try:
+            with db.begin_nested():
+                if initiation is not None:
+                    if initiation.status != PaymentInitiationStatus.PENDING.value:
+                        settlement_repo.mark(event, SettlementEventStatus.IGNORED, f"Initiation already {initiation.status}")
+                        continue
+                    _settle_initiation(db, initiation, paid_amount)
+                else:
+                    event_notices = _settle_marking_reference(db, event, paid_amount, notification_repo, business_repo)
+                    if event_notices is None:
+                        settlement_repo.mark(event, SettlementEventStatus.IGNORED, "Nothing to settle")
+                        continue
+                    notices.extend(event_notices)
+            settlement_repo.mark(event, SettlementEventStatus.APPLIED)
+            applied += 1
+        except SettlementRejected as e:
+            logger.error(f"[SETTLEMENT] Rejected {event.reference}: {e}")
+            if initiation is not None:
+                initiation.status = PaymentInitiationStatus.FAILED.value
+                initiation.payment_metadata = {**(initiation.payment_metadata or {}), "failure_reason": str(e)}
+            settlement_repo.mark(event, SettlementEventStatus.FAILED, str(e))
+        except Exception as e:
+            logger.error(f"[SETTLEMENT] Error settling {event.reference}: {e}", exc_info=True)
+            retry = (event.attempts or 0) + 1 < MAX_SETTLEMENT_ATTEMPTS
+            settlement_repo.mark(event, SettlementEventStatus.PENDING if retry else SettlementEventStatus.FAILED, str(e))
+
+    db.commit()
+    logger.info(f"[SETTLEMENT] Applied {applied}/{len(events)} events")
+
+    for notice in notices:
+        await notice()
+    if applied:
+        await get_cache().clear_pattern("savings:*")
+        await get_cache().clear_pattern("savings_markings:*")
+    return applied
+
+
+async def run_settlement_batch(db: Session, batch_size: int = 100) -> int:
+    """Claim and apply the oldest pending events."""
+    events = SettlementRepository(db).claim_pending(limit=batch_size)
+    if not events:
+        db.rollback()
+        return 0
+    return await settle_events(db, events)
+
+
+async def settle_reference(reference: str, db: Session) -> int:
+    """Apply any queued event for ``reference`` now, ahead of the settler."""
+    events = SettlementRepository(db).claim_pending(limit=10, reference=reference)
+    if not events:
+        db.rollback()
+        return 0
+    return await settle_events(db, events)
+
+
+async def reconcile_stale_initiations(db: Session, older_than_minutes: int = 15, limit: int = 50) -> int:
+    """
+    Verify pending initiations that never received a webhook.
+
+    Successful charges are queued like webhook events and failed or reversed
+    ones fail the initiation; either way ``reconciled_at`` is recorded in its
+    metadata and the initiation is not checked again. Anything else
+    (``abandoned`` is Paystack's state for a charge the customer hasn't paid
+    *yet*, ``ongoing``, ``pending``) is re-checked with exponential backoff
+    until ``INITIATION_EXPIRY_HOURS`` after creation, so a payment made after
+    an earlier check is still picked up.
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(minutes=older_than_minutes)
+    expiry = now - timedelta(hours=INITIATION_EXPIRY_HOURS)
+    metadata = PaymentInitiation.payment_metadata
+    stale = (
+        db.query(PaymentInitiation)
+        .filter(
+            PaymentInitiation.status == PaymentInitiationStatus.PENDING.value,
+            PaymentInitiation.created_at < cutoff,
+            PaymentInitiation.created_at >= expiry,
+            or_(metadata.is_(None), ~metadata.has_key("reconciled_at")),
+            or_(
+                metadata.is_(None),
+                ~metadata.has_key("next_reconcile_at"),
+                metadata["next_reconcile_at"].astext <= now.isoformat(),
+            ),
+            ~exists().where(PaymentSettlementEvent.reference == PaymentInitiation.reference),
+        )
+        .order_by(PaymentInitiation.created_at)
+        .limit(limit)
+        .all()
+    )
+    settlement_repo = SettlementRepository(db)
+    client = get_paystack_client()
+    queued = 0
+    for initiation in stale:
+        resp = await client.verify_transaction(initiation.reference)
+        data = resp.get("data") or {}
+        paystack_status = data.get("status") if resp.get("status") else None
+        checks = int((initiation.payment_metadata or {}).get("reconcile_checks") or 0) + 1
+        update: Dict[str, Any] = {"reconcile_checks": checks, "last_reconcile_status": paystack_status}
+
+        if paystack_status == "success":
+            queued += settlement_repo.enqueue(
+                reference=initiation.reference,
+                event="charge.success",
+                amount=int(data.get("amount") or 0),
+                paid_at=_parse_paid_at(data.get("paid_at")),
+                payload=data,
+            )
+            update["reconciled_at"] = now.isoformat()
+        elif paystack_status in RECONCILE_FAILED_STATUSES:
+            initiation.status = PaymentInitiationStatus.FAILED.value
+            update["failure_reason"] = data.get("gateway_response") or f"Payment {paystack_status}"
+            update["reconciled_at"] = now.isoformat()
+        else:
+            delay = min(
+                RECONCILE_BACKOFF_BASE_MINUTES * 2 ** (checks - 1),
+                RECONCILE_BACKOFF_MAX_MINUTES,
+            )
+            update["next_reconcile_at"] = (now + timedelta(minutes=delay)).isoformat()
+        initiation.payment_metadata = {**(initiation.payment_metadata or {}), **update}
+    db.commit()
+    if stale:
+        logger.info(f"[SETTLEMENT] Reconciled {len(stale)} stale initiations, queued {queued}")
+    return queued
@@ -2,7 +2,7 @@ from fastapi import status
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import insert
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional
 import httpx
 from loguru import logger
 
@@ -10,8 +10,8 @@ from models.user import User, user_permissions, PasswordResetOtp, PasswordResetT
 from service.kyc import validate_and_consume_kyc_reference
 from utils.password_utils import generate_otp, hash_otp, decrypt_password
 from datetime import datetime, timezone, timedelta
-from utils.email_service import send_reset_password_email_async, send_welcome_email, send_email_async
-from utils.sms_service import send_termii_sms_async
+from utils.email_service import reset_password_email_content, welcome_email_content
+from service.outbound import queue_sms, queue_template_email
 from schemas.user import ForgotPasswordRequest, ResetPasswordRequest
 import os
 from utils.cache import cached, get_cache
@@ -219,16 +219,11 @@ async def signup_unauthenticated(
             db.commit()
 
         settings_obj = settings_repo.create_default_settings(user.id)
-        db.commit()
-
         if request.email and settings_obj.notification_method in [NotificationMethod.EMAIL.value, NotificationMethod.BOTH.value]:
-            email_result = await send_welcome_email(
-                request.email, user.full_name, phone_number, requested_role.value
+            queue_template_email(
+                db, request.email, welcome_email_content, user.full_name, phone_number, requested_role.value
             )
-            if email_result["status"] == "error":
-                logger.error(email_result["message"])
-            else:
-                logger.info(f"Welcome email sent successfully to {request.email}")
+        db.commit()
 
         businesses = [BusinessResponse.model_validate(business)] if requested_role == Role.CUSTOMER and business else []
         access_token = create_access_token(
@@ -431,9 +426,10 @@ async def signup_authenticated(
         )
 
         if request.email and (settings_obj.notification_method in [NotificationMethod.EMAIL.value, NotificationMethod.BOTH.value]):
-            await send_welcome_email(
-                request.email, user.full_name, phone_number, requested_role.value
+            queue_template_email(
+                db, request.email, welcome_email_content, user.full_name, phone_number, requested_role.value
             )
+            db.commit()
 
         businesses = [BusinessResponse.model_validate(business)] if business else []
         access_token = create_access_token(
@@ -719,9 +715,9 @@ async def forgot_password_service(request: ForgotPasswordRequest, db: Session, u
         </html>
         """
 
-        await send_reset_password_email_async(user.email, user.full_name, reset_url)
+        queue_template_email(db, user.email, reset_password_email_content, user.full_name, reset_url)
 
-        logger.info(f"Reset link sent to email {user.email}")
+        logger.info(f"Reset link queued for email {user.email}")
 
     else:
         # Phone only → OTP via Termii
@@ -743,13 +739,9 @@ async def forgot_password_service(request: ForgotPasswordRequest, db: Session, u
             f"Do not share this code."
         )
 
-        sms_result = await send_termii_sms_async(user.phone_number, sms_text)
+        queue_sms(db, user.phone_number, sms_text)
 
-        if sms_result and sms_result.get("status") == "error":
-            logger.error(f"SMS failed for {user.phone_number}: {sms_result['message']}")
-            # Still return generic success (don't block user)
-        else:
-            logger.info(f"OTP sent to {user.phone_number}")
+        logger.info(f"OTP queued for {user.phone_number}")
 
     db.commit()
 
@@ -857,10 +849,10 @@ async def resend_reset_otp_service(
         is_used=False
     )
     db.add(new_otp)
-    db.commit()
 
     sms_text = f"Kopkad reset code: {otp}\nValid for 10 minutes. Do not share."
-    await send_termii_sms_async(user.phone_number, sms_text)
+    queue_sms(db, user.phone_number, sms_text)
+    db.commit()
 
     return success_response(200, "New OTP sent if account exists")
 
@@ -920,13 +912,18 @@ async def get_all_users(
                 search=search,
             )
 
+        businesses_by_user = business_repo.get_businesses_with_units_for_users(
+            [user.id for user in users]
+        )
+        # Users on a page mostly share businesses; validate each one once
+        validated: Dict[int, BusinessResponse] = {}
         user_responses: List[UserResponse] = []
         for user in users:
-            businesses = business_repo.get_user_businesses_with_units(user.id)
-            business_responses = [
-                BusinessResponse.model_validate(business, from_attributes=True)
-                for business in businesses
-            ]
+            business_responses = []
+            for business in businesses_by_user[user.id]:
+                if business.id not in validated:
+                    validated[business.id] = BusinessResponse.model_validate(business, from_attributes=True)
+                business_responses.append(validated[business.id])
 
             user_response = UserResponse(
                 user_id=user.id,
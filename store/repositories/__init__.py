@@ -29,6 +29,10 @@ from .financial_advisor import (
     SpendingPatternRepository,
     UserNotificationRepository,
 )
+from .rollups import RollupRepository
+from .settlements import SettlementRepository
+from .outbound import OutboundMessageRepository
+from .search import SearchRepository
 
 __all__ = [
     "BaseRepository",
@@ -51,5 +55,9 @@ __all__ = [
     "FinancialHealthScoreRepository",
     "SpendingPatternRepository",
     "UserNotificationRepository",
+    "RollupRepository",
+    "SettlementRepository",
+    "OutboundMessageRepository",
+    "SearchRepository",
 ]
 
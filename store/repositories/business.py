@@ -3,8 +3,8 @@ Business repository for business-related database operations.
 """
 from typing import Optional, List, Dict
 from decimal import Decimal
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, func, case
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import or_, func, select, union
 from models.business import Business, Unit, AdminCredentials, BusinessPermission
 from models.user_business import user_business
 from store.repositories.base import BaseRepository
@@ -82,6 +82,34 @@ class BusinessRepository(BaseRepository[Business]):
         
         return businesses
     
+    def get_businesses_with_units_for_users(self, user_ids: List[int]) -> Dict[int, List[Business]]:
+        """
+        Batch form of ``get_user_businesses_with_units`` for a page of users.
+
+        Membership, admin and agent links for every user are resolved in one
+        query and the units loaded with one more, however many users there
+        are. Users without a business map to an empty list.
+        """
+        businesses: Dict[int, List[Business]] = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return businesses
+
+        links = union(
+            select(user_business.c.user_id, user_business.c.business_id)
+            .where(user_business.c.user_id.in_(user_ids)),
+            select(Business.admin_id, Business.id).where(Business.admin_id.in_(user_ids)),
+            select(Business.agent_id, Business.id).where(Business.agent_id.in_(user_ids)),
+        ).subquery()
+        rows = self.db.execute(
+            select(links.c.user_id, Business)
+            .join(Business, Business.id == links.c.business_id)
+            .options(selectinload(Business.units))
+            .order_by(links.c.user_id, Business.id)
+        ).all()
+        for user_id, business in rows:
+            businesses[user_id].append(business)
+        return businesses
+
     def get_admin_credentials(self, business_id: int) -> Optional[AdminCredentials]:
         """Get admin credentials for business"""
         return (
@@ -146,27 +174,48 @@ class BusinessRepository(BaseRepository[Business]):
         return creds
 
     def get_business_performance_metrics(self) -> List[Dict[str, object]]:
-        """Aggregate savings, user, and unit metrics for every business."""
+        """
+        Aggregate savings, user, and unit metrics for every business.
+
+        Each dimension is aggregated per business in its own subquery before
+        joining, so users, units and markings never multiply each other.
+        """
         from models.savings import SavingsAccount, SavingsMarking
 
-        total_volume = func.coalesce(func.sum(SavingsMarking.amount), 0)
-        paid_volume = func.coalesce(
-            func.sum(
-                case(
-                    (SavingsMarking.status == "paid", SavingsMarking.amount),
-                    else_=0,
-                )
-            ),
-            0,
+        users = (
+            self.db.query(
+                user_business.c.business_id.label("business_id"),
+                func.count(func.distinct(user_business.c.user_id)).label("total_users"),
+            )
+            .group_by(user_business.c.business_id)
+            .subquery()
         )
-        pending_volume = func.coalesce(
-            func.sum(
-                case(
-                    (SavingsMarking.status == "pending", SavingsMarking.amount),
-                    else_=0,
-                )
-            ),
-            0,
+        units = (
+            self.db.query(
+                Unit.business_id.label("business_id"),
+                func.count(Unit.id).label("total_units"),
+            )
+            .group_by(Unit.business_id)
+            .subquery()
+        )
+        accounts = (
+            self.db.query(
+                SavingsAccount.business_id.label("business_id"),
+                func.count(SavingsAccount.id).label("total_savings_accounts"),
+            )
+            .group_by(SavingsAccount.business_id)
+            .subquery()
+        )
+        volumes = (
+            self.db.query(
+                SavingsAccount.business_id.label("business_id"),
+                func.sum(SavingsMarking.amount).label("total_volume"),
+                func.sum(SavingsMarking.amount).filter(SavingsMarking.status == "paid").label("paid_volume"),
+                func.sum(SavingsMarking.amount).filter(SavingsMarking.status == "pending").label("pending_volume"),
+            )
+            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
+            .group_by(SavingsAccount.business_id)
+            .subquery()
         )
 
         results = (
@@ -174,22 +223,17 @@ class BusinessRepository(BaseRepository[Business]):
                 Business.id.label("business_id"),
                 Business.name.label("name"),
                 Business.unique_code.label("unique_code"),
-                func.count(func.distinct(user_business.c.user_id)).label("total_users"),
-                func.count(func.distinct(Unit.id)).label("total_units"),
-                func.count(func.distinct(SavingsAccount.id)).label(
-                    "total_savings_accounts"
-                ),
-                total_volume.label("total_volume"),
-                paid_volume.label("paid_volume"),
-                pending_volume.label("pending_volume"),
+                users.c.total_users,
+                units.c.total_units,
+                accounts.c.total_savings_accounts,
+                volumes.c.total_volume,
+                volumes.c.paid_volume,
+                volumes.c.pending_volume,
             )
-            .outerjoin(user_business, user_business.c.business_id == Business.id)
-            .outerjoin(Unit, Unit.business_id == Business.id)
-            .outerjoin(SavingsAccount, SavingsAccount.business_id == Business.id)
-            .outerjoin(
-                SavingsMarking, SavingsMarking.savings_account_id == SavingsAccount.id
-            )
-            .group_by(Business.id)
+            .outerjoin(users, users.c.business_id == Business.id)
+            .outerjoin(units, units.c.business_id == Business.id)
+            .outerjoin(accounts, accounts.c.business_id == Business.id)
+            .outerjoin(volumes, volumes.c.business_id == Business.id)
             .order_by(Business.created_at.desc())
             .all()
         )
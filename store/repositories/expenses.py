@@ -3,16 +3,28 @@ Repositories for expense cards and expenses.
 """
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime, timezone
 from decimal import Decimal
-from typing import List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import func, or_, cast, String
+from sqlalchemy import Row, delete, func, insert, literal, or_, cast, select, true, tuple_, update, String
 from sqlalchemy.orm import Session, joinedload
 
-from models.expenses import Expense, ExpenseCard
+from models.expenses import CardStatus, Expense, ExpenseCard, ExpenseCategory, IncomeType
+from models.user import User
 from store.repositories.base import BaseRepository
 
+EXPENSE_EXPORT_COLUMNS = (
+    "id",
+    "date",
+    "card_name",
+    "category",
+    "description",
+    "amount",
+    "is_planned",
+    "created_at",
+)
+
 
 class ExpenseCardRepository(BaseRepository[ExpenseCard]):
     """Repository for managing expense cards."""
@@ -66,6 +78,46 @@ class ExpenseCardRepository(BaseRepository[ExpenseCard]):
             .all()
         )
 
+    def get_income_summary(self, user_id: int) -> Tuple[Decimal, int, int]:
+        """Return (total income, card count, cards with income) for a customer."""
+        total, cards, income_cards = (
+            self.db.query(
+                func.coalesce(func.sum(ExpenseCard.income_amount), 0),
+                func.count(ExpenseCard.id),
+                func.count(ExpenseCard.id).filter(ExpenseCard.income_amount > 0),
+            )
+            .filter(ExpenseCard.customer_id == user_id)
+            .one()
+        )
+        return Decimal(total), cards, income_cards
+
+    def credit_balance(
+        self, card_id: int, user_id: int, amount: Decimal
+    ) -> Optional[ExpenseCard]:
+        """
+        Add ``amount`` to a non-savings card's income and balance in one UPDATE.
+
+        Returns the updated card, or None when the customer has no such card
+        or it is savings-linked.
+        """
+        stmt = (
+            update(ExpenseCard)
+            .where(
+                ExpenseCard.id == card_id,
+                ExpenseCard.customer_id == user_id,
+                ExpenseCard.income_type != IncomeType.SAVINGS,
+            )
+            .values(
+                income_amount=ExpenseCard.income_amount + amount,
+                balance=ExpenseCard.balance + amount,
+                updated_at=datetime.now(timezone.utc),
+                updated_by=user_id,
+            )
+            .returning(ExpenseCard)
+            .execution_options(populate_existing=True)
+        )
+        return self.db.scalars(stmt).first()
+
 
 class ExpenseRepository(BaseRepository[Expense]):
     """Repository for managing expense entries."""
@@ -162,3 +214,434 @@ class ExpenseRepository(BaseRepository[Expense]):
             query = query.filter(Expense.date <= to_date)
         return query.group_by(Expense.category).all()
 
+    def get_frame_rows(
+        self,
+        *,
+        user_id: int,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+    ) -> Sequence[Tuple[date, Decimal, Optional[str]]]:
+        """Return (date, amount, category) for a customer's expenses, oldest first."""
+        query = (
+            self.db.query(Expense.date, Expense.amount, cast(Expense.category, String))
+            .join(ExpenseCard)
+            .filter(ExpenseCard.customer_id == user_id)
+        )
+        if from_date:
+            query = query.filter(Expense.date >= from_date)
+        if to_date:
+            query = query.filter(Expense.date <= to_date)
+        return query.order_by(Expense.date).all()
+
+    def get_metrics(
+        self,
+        *,
+        user_id: int,
+        business_id: Optional[int],
+        month_start: datetime,
+        month_end: datetime,
+    ) -> Row:
+        """
+        Return a customer's expense dashboard figures in one query.
+
+        ``business_id`` defaults to the customer's active business; when
+        neither is set every card counts. The row carries business_id,
+        total_income, card_count, active_cards, total_expenses and
+        month_expenses (expenses created in [month_start, month_end)).
+        """
+        if business_id:
+            target = literal(business_id)
+        else:
+            target = select(User.active_business_id).where(User.id == user_id).scalar_subquery()
+        scope = select(target.label("business_id")).cte("scope")
+        cards = (
+            select(ExpenseCard.id, ExpenseCard.income_amount, ExpenseCard.status)
+            .join(
+                scope,
+                or_(scope.c.business_id.is_(None), ExpenseCard.business_id == scope.c.business_id),
+            )
+            .where(ExpenseCard.customer_id == user_id)
+            .cte("cards")
+        )
+        card_totals = select(
+            func.coalesce(func.sum(cards.c.income_amount), 0).label("total_income"),
+            func.count().label("card_count"),
+            func.count().filter(cards.c.status == CardStatus.ACTIVE).label("active_cards"),
+        ).subquery()
+        expense_totals = (
+            select(
+                func.coalesce(func.sum(Expense.amount), 0).label("total_expenses"),
+                func.coalesce(
+                    func.sum(Expense.amount).filter(
+                        Expense.created_at >= month_start, Expense.created_at < month_end
+                    ),
+                    0,
+                ).label("month_expenses"),
+            )
+            .join(cards, cards.c.id == Expense.expense_card_id)
+            .subquery()
+        )
+        return self.db.execute(
+            select(scope.c.business_id, card_totals, expense_totals)
+            .select_from(scope)
+            .join(card_totals, true())
+            .join(expense_totals, true())
+        ).one()
+
+    def add_planned_items(
+        self,
+        card_id: int,
+        items: Sequence[Dict[str, Any]],
+        *,
+        created_by: int,
+    ) -> int:
+        """
+        Insert a planner card's line items with one multi-row INSERT.
+
+        Each item carries ``category``, ``amount`` and an optional
+        ``purpose``. Returns the number of rows inserted; the caller owns
+        the transaction.
+        """
+        if not items:
+            return 0
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "expense_card_id": card_id,
+                "category": item["category"],
+                "amount": item["amount"],
+                "planned_amount": item["amount"],
+                "purpose": item.get("purpose", ""),
+                "description": item.get("purpose", ""),
+                "date": now.date(),
+                "is_planned": True,
+                "is_completed": False,
+                "created_by": created_by,
+                "created_at": now,
+            }
+            for item in items
+        ]
+        return self.db.execute(insert(Expense).values(rows)).rowcount
+
+    @staticmethod
+    def _planned_amount():
+        # Items without a planned amount were planned at their recorded amount
+        return func.coalesce(func.nullif(Expense.planned_amount, 0), Expense.amount)
+
+    def planner_progress_by_category(self, card_id: int) -> Sequence[Row]:
+        """
+        Planned vs actual totals of a planner card's items, per category.
+
+        Rows carry category ("Uncategorized" for none), planned, actual and
+        variance (over completed items only), items and completed.
+        """
+        planned = self._planned_amount()
+        category = func.coalesce(cast(Expense.category, String), "Uncategorized")
+        done = Expense.is_completed.is_(True)
+        return self.db.execute(
+            select(
+                category.label("category"),
+                func.sum(planned).label("planned"),
+                func.coalesce(func.sum(Expense.amount).filter(done), 0).label("actual"),
+                func.coalesce(func.sum(planned - Expense.amount).filter(done), 0).label("variance"),
+                func.count().label("items"),
+                func.count().filter(done).label("completed"),
+            )
+            .where(Expense.expense_card_id == card_id, Expense.is_planned.is_(True))
+            .group_by(category)
+            .order_by(category)
+        ).all()
+
+    def planner_items(self, card_id: int) -> Sequence[Row]:
+        """The columns of a planner card's items needed for its progress view."""
+        return self.db.execute(
+            select(
+                Expense.id,
+                Expense.category,
+                func.coalesce(func.nullif(Expense.purpose, ""), Expense.description).label("purpose"),
+                self._planned_amount().label("planned_amount"),
+                Expense.amount,
+                Expense.is_completed,
+                Expense.date,
+            )
+            .where(Expense.expense_card_id == card_id, Expense.is_planned.is_(True))
+            .order_by(Expense.id)
+        ).all()
+
+    @staticmethod
+    def _user_filters(
+        *,
+        user_id: int,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        category: Optional[ExpenseCategory] = None,
+        min_amount: Optional[Decimal] = None,
+        max_amount: Optional[Decimal] = None,
+        search: Optional[str] = None,
+    ) -> List:
+        """Conditions over a customer's expenses joined to their card."""
+        filters = [ExpenseCard.customer_id == user_id]
+        if from_date:
+            filters.append(Expense.date >= from_date)
+        if to_date:
+            filters.append(Expense.date <= to_date)
+        if category is not None:
+            filters.append(Expense.category == category)
+        if min_amount is not None:
+            filters.append(Expense.amount >= min_amount)
+        if max_amount is not None:
+            filters.append(Expense.amount <= max_amount)
+        if search:
+            # lower(...) LIKE is served by the pg_trgm indexes from migration 009
+            term = search.lower()
+            filters.append(
+                or_(
+                    func.lower(Expense.description).contains(term, autoescape=True),
+                    func.lower(ExpenseCard.name).contains(term, autoescape=True),
+                )
+            )
+        return filters
+
+    def search_for_user(
+        self,
+        *,
+        user_id: int,
+        limit: int,
+        offset: int = 0,
+        after: Optional[Tuple[date, int]] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        category: Optional[ExpenseCategory] = None,
+        min_amount: Optional[Decimal] = None,
+        max_amount: Optional[Decimal] = None,
+        search: Optional[str] = None,
+    ) -> Tuple[List[Expense], Optional[int], Optional[Decimal]]:
+        """
+        One page of a customer's expenses, newest first by ``(date, id)``.
+
+        With ``after`` (the last ``(date, id)`` of the previous page) the page
+        is read by keyset and the totals are not computed, so each page costs
+        the same however deep it is; count and total are then None.
+        Otherwise the filtered count and amount total come back with the
+        OFFSET page in the same query.
+        """
+        filters = self._user_filters(
+            user_id=user_id,
+            from_date=from_date,
+            to_date=to_date,
+            category=category,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            search=search,
+        )
+        newest_first = (Expense.date.desc(), Expense.id.desc())
+        if after is not None:
+            expenses = self.db.scalars(
+                select(Expense)
+                .join(ExpenseCard, ExpenseCard.id == Expense.expense_card_id)
+                .where(*filters, tuple_(Expense.date, Expense.id) < tuple_(*after))
+                .order_by(*newest_first)
+                .limit(limit)
+            ).all()
+            return list(expenses), None, None
+
+        filtered = (
+            select(Expense.id, Expense.date, Expense.amount)
+            .join(ExpenseCard, ExpenseCard.id == Expense.expense_card_id)
+            .where(*filters)
+            .cte("filtered")
+        )
+        totals = select(
+            func.count().label("total_count"),
+            func.coalesce(func.sum(filtered.c.amount), 0).label("total_amount"),
+        ).cte("totals")
+        page = (
+            select(filtered.c.id, filtered.c.date)
+            .order_by(filtered.c.date.desc(), filtered.c.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .cte("page")
+        )
+        # Totals outer-join the page so they come back even past the last page
+        rows = self.db.execute(
+            select(totals.c.total_count, totals.c.total_amount, Expense)
+            .select_from(totals)
+            .outerjoin(page, true())
+            .outerjoin(Expense, Expense.id == page.c.id)
+            .order_by(page.c.date.desc(), page.c.id.desc())
+        ).all()
+        expenses = [expense for _, _, expense in rows if expense is not None]
+        return expenses, rows[0].total_count, Decimal(rows[0].total_amount)
+
+    def stream_for_user(self, *, user_id: int, batch_size: int, **filters) -> Iterator[Row]:
+        """
+        Yield ``EXPENSE_EXPORT_COLUMNS`` for a customer's expenses matching
+        ``filters`` (as for ``search_for_user``), newest first, through a
+        server-side cursor fetching ``batch_size`` rows at a time.
+        """
+        stmt = (
+            select(
+                Expense.id,
+                Expense.date,
+                ExpenseCard.name,
+                Expense.category,
+                Expense.description,
+                Expense.amount,
+                Expense.is_planned,
+                Expense.created_at,
+            )
+            .join(ExpenseCard, ExpenseCard.id == Expense.expense_card_id)
+            .where(*self._user_filters(user_id=user_id, **filters))
+            .order_by(Expense.date.desc(), Expense.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.db.execute(stmt)
+
+    # -------------------------------------------------------------------------
+    # Balance-changing writes
+    #
+    # Each one adjusts the card balance with a conditional UPDATE in the same
+    # statement as the expense write, so concurrent requests never read a
+    # stale balance and never wait on a row lock held across the request.
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _debit(card_filter, amount, user_id: int):
+        """UPDATE taking ``amount`` off the matching card if the balance covers it."""
+        return (
+            update(ExpenseCard)
+            .where(card_filter, ExpenseCard.balance >= amount)
+            .values(
+                balance=ExpenseCard.balance - amount,
+                updated_at=datetime.now(timezone.utc),
+                updated_by=user_id,
+            )
+        )
+
+    def record_debit(
+        self, card_id: int, user_id: int, values: Dict[str, Any]
+    ) -> Optional[Row]:
+        """
+        Debit the card by ``values["amount"]`` and insert the expense.
+
+        Returns ``(id, balance, name, customer_id, business_id)`` for the new
+        expense and the card's remaining balance, or None when the customer
+        has no such card or its balance does not cover the amount.
+        """
+        debited = (
+            self._debit(
+                (ExpenseCard.id == card_id) & (ExpenseCard.customer_id == user_id),
+                values["amount"],
+                user_id,
+            )
+            .returning(
+                ExpenseCard.id,
+                ExpenseCard.balance,
+                ExpenseCard.name,
+                ExpenseCard.customer_id,
+                ExpenseCard.business_id,
+            )
+            .cte("debited")
+        )
+        columns = Expense.__table__.c
+        # Column defaults are not applied to an INSERT inside a CTE.
+        values = {
+            **{
+                column.name: column.default.arg
+                for column in columns
+                if column.default is not None and column.default.is_scalar
+            },
+            **values,
+        }
+        inserted = (
+            insert(Expense)
+            .from_select(
+                ["expense_card_id", *values],
+                select(
+                    debited.c.id,
+                    *[literal(value, columns[name].type) for name, value in values.items()],
+                ),
+                include_defaults=False,
+            )
+            .returning(Expense.id)
+            .cte("inserted")
+        )
+        return self.db.execute(
+            select(
+                inserted.c.id,
+                debited.c.balance,
+                debited.c.name,
+                debited.c.customer_id,
+                debited.c.business_id,
+            ).select_from(inserted.join(debited, true()))
+        ).first()
+
+    def change_amount(
+        self, expense_id: int, user_id: int, amount: Decimal
+    ) -> Optional[Decimal]:
+        """
+        Set an expense's amount, moving the difference through its card balance.
+
+        Returns the previous amount, or None when the balance does not cover
+        an increase (or the customer has no such expense).
+        """
+        previous = (
+            select(Expense.id, Expense.expense_card_id, Expense.amount)
+            .join(ExpenseCard, ExpenseCard.id == Expense.expense_card_id)
+            .where(Expense.id == expense_id, ExpenseCard.customer_id == user_id)
+            .with_for_update(of=Expense)
+            .cte("previous")
+        )
+        debited = (
+            self._debit(
+                ExpenseCard.id == previous.c.expense_card_id,
+                amount - previous.c.amount,
+                user_id,
+            )
+            .returning(previous.c.amount)
+            .cte("debited")
+        )
+        stmt = (
+            update(Expense)
+            .where(Expense.id == expense_id, select(debited.c.amount).exists())
+            .values(amount=amount)
+            .returning(select(debited.c.amount).scalar_subquery())
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).scalar()
+
+    def delete_with_refund(self, expense_id: int, user_id: int) -> Optional[Row]:
+        """
+        Delete an expense and credit its amount back to the card.
+
+        Returns ``(card_id, amount, customer_id, business_id, created_at)``, or
+        None when the customer has no such expense.
+        """
+        removed = (
+            delete(Expense)
+            .where(
+                Expense.id == expense_id,
+                Expense.expense_card_id == ExpenseCard.id,
+                ExpenseCard.customer_id == user_id,
+            )
+            .returning(Expense.expense_card_id, Expense.amount, Expense.created_at)
+            .cte("removed")
+        )
+        stmt = (
+            update(ExpenseCard)
+            .where(ExpenseCard.id == removed.c.expense_card_id)
+            .values(
+                balance=ExpenseCard.balance + removed.c.amount,
+                updated_at=datetime.now(timezone.utc),
+                updated_by=user_id,
+            )
+            .returning(
+                ExpenseCard.id,
+                removed.c.amount,
+                ExpenseCard.customer_id,
+                ExpenseCard.business_id,
+                removed.c.created_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).first()
@@ -0,0 +1,97 @@
+"""
+Outbound repository for the email / SMS delivery queue.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from models.outbound import OutboundChannel, OutboundMessage, OutboundStatus
+
+MAX_OUTBOUND_ATTEMPTS = 6
+# Retry n waits OUTBOUND_RETRY_BASE_SECONDS * 2**(n-1): 30s, 1m, 2m, 4m, 8m
+OUTBOUND_RETRY_BASE_SECONDS = 30
+# How long a claimed message stays invisible to other workers. A worker that
+# dies mid-batch releases its messages for redelivery after this.
+OUTBOUND_LEASE_SECONDS = 300
+
+
+class OutboundMessageRepository:
+    """Repository for queued outbound emails and SMS"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(
+        self,
+        *,
+        channel: OutboundChannel,
+        recipient: str,
+        body: str,
+        subject: Optional[str] = None,
+        text_body: Optional[str] = None,
+    ) -> OutboundMessage:
+        now = datetime.utcnow()
+        message = OutboundMessage(
+            channel=channel.value,
+            recipient=recipient,
+            subject=subject,
+            body=body,
+            text_body=text_body,
+            status=OutboundStatus.PENDING.value,
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now,
+        )
+        self.db.add(message)
+        self.db.flush()
+        return message
+
+    def claim_due(self, channel: OutboundChannel, limit: int = 50) -> List[OutboundMessage]:
+        """
+        Lease up to ``limit`` due messages on ``channel``, oldest first.
+
+        The rows are picked with ``SKIP LOCKED`` and pushed ``OUTBOUND_LEASE_SECONDS``
+        into the future in one statement, so the caller can commit and send
+        without holding row locks across network calls while other workers
+        skip them.
+        """
+        now = datetime.utcnow()
+        due = (
+            select(OutboundMessage.id)
+            .where(
+                OutboundMessage.channel == channel.value,
+                OutboundMessage.status == OutboundStatus.PENDING.value,
+                OutboundMessage.next_attempt_at <= now,
+            )
+            .order_by(OutboundMessage.next_attempt_at, OutboundMessage.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(OutboundMessage)
+            .where(OutboundMessage.id.in_(due))
+            .values(next_attempt_at=now + timedelta(seconds=OUTBOUND_LEASE_SECONDS))
+            .returning(OutboundMessage)
+            .execution_options(synchronize_session=False)
+        )
+        messages = self.db.scalars(stmt).all()
+        return sorted(messages, key=lambda message: message.id)
+
+    def mark_sent(self, message: OutboundMessage) -> None:
+        message.attempts = (message.attempts or 0) + 1
+        message.status = OutboundStatus.SENT.value
+        message.last_error = None
+        message.sent_at = datetime.utcnow()
+
+    def mark_failed(self, message: OutboundMessage, error: str, *, retry: bool = True) -> None:
+        """Record a failed attempt; retry with backoff until ``MAX_OUTBOUND_ATTEMPTS``."""
+        message.attempts = (message.attempts or 0) + 1
+        message.last_error = error
+        if retry and message.attempts < MAX_OUTBOUND_ATTEMPTS:
+            delay = OUTBOUND_RETRY_BASE_SECONDS * 2 ** (message.attempts - 1)
+            message.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        else:
+            message.status = OutboundStatus.FAILED.value
@@ -5,9 +5,9 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, func, or_
+from sqlalchemy import Row, func, or_, select, true
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 from models.payments import (
@@ -17,11 +17,41 @@ from models.payments import (
     PaymentRequest,
     PaymentRequestStatus,
 )
-from models.savings import SavingsAccount
+from models.rollups import DailyPaymentFact
+from models.savings import SavingsAccount, SavingsMarking, SavingsStatus
 from models.user import User
 from store.repositories.base import BaseRepository
 
 
+PAYMENT_REQUEST_EXPORT_COLUMNS = (
+    "id",
+    "reference",
+    "tracking_number",
+    "business_id",
+    "customer_name",
+    "amount",
+    "status",
+    "request_date",
+    "approval_date",
+    "rejection_reason",
+)
+
+
+
+def _paged(stmt, *, limit: int, offset: int):
+    """``stmt`` cut to one page, each row carrying the full match count as ``total_count``."""
+    return stmt.add_columns(func.count().over().label("total_count")).offset(offset).limit(limit)
+
+
+def _page_total(db: Session, stmt, rows: Sequence[Row], offset: int) -> int:
+    """Total for a page built with ``_paged``; only counted separately past the last page."""
+    if rows:
+        return rows[0].total_count
+    if not offset:
+        return 0
+    return db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+
 class PaymentAccountRepository(BaseRepository[PaymentAccount]):
     """Repository for payment accounts."""
 
@@ -124,34 +154,31 @@ class CommissionRepository(BaseRepository[Commission]):
         search: Optional[str] = None,
         limit: int,
         offset: int,
-    ) -> Tuple[List[Commission], int]:
-        query = (
-            self.db.query(Commission)
-            .join(SavingsAccount, SavingsAccount.id == Commission.savings_account_id)
-            .join(User, User.id == SavingsAccount.customer_id)
-            .options(
-                joinedload(Commission.savings_account).joinedload(
-                    SavingsAccount.customer
-                )
-            )
-        )
+    ) -> Tuple[List[Row], int]:
+        """
+        One page of commission rows, newest first, and the total match count.
+
+        Rows carry exactly the listing columns (commission, customer id and
+        name, savings type and tracking number) from a single statement.
+        """
+        filters = []
 
         # Filter by agent_id directly when available (agents linked via Business.agent_id,
         # not user_business, so business_ids from ORM relationship may be empty)
         if agent_id:
-            query = query.filter(Commission.agent_id == agent_id)
+            filters.append(Commission.agent_id == agent_id)
         elif business_ids:
-            query = query.filter(SavingsAccount.business_id.in_(business_ids))
+            filters.append(SavingsAccount.business_id.in_(business_ids))
 
         if business_id:
-            query = query.filter(SavingsAccount.business_id == business_id)
+            filters.append(SavingsAccount.business_id == business_id)
 
         if savings_account_id:
-            query = query.filter(Commission.savings_account_id == savings_account_id)
+            filters.append(Commission.savings_account_id == savings_account_id)
 
         if search:
             pattern = f"%{search.lower()}%"
-            query = query.filter(
+            filters.append(
                 or_(
                     func.lower(User.full_name).like(pattern),
                     func.lower(User.phone_number).like(pattern),
@@ -159,14 +186,34 @@ class CommissionRepository(BaseRepository[Commission]):
                 )
             )
 
-        total = query.count()
-        items = (
-            query.order_by(Commission.commission_date.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+        stmt = (
+            select(
+                Commission.id,
+                Commission.savings_account_id,
+                Commission.agent_id,
+                Commission.amount,
+                Commission.commission_date,
+                User.id.label("customer_id"),
+                User.full_name.label("customer_name"),
+                SavingsAccount.savings_type,
+                SavingsAccount.tracking_number,
+            )
+            .join(SavingsAccount, SavingsAccount.id == Commission.savings_account_id)
+            .join(User, User.id == SavingsAccount.customer_id)
+            .where(*filters)
+            .order_by(Commission.commission_date.desc(), Commission.id.desc())
         )
-        return items, total
+        rows = self.db.execute(_paged(stmt, limit=limit, offset=offset)).all()
+        return rows, _page_total(self.db, stmt, rows, offset)
+
+    def get_latest_for_savings_account(self, savings_account_id: int) -> Optional[Row]:
+        """(id, agent_id, amount) of the newest commission on a savings account."""
+        return self.db.execute(
+            select(Commission.id, Commission.agent_id, Commission.amount)
+            .where(Commission.savings_account_id == savings_account_id)
+            .order_by(Commission.created_at.desc())
+            .limit(1)
+        ).first()
 
 
 class PaymentsRepository(BaseRepository[PaymentRequest]):
@@ -178,61 +225,52 @@ class PaymentsRepository(BaseRepository[PaymentRequest]):
     # ------------------------------------------------------------------
     # Analytics helpers
     # ------------------------------------------------------------------
+    # Read from the daily payment facts, so these scale with days, not requests.
     def get_status_summary(self) -> List[Dict[str, object]]:
         rows = (
             self.db.query(
-                PaymentRequest.status,
-                func.count(PaymentRequest.id),
-                func.coalesce(func.sum(PaymentRequest.amount), 0),
+                DailyPaymentFact.status,
+                func.coalesce(func.sum(DailyPaymentFact.request_count), 0),
+                func.coalesce(func.sum(DailyPaymentFact.amount), 0),
             )
-            .group_by(PaymentRequest.status)
+            .group_by(DailyPaymentFact.status)
             .all()
         )
-
-        summary: List[Dict[str, object]] = []
-        for status, count, amount in rows:
-            status_value = (
-                status.value if isinstance(status, PaymentRequestStatus) else status
-            )
-            summary.append(
-                {
-                    "status": status_value,
-                    "count": int(count or 0),
-                    "amount": float(Decimal(amount or 0)),
-                }
-            )
-        return summary
+        return [
+            {
+                "status": status,
+                "count": int(count or 0),
+                "amount": float(Decimal(amount or 0)),
+            }
+            for status, count, amount in rows
+        ]
 
     def count_total_requests(self) -> int:
-        return self.db.query(func.count(PaymentRequest.id)).scalar() or 0
+        return int(self.db.query(func.coalesce(func.sum(DailyPaymentFact.request_count), 0)).scalar() or 0)
 
     def get_successful_payment_stats(self) -> Dict[str, float]:
-        query = (
+        count, amount = (
             self.db.query(
-                func.count(PaymentRequest.id),
-                func.coalesce(func.sum(PaymentRequest.amount), 0),
+                func.coalesce(func.sum(DailyPaymentFact.request_count), 0),
+                func.coalesce(func.sum(DailyPaymentFact.amount), 0),
             )
-            .filter(PaymentRequest.status == PaymentRequestStatus.APPROVED.value)
-            .first()
+            .filter(DailyPaymentFact.status == PaymentRequestStatus.APPROVED.value)
+            .one()
         )
-        count = int(query[0] or 0) if query else 0
-        amount = float(Decimal(query[1] or 0)) if query else 0.0
-        return {"count": count, "amount": amount}
+        return {"count": int(count or 0), "amount": float(Decimal(amount or 0))}
 
     def get_monthly_payment_volume(self, months: int = 6) -> List[Dict[str, float]]:
         if months <= 0:
             return []
 
-        month_alias = func.date_trunc("month", PaymentRequest.approval_date)
+        # Approved requests are bucketed by approval day
+        month_alias = func.date_trunc("month", DailyPaymentFact.day)
         rows = (
             self.db.query(
                 month_alias.label("month"),
-                func.coalesce(func.sum(PaymentRequest.amount), 0).label("amount"),
-            )
-            .filter(
-                PaymentRequest.status == PaymentRequestStatus.APPROVED.value,
-                PaymentRequest.approval_date.isnot(None),
+                func.coalesce(func.sum(DailyPaymentFact.amount), 0).label("amount"),
             )
+            .filter(DailyPaymentFact.status == PaymentRequestStatus.APPROVED.value)
             .group_by("month")
             .order_by(month_alias.desc())
             .limit(months)
@@ -272,8 +310,8 @@ class PaymentsRepository(BaseRepository[PaymentRequest]):
             .first()
         )
 
-    def get_payment_requests_with_filters(
-        self,
+    @staticmethod
+    def _request_filters(
         *,
         base_conditions: Optional[Sequence] = None,
         status: Optional[PaymentRequestStatus] = None,
@@ -282,40 +320,25 @@ class PaymentsRepository(BaseRepository[PaymentRequest]):
         search: Optional[str] = None,
         start_dt: Optional[datetime] = None,
         end_dt: Optional[datetime] = None,
-        limit: int,
-        offset: int,
-    ) -> Tuple[List[PaymentRequest], int]:
-        query = (
-            self.db.query(PaymentRequest)
-            .join(PaymentAccount, PaymentAccount.id == PaymentRequest.payment_account_id)
-            .join(SavingsAccount, SavingsAccount.id == PaymentRequest.savings_account_id)
-            .join(User, User.id == PaymentAccount.customer_id)
-            .options(
-                joinedload(PaymentRequest.payment_account).joinedload(
-                    PaymentAccount.customer
-                ),
-                joinedload(PaymentRequest.savings_account),
-            )
-        )
-
-        if base_conditions:
-            query = query.filter(and_(*base_conditions))
+    ) -> List:
+        """Conditions over payment requests joined to their account, savings account and customer."""
+        filters = list(base_conditions or [])
 
         if status:
             status_value = (
                 status.value if isinstance(status, PaymentRequestStatus) else status
             )
-            query = query.filter(PaymentRequest.status == status_value)
+            filters.append(PaymentRequest.status == status_value)
 
         if customer_id is not None:
-            query = query.filter(PaymentAccount.customer_id == customer_id)
+            filters.append(PaymentAccount.customer_id == customer_id)
 
         if business_id is not None:
-            query = query.filter(SavingsAccount.business_id == business_id)
+            filters.append(SavingsAccount.business_id == business_id)
 
         if search:
             pattern = f"%{search.lower()}%"
-            query = query.filter(
+            filters.append(
                 or_(
                     func.lower(PaymentRequest.reference).like(pattern),
                     func.lower(SavingsAccount.tracking_number).like(pattern),
@@ -326,15 +349,155 @@ class PaymentsRepository(BaseRepository[PaymentRequest]):
             )
 
         if start_dt:
-            query = query.filter(PaymentRequest.request_date >= start_dt)
+            filters.append(PaymentRequest.request_date >= start_dt)
         if end_dt:
-            query = query.filter(PaymentRequest.request_date < end_dt)
+            filters.append(PaymentRequest.request_date < end_dt)
+        return filters
 
-        total = query.count()
-        requests = (
-            query.order_by(PaymentRequest.request_date.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+    @staticmethod
+    def _requests_select(*columns):
+        """``columns`` over payment requests joined to their account, savings account and customer."""
+        return (
+            select(*columns)
+            .select_from(PaymentRequest)
+            .join(PaymentAccount, PaymentAccount.id == PaymentRequest.payment_account_id)
+            .join(SavingsAccount, SavingsAccount.id == PaymentRequest.savings_account_id)
+            .join(User, User.id == PaymentAccount.customer_id)
+        )
+
+    def get_payment_requests_with_filters(
+        self,
+        *,
+        base_conditions: Optional[Sequence] = None,
+        status: Optional[PaymentRequestStatus] = None,
+        customer_id: Optional[int] = None,
+        business_id: Optional[int] = None,
+        search: Optional[str] = None,
+        start_dt: Optional[datetime] = None,
+        end_dt: Optional[datetime] = None,
+        limit: int,
+        offset: int,
+    ) -> Tuple[List[Row], int]:
+        """
+        One page of payment request rows, newest first, and the total match count.
+
+        Rows carry the request's own columns plus customer_name and
+        tracking_number, from a single statement.
+        """
+        stmt = (
+            self._requests_select(
+                PaymentRequest.id,
+                PaymentRequest.payment_account_id,
+                PaymentRequest.account_details_id,
+                PaymentRequest.savings_account_id,
+                PaymentRequest.amount,
+                PaymentRequest.status,
+                PaymentRequest.request_date,
+                PaymentRequest.approval_date,
+                PaymentRequest.rejection_reason,
+                User.full_name.label("customer_name"),
+                SavingsAccount.tracking_number,
+            )
+            .where(
+                *self._request_filters(
+                    base_conditions=base_conditions,
+                    status=status,
+                    customer_id=customer_id,
+                    business_id=business_id,
+                    search=search,
+                    start_dt=start_dt,
+                    end_dt=end_dt,
+                )
+            )
+            .order_by(PaymentRequest.request_date.desc(), PaymentRequest.id.desc())
+        )
+        rows = self.db.execute(_paged(stmt, limit=limit, offset=offset)).all()
+        return rows, _page_total(self.db, stmt, rows, offset)
+
+    def get_customer_payments_with_filters(
+        self,
+        *,
+        base_conditions: Optional[Sequence] = None,
+        customer_id: Optional[int] = None,
+        business_id: Optional[int] = None,
+        search: Optional[str] = None,
+        limit: int,
+        offset: int,
+    ) -> Tuple[List[Row], int]:
+        """
+        One page of customer payment rows, newest request first, and the total match count.
+
+        Each row carries the request, customer and savings account columns
+        of the listing plus the account's paid markings as paid_total,
+        first_paid and last_paid. The markings are aggregated for the page's
+        rows only, in the same statement.
+        """
+        stmt = (
+            self._requests_select(
+                PaymentRequest.id,
+                PaymentRequest.status,
+                PaymentRequest.request_date,
+                PaymentRequest.created_at,
+                PaymentRequest.updated_at,
+                SavingsAccount.id.label("savings_account_id"),
+                SavingsAccount.savings_type,
+                SavingsAccount.tracking_number,
+                SavingsAccount.commission_amount,
+                SavingsAccount.commission_days,
+                User.id.label("customer_id"),
+                User.full_name.label("customer_name"),
+            )
+            .where(
+                *self._request_filters(
+                    base_conditions=base_conditions,
+                    customer_id=customer_id,
+                    business_id=business_id,
+                    search=search,
+                )
+            )
+            .order_by(PaymentRequest.request_date.desc(), PaymentRequest.id.desc())
+        )
+        page = _paged(stmt, limit=limit, offset=offset).subquery()
+        paid = (
+            select(
+                func.coalesce(func.sum(SavingsMarking.amount), 0).label("paid_total"),
+                func.min(SavingsMarking.marked_date).label("first_paid"),
+                func.max(SavingsMarking.marked_date).label("last_paid"),
+            )
+            .where(
+                SavingsMarking.savings_account_id == page.c.savings_account_id,
+                SavingsMarking.status == SavingsStatus.PAID,
+            )
+            .lateral("paid")
+        )
+        rows = self.db.execute(
+            select(page, paid)
+            .join(paid, true())
+            .order_by(page.c.request_date.desc(), page.c.id.desc())
+        ).all()
+        return rows, _page_total(self.db, stmt, rows, offset)
+
+    def stream_payment_requests(self, *, batch_size: int, **filters) -> Iterator[Row]:
+        """
+        Yield ``PAYMENT_REQUEST_EXPORT_COLUMNS`` for every payment request matching ``filters``
+        (as for ``get_payment_requests_with_filters``), newest first, through a
+        server-side cursor fetching ``batch_size`` rows at a time.
+        """
+        stmt = (
+            self._requests_select(
+                PaymentRequest.id,
+                PaymentRequest.reference,
+                SavingsAccount.tracking_number,
+                SavingsAccount.business_id,
+                User.full_name,
+                PaymentRequest.amount,
+                PaymentRequest.status,
+                PaymentRequest.request_date,
+                PaymentRequest.approval_date,
+                PaymentRequest.rejection_reason,
+            )
+            .where(*self._request_filters(**filters))
+            .order_by(PaymentRequest.request_date.desc(), PaymentRequest.id.desc())
+            .execution_options(yield_per=batch_size)
         )
-        return requests, total
+        yield from self.db.execute(stmt)
@@ -0,0 +1,496 @@
+"""
+Rollup repository for incrementally maintained summary tables.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import Date, String, case, cast, delete, distinct, func, literal, select, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models.expenses import Expense, ExpenseCard
+from models.payments import PaymentRequest
+from models.rollups import (
+    AnalyticsFactWatermark,
+    CustomerMonthlyRollup,
+    DailyPaymentFact,
+    DailySavingsFact,
+    DailySignupFact,
+    SavingsGroupPeriodRollup,
+    SavingsGroupRollup,
+)
+from models.savings import SavingsAccount, SavingsMarking, SavingsStatus
+from models.savings_group import SavingsGroup
+from models.user import User
+
+
+def month_start(value: date) -> date:
+    """Return the first day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+GROUP_ROLLUP_COLUMNS = ["group_id", "business_id", "member_count", "target_total", "collected_total"]
+GROUP_PERIOD_COLUMNS = ["group_id", "period_date", "scheduled_count", "paid_count"]
+
+# Re-read rows changed this long before the last watermark, to cover clock skew
+# and transactions that committed after a refresh started.
+FACT_REFRESH_OVERLAP = timedelta(minutes=10)
+FACT_REFRESH_LOCK_KEY = 39_001
+
+
+class FactSource(NamedTuple):
+    """How one daily fact table is derived from its source table."""
+    name: str
+    fact: type
+    columns: List[str]
+    rows: object  # SELECT producing ``columns``, grouped by day
+    day: object  # source expression bucketed into fact.day
+    stamp: object  # indexed source column ``day`` is derived from
+    changed_at: object  # when a source row was last written
+    # Days a changed row may have been bucketed into before its last write,
+    # rebuilt alongside its current ``day`` so the row isn't left counted there
+    previous_days: Sequence[object] = ()
+
+
+class RollupRepository:
+    """Repository for customer monthly, cooperative group and daily analytics rollups"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _upsert(self, rows_select, columns: Sequence[str]) -> None:
+        """Add the selected sums onto existing rollup rows, inserting missing ones."""
+        stmt = pg_insert(CustomerMonthlyRollup).from_select(list(columns), rows_select)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["customer_id", "business_id", "month"],
+            set_={
+                "savings_total": CustomerMonthlyRollup.savings_total + stmt.excluded.savings_total,
+                "expense_total": CustomerMonthlyRollup.expense_total + stmt.excluded.expense_total,
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
+
+    def _upsert_groups(self, rows_select) -> None:
+        stmt = pg_insert(SavingsGroupRollup).from_select(GROUP_ROLLUP_COLUMNS, rows_select)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["group_id"],
+            set_={
+                "member_count": SavingsGroupRollup.member_count + stmt.excluded.member_count,
+                "target_total": SavingsGroupRollup.target_total + stmt.excluded.target_total,
+                "collected_total": SavingsGroupRollup.collected_total + stmt.excluded.collected_total,
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
+
+    def _upsert_group_periods(self, rows_select) -> None:
+        stmt = pg_insert(SavingsGroupPeriodRollup).from_select(GROUP_PERIOD_COLUMNS, rows_select)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["group_id", "period_date"],
+            set_={
+                "scheduled_count": SavingsGroupPeriodRollup.scheduled_count + stmt.excluded.scheduled_count,
+                "paid_count": SavingsGroupPeriodRollup.paid_count + stmt.excluded.paid_count,
+            },
+        )
+        self.db.execute(stmt)
+
+    def _apply_markings(self, marking_ids: Sequence[int], sign: int) -> None:
+        ids = list(marking_ids)
+        month = cast(func.date_trunc("month", SavingsMarking.marked_date), Date)
+        rows = (
+            select(
+                SavingsAccount.customer_id,
+                SavingsAccount.business_id,
+                month,
+                sign * func.sum(SavingsMarking.amount),
+                literal(0),
+            )
+            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
+            .where(SavingsMarking.id.in_(ids))
+            .group_by(SavingsAccount.customer_id, SavingsAccount.business_id, month)
+        )
+        self._upsert(rows, ["customer_id", "business_id", "month", "savings_total", "expense_total"])
+
+        in_group = (SavingsMarking.id.in_(ids), SavingsAccount.group_id.isnot(None))
+        self._upsert_groups(
+            select(
+                SavingsAccount.group_id,
+                SavingsAccount.business_id,
+                literal(0),
+                literal(0),
+                sign * func.sum(SavingsMarking.amount),
+            )
+            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
+            .where(*in_group)
+            .group_by(SavingsAccount.group_id, SavingsAccount.business_id)
+        )
+        self._upsert_group_periods(
+            select(
+                SavingsAccount.group_id,
+                SavingsMarking.marked_date,
+                literal(0),
+                sign * func.count(),
+            )
+            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
+            .where(*in_group)
+            .group_by(SavingsAccount.group_id, SavingsMarking.marked_date)
+        )
+
+    def apply_paid_markings(self, marking_ids: Sequence[int]) -> None:
+        """
+        Add newly paid markings to their customer's monthly savings totals
+        and, for cooperative accounts, to their group's collected totals.
+
+        Must be called exactly once per marking, in the same transaction that
+        flips the marking to PAID.
+        """
+        if not marking_ids:
+            return
+        self._apply_markings(marking_ids, 1)
+
+    def revert_paid_markings(self, marking_ids: Sequence[int]) -> None:
+        """Undo :meth:`apply_paid_markings` for markings moved back out of PAID."""
+        if not marking_ids:
+            return
+        self._apply_markings(marking_ids, -1)
+
+    def apply_expense(
+        self,
+        *,
+        customer_id: int,
+        business_id: int,
+        recorded_on: date,
+        amount: Decimal,
+    ) -> None:
+        """Add a (possibly negative) expense delta to the month it was recorded in."""
+        if not amount:
+            return
+        rows = select(
+            literal(customer_id),
+            literal(business_id),
+            literal(month_start(recorded_on), Date),
+            literal(0),
+            literal(Decimal(amount)),
+        )
+        self._upsert(rows, ["customer_id", "business_id", "month", "savings_total", "expense_total"])
+
+    def remove_card_expenses(self, card_id: int) -> None:
+        """Subtract every expense on a card before the card is deleted."""
+        month = cast(func.date_trunc("month", Expense.created_at), Date)
+        rows = (
+            select(
+                ExpenseCard.customer_id,
+                ExpenseCard.business_id,
+                month,
+                literal(0),
+                -func.sum(Expense.amount),
+            )
+            .join(ExpenseCard, ExpenseCard.id == Expense.expense_card_id)
+            .where(Expense.expense_card_id == card_id)
+            .group_by(ExpenseCard.customer_id, ExpenseCard.business_id, month)
+        )
+        self._upsert(rows, ["customer_id", "business_id", "month", "savings_total", "expense_total"])
+
+    def get_customer_summary(
+        self,
+        *,
+        customer_id: int,
+        month: date,
+        business_id: Optional[int] = None,
+    ) -> Dict[str, Decimal]:
+        """
+        Current-month and all-time totals in a single indexed read.
+
+        Savings are scoped to ``business_id`` when given; expenses always span
+        every business the customer has cards in.
+        """
+        in_business = (
+            CustomerMonthlyRollup.business_id == business_id
+            if business_id is not None
+            else literal(True)
+        )
+        this_month = CustomerMonthlyRollup.month == month_start(month)
+        row = (
+            self.db.query(
+                func.coalesce(func.sum(case((this_month & in_business, CustomerMonthlyRollup.savings_total), else_=0)), 0),
+                func.coalesce(func.sum(case((this_month, CustomerMonthlyRollup.expense_total), else_=0)), 0),
+                func.coalesce(func.sum(case((in_business, CustomerMonthlyRollup.savings_total), else_=0)), 0),
+                func.coalesce(func.sum(CustomerMonthlyRollup.expense_total), 0),
+            )
+            .filter(CustomerMonthlyRollup.customer_id == customer_id)
+            .one()
+        )
+        return {
+            "savings_month": Decimal(row[0]),
+            "expenses_month": Decimal(row[1]),
+            "savings_all_time": Decimal(row[2]),
+            "expenses_all_time": Decimal(row[3]),
+        }
+
+    def get_customer_months(
+        self,
+        *,
+        customer_id: int,
+        from_month: date,
+        to_month: date,
+        business_id: Optional[int] = None,
+    ) -> List[Dict[str, object]]:
+        """Per-month savings and expense totals for an inclusive month range."""
+        savings = CustomerMonthlyRollup.savings_total
+        if business_id is not None:
+            savings = case((CustomerMonthlyRollup.business_id == business_id, savings), else_=0)
+        rows = (
+            self.db.query(
+                CustomerMonthlyRollup.month,
+                func.coalesce(func.sum(savings), 0),
+                func.coalesce(func.sum(CustomerMonthlyRollup.expense_total), 0),
+            )
+            .filter(
+                CustomerMonthlyRollup.customer_id == customer_id,
+                CustomerMonthlyRollup.month >= month_start(from_month),
+                CustomerMonthlyRollup.month <= month_start(to_month),
+            )
+            .group_by(CustomerMonthlyRollup.month)
+            .order_by(CustomerMonthlyRollup.month)
+            .all()
+        )
+        return [
+            {"month": month, "savings": Decimal(savings_sum), "expenses": Decimal(expense_sum)}
+            for month, savings_sum, expense_sum in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # Cooperative group rollups
+    # ------------------------------------------------------------------
+
+    def apply_group_accounts(self, account_ids: Sequence[int]) -> None:
+        """
+        Add newly enrolled group accounts (and their pre-seeded schedules)
+        to the group rollups. Call once, after the markings are flushed.
+        """
+        if not account_ids:
+            return
+        ids = list(account_ids)
+        self._upsert_groups(
+            select(
+                SavingsAccount.group_id,
+                SavingsAccount.business_id,
+                func.count(distinct(SavingsAccount.id)),
+                func.coalesce(func.sum(SavingsMarking.amount), 0),
+                func.coalesce(func.sum(SavingsMarking.amount).filter(SavingsMarking.status == SavingsStatus.PAID), 0),
+            )
+            .outerjoin(SavingsMarking, SavingsMarking.savings_account_id == SavingsAccount.id)
+            .where(SavingsAccount.id.in_(ids), SavingsAccount.group_id.isnot(None))
+            .group_by(SavingsAccount.group_id, SavingsAccount.business_id)
+        )
+        self._upsert_group_periods(
+            select(
+                SavingsAccount.group_id,
+                SavingsMarking.marked_date,
+                func.count(),
+                func.count().filter(SavingsMarking.status == SavingsStatus.PAID),
+            )
+            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
+            .where(SavingsAccount.id.in_(ids), SavingsAccount.group_id.isnot(None))
+            .group_by(SavingsAccount.group_id, SavingsMarking.marked_date)
+        )
+
+    def refresh_group_rollups(self, group_ids: Sequence[int]) -> None:
+        """
+        Recompute the rollups of ``group_ids`` from their markings.
+
+        For changes that aren't a plain payment or enrollment (a member
+        removed, an unscheduled marking added); costs one scan of each group.
+        """
+        if not group_ids:
+            return
+        ids = list(group_ids)
+        self.db.execute(delete(SavingsGroupPeriodRollup).where(SavingsGroupPeriodRollup.group_id.in_(ids)))
+        self.db.execute(delete(SavingsGroupRollup).where(SavingsGroupRollup.group_id.in_(ids)))
+        self._upsert_groups(
+            select(
+                SavingsGroup.id,
+                SavingsGroup.business_id,
+                func.count(distinct(SavingsAccount.id)),
+                func.coalesce(func.sum(SavingsMarking.amount), 0),
+                func.coalesce(func.sum(SavingsMarking.amount).filter(SavingsMarking.status == SavingsStatus.PAID), 0),
+            )
+            .outerjoin(SavingsAccount, SavingsAccount.group_id == SavingsGroup.id)
+            .outerjoin(SavingsMarking, SavingsMarking.savings_account_id == SavingsAccount.id)
+            .where(SavingsGroup.id.in_(ids))
+            .group_by(SavingsGroup.id, SavingsGroup.business_id)
+        )
+        self._upsert_group_periods(
+            select(
+                SavingsAccount.group_id,
+                SavingsMarking.marked_date,
+                func.count(),
+                func.count().filter(SavingsMarking.status == SavingsStatus.PAID),
+            )
+            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
+            .where(SavingsAccount.group_id.in_(ids))
+            .group_by(SavingsAccount.group_id, SavingsMarking.marked_date)
+        )
+
+    def get_group_totals(self, group_id: int) -> Dict[str, object]:
+        """Members, target, collected and scheduled/paid period counts for one group."""
+        periods = (
+            select(
+                func.count().label("scheduled_periods"),
+                func.count().filter(SavingsGroupPeriodRollup.paid_count > 0).label("paid_periods"),
+            )
+            .where(SavingsGroupPeriodRollup.group_id == group_id)
+            .subquery()
+        )
+        row = (
+            self.db.query(
+                func.coalesce(SavingsGroupRollup.member_count, 0),
+                func.coalesce(SavingsGroupRollup.target_total, 0),
+                func.coalesce(SavingsGroupRollup.collected_total, 0),
+                periods.c.scheduled_periods,
+                periods.c.paid_periods,
+            )
+            .select_from(periods)
+            .outerjoin(SavingsGroupRollup, SavingsGroupRollup.group_id == group_id)
+            .one()
+        )
+        return {
+            "member_count": int(row[0]),
+            "target_total": Decimal(row[1]),
+            "collected_total": Decimal(row[2]),
+            "scheduled_periods": int(row[3]),
+            "paid_periods": int(row[4]),
+        }
+
+    # ------------------------------------------------------------------
+    # Daily analytics facts
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _fact_sources() -> List[FactSource]:
+        marking_day = SavingsMarking.marked_date
+        payment_at = func.coalesce(PaymentRequest.approval_date, PaymentRequest.request_date)
+        payment_day = cast(payment_at, Date)
+        signup_day = cast(User.created_at, Date)
+        return [
+            FactSource(
+                name="savings_markings",
+                fact=DailySavingsFact,
+                columns=["day", "business_id", "status", "payment_method", "marking_count", "amount"],
+                rows=(
+                    select(
+                        marking_day,
+                        SavingsAccount.business_id,
+                        cast(SavingsMarking.status, String),
+                        func.coalesce(cast(SavingsMarking.payment_method, String), ""),
+                        func.count(),
+                        func.sum(SavingsMarking.amount),
+                    )
+                    .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
+                    .group_by(
+                        marking_day,
+                        SavingsAccount.business_id,
+                        SavingsMarking.status,
+                        SavingsMarking.payment_method,
+                    )
+                ),
+                day=marking_day,
+                stamp=marking_day,
+                changed_at=func.coalesce(SavingsMarking.updated_at, SavingsMarking.created_at),
+            ),
+            FactSource(
+                name="payment_requests",
+                fact=DailyPaymentFact,
+                columns=["day", "status", "request_count", "amount"],
+                rows=(
+                    select(
+                        payment_day,
+                        cast(PaymentRequest.status, String),
+                        func.count(),
+                        func.sum(PaymentRequest.amount),
+                    )
+                    .group_by(payment_day, PaymentRequest.status)
+                ),
+                day=payment_day,
+                stamp=payment_at,
+                changed_at=func.coalesce(PaymentRequest.updated_at, PaymentRequest.created_at),
+                # Approval moves a request from its request day to its approval day
+                previous_days=[cast(PaymentRequest.request_date, Date)],
+            ),
+            FactSource(
+                name="users",
+                fact=DailySignupFact,
+                columns=["day", "role", "signup_count"],
+                rows=(
+                    select(signup_day, cast(User.role, String), func.count())
+                    .where(User.created_at.isnot(None))
+                    .group_by(signup_day, User.role)
+                ),
+                day=signup_day,
+                stamp=User.created_at,
+                changed_at=func.coalesce(User.updated_at, User.created_at),
+            ),
+        ]
+
+    def _refresh_fact(self, source: FactSource, since) -> int:
+        """
+        Rebuild the fact rows for every day touched by a source row changed
+        since ``since`` (every day when ``since`` is None). Days are deleted
+        and re-aggregated whole, so re-running a refresh never double counts.
+        """
+        rows = source.rows
+        if since is None:
+            self.db.execute(delete(source.fact))
+        else:
+            days = self.db.scalars(
+                union(*[
+                    select(day).where(source.changed_at >= since)
+                    for day in [source.day, *source.previous_days]
+                ])
+            ).all()
+            days = [day for day in days if day is not None]
+            if not days:
+                return 0
+            self.db.execute(delete(source.fact).where(source.fact.day.in_(days)))
+            rows = rows.where(source.stamp >= min(days), source.day.in_(days))
+        result = self.db.execute(pg_insert(source.fact).from_select(source.columns, rows))
+        return result.rowcount
+
+    def refresh_daily_facts(self, *, full: bool = False) -> Optional[Dict[str, int]]:
+        """
+        Bring the daily fact tables up to date with their source tables.
+
+        Each source keeps a watermark; only days with rows written since then
+        (less ``FACT_REFRESH_OVERLAP``) are rebuilt. ``full`` (or a missing
+        watermark) rebuilds everything, which also drops days whose source rows
+        were deleted. Returns fact rows written per source, or None if another
+        refresh holds the lock. The caller commits.
+        """
+        locked = self.db.execute(select(func.pg_try_advisory_xact_lock(FACT_REFRESH_LOCK_KEY))).scalar()
+        if not locked:
+            return None
+        started = self.db.execute(select(func.now())).scalar()
+        watermarks = dict(
+            self.db.query(AnalyticsFactWatermark.source, AnalyticsFactWatermark.refreshed_through).all()
+        )
+
+        written: Dict[str, int] = {}
+        for source in self._fact_sources():
+            watermark = None if full else watermarks.get(source.name)
+            written[source.name] = self._refresh_fact(
+                source, watermark - FACT_REFRESH_OVERLAP if watermark else None
+            )
+
+        stmt = pg_insert(AnalyticsFactWatermark).values(
+            [{"source": name, "refreshed_through": started} for name in written]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source"],
+            set_={"refreshed_through": stmt.excluded.refreshed_through},
+        )
+        self.db.execute(stmt)
+        return written
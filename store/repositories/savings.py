@@ -1,19 +1,33 @@
 """
 Savings repository for savings-related database operations.
 """
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple, Optional
 
-from typing import Dict, List, Tuple, Optional
-
-from sqlalchemy import func, or_, distinct
+from sqlalchemy import Integer, Row, any_, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session, joinedload
 
 from models.business import Unit
-from models.savings import SavingsAccount, SavingsMarking, SavingsStatus
+from models.rollups import DailySavingsFact
+from models.savings import MarkingStatus, PaymentMethod, SavingsAccount, SavingsMarking, SavingsStatus
 from models.user import User
 from models.user_business import user_business
 
+MARKING_EXPORT_COLUMNS = (
+    "id",
+    "tracking_number",
+    "business_id",
+    "customer_id",
+    "unit_id",
+    "marked_date",
+    "amount",
+    "status",
+    "payment_method",
+    "payment_reference",
+)
+
 
 class SavingsRepository:
     """Repository for savings models"""
@@ -40,6 +54,12 @@ class SavingsRepository:
 
     def get_markings_by_account(self, account_id: int) -> List[SavingsMarking]:
         """Get all markings for a savings account"""
+        return (
+            self.db.query(SavingsMarking)
+            .filter(SavingsMarking.savings_account_id == account_id)
+            .all()
+        )
+
     def get_savings_with_filters(
         self,
         *,
@@ -104,131 +124,139 @@ class SavingsRepository:
             is not None
         )
 
-        return (
-            self.db.query(SavingsMarking)
-            .filter(SavingsMarking.savings_account_id == account_id)
-            .all()
-        )
-
     # -------------------------------------------------------------------------
-    # Analytics helpers
+    # Payment verification helpers
     # -------------------------------------------------------------------------
 
-    def get_system_savings_metrics(self) -> Dict[str, object]:
+    def mark_markings_paid(
+        self, marking_ids: List[int], *, reference: str, marked_by_id: Optional[int] = None
+    ) -> List[Tuple]:
         """
-        Compute aggregate savings metrics for system-wide analytics.
+        Flip the still-pending markings in ``marking_ids`` to PAID in one UPDATE.
 
-        Returns:
-            Dict[str, object]: {
-                "total_accounts": int,
-                "accounts_by_type": Dict[str, int],
-                "total_volume": Decimal,
-                "volume_by_status": Dict[str, Decimal]
-            }
+        Returns ``(id, savings_account_id, marked_date, amount)`` for every row
+        actually updated, so markings already paid elsewhere are skipped.
         """
-        total_accounts = self.db.query(func.count(SavingsAccount.id)).scalar() or 0
-
-        accounts_by_type_rows = (
-            self.db.query(SavingsAccount.savings_type, func.count(SavingsAccount.id))
-            .group_by(SavingsAccount.savings_type)
-            .all()
-        )
-        accounts_by_type = {
-            getattr(savings_type, "value", savings_type): count
-            for savings_type, count in accounts_by_type_rows
+        if not marking_ids:
+            return []
+        values = {
+            "status": SavingsStatus.PAID,
+            "payment_reference": reference,
+            "updated_at": datetime.utcnow(),
         }
-
-        total_volume = (
-            self.db.query(func.coalesce(func.sum(SavingsMarking.amount), 0))
-            .scalar()
-            or Decimal("0")
+        if marked_by_id is not None:
+            values["marked_by_id"] = marked_by_id
+        stmt = (
+            update(SavingsMarking)
+            .where(
+                SavingsMarking.id == any_(literal(list(marking_ids), ARRAY(Integer))),
+                SavingsMarking.status == SavingsStatus.PENDING,
+            )
+            .values(**values)
+            .returning(
+                SavingsMarking.id,
+                SavingsMarking.savings_account_id,
+                SavingsMarking.marked_date,
+                SavingsMarking.amount,
+            )
+            .execution_options(synchronize_session=False)
         )
+        return self.db.execute(stmt).all()
 
-        status_volume_rows = (
+    def get_accounts_with_pending_counts(self, account_ids: List[int]) -> List[Tuple]:
+        """Accounts in ``account_ids`` with their remaining pending marking count."""
+        if not account_ids:
+            return []
+        pending = func.count(SavingsMarking.id).filter(SavingsMarking.status == SavingsStatus.PENDING)
+        return (
             self.db.query(
-                SavingsMarking.status,
-                func.coalesce(func.sum(SavingsMarking.amount), 0),
+                SavingsAccount.id,
+                SavingsAccount.tracking_number,
+                SavingsAccount.marking_status,
+                SavingsAccount.start_date,
+                SavingsAccount.duration_months,
+                SavingsAccount.commission_days,
+                SavingsAccount.commission_amount,
+                pending.label("pending_count"),
             )
-            .group_by(SavingsMarking.status)
+            .outerjoin(SavingsMarking, SavingsMarking.savings_account_id == SavingsAccount.id)
+            .filter(SavingsAccount.id.in_(account_ids))
+            .group_by(SavingsAccount.id)
             .all()
         )
-        volume_by_status = {
-            getattr(status, "value", status): volume
-            for status, volume in status_volume_rows
-        }
 
-        return {
-            "total_accounts": total_accounts,
-            "accounts_by_type": accounts_by_type,
-            "total_volume": Decimal(total_volume)
-            if not isinstance(total_volume, Decimal)
-            else total_volume,
-            "volume_by_status": {
-                key: Decimal(value) if not isinstance(value, Decimal) else value
-                for key, value in volume_by_status.items()
-            },
-        }
+    def mark_accounts_completed(self, account_ids: List[int]) -> None:
+        """Set ``marking_status`` to COMPLETED for every account in one UPDATE."""
+        if not account_ids:
+            return
+        self.db.execute(
+            update(SavingsAccount)
+            .where(SavingsAccount.id.in_(account_ids))
+            .values(marking_status=MarkingStatus.COMPLETED)
+            .execution_options(synchronize_session=False)
+        )
 
-    def get_successful_transfer_metrics(self) -> Dict[str, float]:
-        """Return count and amount of savings markings settled via transfers."""
-        transfer_methods = {"transfer", "bank_transfer", "bank-transfer"}
+    # -------------------------------------------------------------------------
+    # Customer contribution and payout helpers
+    # -------------------------------------------------------------------------
 
-        count_amount = (
-            self.db.query(
-                func.count(SavingsMarking.id),
-                func.coalesce(func.sum(SavingsMarking.amount), 0),
-            )
+    def sum_paid_by_customer(
+        self,
+        customer_id: int,
+        *,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+    ) -> Decimal:
+        """Total of a customer's paid markings, optionally within a marked-date range."""
+        query = (
+            self.db.query(func.coalesce(func.sum(SavingsMarking.amount), 0))
+            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
             .filter(
-                SavingsMarking.status == "paid",
-                SavingsMarking.payment_method.in_(transfer_methods),
+                SavingsAccount.customer_id == customer_id,
+                SavingsMarking.status == SavingsStatus.PAID,
             )
-            .first()
         )
+        if from_date:
+            query = query.filter(SavingsMarking.marked_date >= from_date)
+        if to_date:
+            query = query.filter(SavingsMarking.marked_date <= to_date)
+        return Decimal(query.scalar() or 0)
 
-        if not count_amount:
-            return {"count": 0, "amount": 0.0}
-
-        count, amount = count_amount
-        return {
-            "count": int(count or 0),
-            "amount": float(Decimal(amount or 0)),
-        }
-
-    def get_monthly_transfer_volume(self, months: int = 6) -> List[Dict[str, float]]:
-        """Return monthly sums for successful transfer markings."""
-        if months <= 0:
-            return []
-
-        transfer_methods = {"transfer", "bank_transfer", "bank-transfer"}
-        month_alias = func.date_trunc("month", SavingsMarking.marked_date)
-
-        rows = (
+    def get_completed_payout_inputs(self, customer_id: int) -> List[Tuple]:
+        """
+        ``(paid_total, first_paid_date, last_paid_date, commission_amount,
+        commission_days)`` for each completed account of a customer that has
+        paid markings, aggregated in one grouped query.
+        """
+        return (
             self.db.query(
-                month_alias.label("month"),
-                func.coalesce(func.sum(SavingsMarking.amount), 0).label("amount"),
+                func.sum(SavingsMarking.amount),
+                func.min(SavingsMarking.marked_date),
+                func.max(SavingsMarking.marked_date),
+                SavingsAccount.commission_amount,
+                SavingsAccount.commission_days,
             )
+            .join(SavingsMarking, SavingsMarking.savings_account_id == SavingsAccount.id)
             .filter(
-                SavingsMarking.status == "paid",
-                SavingsMarking.payment_method.in_(transfer_methods),
-                SavingsMarking.marked_date.isnot(None),
+                SavingsAccount.customer_id == customer_id,
+                SavingsAccount.marking_status == MarkingStatus.COMPLETED,
+                SavingsMarking.status == SavingsStatus.PAID,
             )
-            .group_by("month")
-            .order_by(month_alias.desc())
-            .limit(months)
+            .group_by(SavingsAccount.id)
             .all()
         )
 
-        formatted: List[Dict[str, float]] = []
-        for month, amount in reversed(rows):
-            label = month.strftime("%b %Y") if month else "Unknown"
-            formatted.append({"label": label, "value": float(Decimal(amount or 0))})
-        return formatted
-    
+    # -------------------------------------------------------------------------
+    # Analytics helpers
+    # -------------------------------------------------------------------------
 
     def get_system_savings_metrics(self) -> Dict[str, object]:
         """
         Compute aggregate savings metrics for system-wide analytics.
 
+        Marking volumes come from the daily savings facts, so the cost grows
+        with the number of days rather than the number of markings.
+
         Returns:
             Dict[str, object]: {
                 "total_accounts": int,
@@ -237,8 +265,6 @@ class SavingsRepository:
                 "volume_by_status": Dict[str, Decimal]
             }
         """
-        total_accounts = self.db.query(func.count(SavingsAccount.id)).scalar() or 0
-
         accounts_by_type_rows = (
             self.db.query(SavingsAccount.savings_type, func.count(SavingsAccount.id))
             .group_by(SavingsAccount.savings_type)
@@ -249,57 +275,39 @@ class SavingsRepository:
             for savings_type, count in accounts_by_type_rows
         }
 
-        total_volume = (
-            self.db.query(func.coalesce(func.sum(SavingsMarking.amount), 0))
-            .scalar()
-            or Decimal("0")
-        )
-
         status_volume_rows = (
             self.db.query(
-                SavingsMarking.status,
-                func.coalesce(func.sum(SavingsMarking.amount), 0),
+                DailySavingsFact.status,
+                func.coalesce(func.sum(DailySavingsFact.amount), 0),
             )
-            .group_by(SavingsMarking.status)
+            .group_by(DailySavingsFact.status)
             .all()
         )
-        volume_by_status = {
-            getattr(status, "value", status): volume
-            for status, volume in status_volume_rows
-        }
+        volume_by_status = {status: Decimal(volume) for status, volume in status_volume_rows}
 
         return {
-            "total_accounts": total_accounts,
+            "total_accounts": sum(accounts_by_type.values()),
             "accounts_by_type": accounts_by_type,
-            "total_volume": Decimal(total_volume)
-            if not isinstance(total_volume, Decimal)
-            else total_volume,
-            "volume_by_status": {
-                key: Decimal(value) if not isinstance(value, Decimal) else value
-                for key, value in volume_by_status.items()
-            },
+            "total_volume": sum(volume_by_status.values(), Decimal("0")),
+            "volume_by_status": volume_by_status,
         }
 
+    def _successful_transfer_facts(self):
+        return self.db.query(DailySavingsFact).filter(
+            DailySavingsFact.status == SavingsStatus.PAID.value,
+            DailySavingsFact.payment_method == PaymentMethod.BANK_TRANSFER.value,
+        )
+
     def get_successful_transfer_metrics(self) -> Dict[str, float]:
         """Return count and amount of savings markings settled via transfers."""
-        transfer_methods = {"transfer", "bank_transfer", "bank-transfer"}
-
-        count_amount = (
-            self.db.query(
-                func.count(SavingsMarking.id),
-                func.coalesce(func.sum(SavingsMarking.amount), 0),
-            )
-            .filter(
-                SavingsMarking.status == "paid",
-                SavingsMarking.payment_method.in_(transfer_methods),
+        count, amount = (
+            self._successful_transfer_facts()
+            .with_entities(
+                func.coalesce(func.sum(DailySavingsFact.marking_count), 0),
+                func.coalesce(func.sum(DailySavingsFact.amount), 0),
             )
-            .first()
+            .one()
         )
-
-        if not count_amount:
-            return {"count": 0, "amount": 0.0}
-
-        count, amount = count_amount
         return {
             "count": int(count or 0),
             "amount": float(Decimal(amount or 0)),
@@ -310,18 +318,12 @@ class SavingsRepository:
         if months <= 0:
             return []
 
-        transfer_methods = {"transfer", "bank_transfer", "bank-transfer"}
-        month_alias = func.date_trunc("month", SavingsMarking.marked_date)
-
+        month_alias = func.date_trunc("month", DailySavingsFact.day)
         rows = (
-            self.db.query(
+            self._successful_transfer_facts()
+            .with_entities(
                 month_alias.label("month"),
-                func.coalesce(func.sum(SavingsMarking.amount), 0).label("amount"),
-            )
-            .filter(
-                SavingsMarking.status == "paid",
-                SavingsMarking.payment_method.in_(transfer_methods),
-                SavingsMarking.marked_date.isnot(None),
+                func.coalesce(func.sum(DailySavingsFact.amount), 0).label("amount"),
             )
             .group_by("month")
             .order_by(month_alias.desc())
@@ -335,48 +337,55 @@ class SavingsRepository:
             formatted.append({"label": label, "value": float(Decimal(amount or 0))})
         return formatted
 
-    # NEW: Group Metrics Helpers
-  # 1. get_total_scheduled_dates_for_group
-    def get_total_scheduled_dates_for_group(self, group_id: int) -> int:
-        subq = (
-            self.db.query(SavingsAccount.id)
-            .filter(SavingsAccount.group_id == group_id)
-            .subquery()
-        )
-        return (
-            self.db.query(func.count(distinct(SavingsMarking.marked_date)))
-            .filter(SavingsMarking.savings_account_id.in_(subq))
-            .scalar() or 0
-        )
+    # -------------------------------------------------------------------------
+    # Export helpers
+    # -------------------------------------------------------------------------
 
-    # 2. get_total_contributed_for_group
-    def get_total_contributed_for_group(self, group_id: int) -> Decimal:
-        subq = (
-            self.db.query(SavingsAccount.id)
-            .filter(SavingsAccount.group_id == group_id)
-            .subquery()
-        )
-        return (
-            self.db.query(func.coalesce(func.sum(SavingsMarking.amount), Decimal("0")))
-            .filter(
-                SavingsMarking.savings_account_id.in_(subq),
-                SavingsMarking.status == SavingsStatus.PAID
-            )
-            .scalar() or Decimal("0")
-        )
+    def stream_markings(
+        self,
+        *,
+        batch_size: int,
+        customer_id: Optional[int] = None,
+        business_id: Optional[int] = None,
+        tracking_number: Optional[str] = None,
+        status: Optional[SavingsStatus] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+    ) -> Iterator[Row]:
+        """
+        Yield ``MARKING_EXPORT_COLUMNS`` for the matching markings through a
+        server-side cursor fetching ``batch_size`` rows at a time.
 
-    # 3. get_unique_paid_dates_count_for_group
-    def get_unique_paid_dates_count_for_group(self, group_id: int) -> int:
-        subq = (
-            self.db.query(SavingsAccount.id)
-            .filter(SavingsAccount.group_id == group_id)
-            .subquery()
-        )
-        return (
-            self.db.query(func.count(distinct(SavingsMarking.marked_date)))
-            .filter(
-                SavingsMarking.savings_account_id.in_(subq),
-                SavingsMarking.status == SavingsStatus.PAID
+        Rows come in (account, marked date) order, which the
+        (savings_account_id, marked_date) index returns without a sort.
+        """
+        stmt = (
+            select(
+                SavingsMarking.id,
+                SavingsAccount.tracking_number,
+                SavingsAccount.business_id,
+                SavingsAccount.customer_id,
+                SavingsMarking.unit_id,
+                SavingsMarking.marked_date,
+                SavingsMarking.amount,
+                SavingsMarking.status,
+                SavingsMarking.payment_method,
+                SavingsMarking.payment_reference,
             )
-            .scalar() or 0
-        )
\ No newline at end of file
+            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
+            .order_by(SavingsMarking.savings_account_id, SavingsMarking.marked_date, SavingsMarking.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if customer_id is not None:
+            stmt = stmt.where(SavingsAccount.customer_id == customer_id)
+        if business_id is not None:
+            stmt = stmt.where(SavingsAccount.business_id == business_id)
+        if tracking_number:
+            stmt = stmt.where(SavingsAccount.tracking_number == tracking_number)
+        if status is not None:
+            stmt = stmt.where(SavingsMarking.status == status)
+        if from_date:
+            stmt = stmt.where(SavingsMarking.marked_date >= from_date)
+        if to_date:
+            stmt = stmt.where(SavingsMarking.marked_date <= to_date)
+        yield from self.db.execute(stmt)
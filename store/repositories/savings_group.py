@@ -1,12 +1,14 @@
-from typing import List, Optional, Tuple
-from sqlalchemy import or_, func
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import or_, func, insert
 from sqlalchemy.orm import Session
-from models.savings_group import SavingsGroup, GroupFrequency
+from models.savings_group import SavingsGroup
+from models.rollups import SavingsGroupRollup
 from models.savings import SavingsAccount, SavingsType, SavingsMarking, SavingsStatus
 from models.business import Unit
 from models.user_business import user_business
 from store.repositories.base import BaseRepository
-from datetime import date
+from utils.group_calendar import GroupCalendar
+from datetime import date, datetime, timezone
 from decimal import Decimal
 from dateutil.relativedelta import relativedelta
 
@@ -88,17 +90,11 @@ class SavingsGroupRepository(BaseRepository[SavingsGroup]):
         start_date: date,
         unit_id: Optional[int] = None,
     ) -> SavingsAccount:
-        duration_months = 12
-        if group.end_date:
-            delta = group.end_date - group.start_date
-            duration_months = max(1, delta.days // 30)
+        duration_months = self._group_duration_months(group)
 
         # Ensure unit_id is set (Cooperative is not unit-based, but DB requires it)
         if unit_id is None:
-            # Try to get first unit for business as default
-            unit = self.db.query(Unit).filter(Unit.business_id == group.business_id).first()
-            if unit:
-                unit_id = unit.id
+            unit_id = self._default_unit_id(group.business_id)
 
         account = SavingsAccount(
             customer_id=user_id,
@@ -119,34 +115,21 @@ class SavingsGroupRepository(BaseRepository[SavingsGroup]):
         self.db.commit()
         self.db.refresh(account)
 
-        current_date = start_date
         # If no end date, default to duration months
         end_date = group.end_date
         if not end_date:
              end_date = start_date + relativedelta(months=duration_months)
 
-        markings = []
-        
-        while current_date <= end_date:
-            marking = SavingsMarking(
+        markings = [
+            SavingsMarking(
                 savings_account_id=account.id,
                 unit_id=unit_id, 
-                marked_date=current_date,
+                marked_date=marked_date,
                 amount=group.contribution_amount,
                 status=SavingsStatus.PENDING,
             )
-            markings.append(marking)
-
-            if group.frequency == GroupFrequency.WEEKLY:
-                current_date += relativedelta(weeks=1)
-            elif group.frequency == GroupFrequency.BI_WEEKLY:
-                current_date += relativedelta(weeks=2)
-            elif group.frequency == GroupFrequency.MONTHLY:
-                current_date += relativedelta(months=1)
-            elif group.frequency == GroupFrequency.QUARTERLY:
-                current_date += relativedelta(months=3)
-            else:
-                current_date += relativedelta(months=1)
+            for marked_date in GroupCalendar(start_date, group.frequency, end_date).dates()
+        ]
         
         if markings:
             self.db.add_all(markings)
@@ -154,6 +137,115 @@ class SavingsGroupRepository(BaseRepository[SavingsGroup]):
 
         return account
 
+    @staticmethod
+    def _group_duration_months(group: SavingsGroup) -> int:
+        if group.end_date:
+            return max(1, (group.end_date - group.start_date).days // 30)
+        return 12
+
+    def _default_unit_id(self, business_id: int) -> Optional[int]:
+        # Try to get first unit for business as default
+        return (
+            self.db.query(Unit.id)
+            .filter(Unit.business_id == business_id)
+            .order_by(Unit.id)
+            .limit(1)
+            .scalar()
+        )
+
+    def get_member_user_ids(self, group_id: int, user_ids: List[int]) -> set:
+        """Subset of ``user_ids`` that already have an account in the group."""
+        if not user_ids:
+            return set()
+        rows = (
+            self.db.query(SavingsAccount.customer_id)
+            .filter(SavingsAccount.group_id == group_id, SavingsAccount.customer_id.in_(user_ids))
+            .all()
+        )
+        return {customer_id for (customer_id,) in rows}
+
+    def add_members_bulk(
+        self,
+        group: SavingsGroup,
+        members: List[Tuple[int, str, date]],
+        *,
+        created_by: Optional[int] = None,
+        unit_id: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Enroll several members at once.
+
+        ``members`` is a list of ``(user_id, tracking_number, start_date)``.
+        Accounts go in with one multi-row INSERT ... RETURNING and every
+        contribution schedule with a second INSERT; the caller owns the
+        transaction (nothing is committed here).
+        """
+        if not members:
+            return []
+
+        duration_months = self._group_duration_months(group)
+        if unit_id is None:
+            unit_id = self._default_unit_id(group.business_id)
+        now = datetime.now(timezone.utc)
+
+        account_rows = [
+            {
+                "customer_id": user_id,
+                "business_id": group.business_id,
+                "unit_id": unit_id,
+                "group_id": group.id,
+                "tracking_number": tracking_number,
+                "savings_type": SavingsType.COOPERATIVE,
+                "daily_amount": group.contribution_amount,
+                "duration_months": duration_months,
+                "start_date": start_date,
+                "target_amount": Decimal("0"),
+                "commission_amount": Decimal("0"),
+                "commission_days": 0,
+                "marking_status": "not_started",
+                "created_by": created_by,
+                "created_at": now,
+            }
+            for user_id, tracking_number, start_date in members
+        ]
+        inserted = self.db.execute(
+            insert(SavingsAccount)
+            .values(account_rows)
+            .returning(SavingsAccount.id, SavingsAccount.customer_id, SavingsAccount.tracking_number)
+        ).all()
+        account_ids = {row.customer_id: row.id for row in inserted}
+
+        # Members joining on the same day share a schedule, so build each calendar once
+        schedules: Dict[date, List[date]] = {}
+        marking_rows = []
+        for user_id, _, start_date in members:
+            if start_date not in schedules:
+                end_date = group.end_date or start_date + relativedelta(months=duration_months)
+                schedules[start_date] = GroupCalendar(start_date, group.frequency, end_date).dates()
+            marking_rows.extend(
+                {
+                    "savings_account_id": account_ids[user_id],
+                    "unit_id": unit_id,
+                    "marked_date": marked_date,
+                    "amount": group.contribution_amount,
+                    "status": SavingsStatus.PENDING,
+                    "created_by": created_by,
+                    "created_at": now,
+                }
+                for marked_date in schedules[start_date]
+            )
+        if marking_rows:
+            self.db.execute(insert(SavingsMarking), marking_rows)
+
+        return [
+            {
+                "user_id": row.customer_id,
+                "savings_account_id": row.id,
+                "tracking_number": row.tracking_number,
+            }
+            for row in inserted
+        ]
+
     def delete_group(self, group_id: int) -> bool:
         group = self.get_active_group(group_id)
         if not group:
@@ -206,6 +298,17 @@ class SavingsGroupRepository(BaseRepository[SavingsGroup]):
             SavingsAccount.customer_id == user_id
         ).first()
     
+    def get_member_accounts_for_groups(self, group_ids: List[int], user_id: int) -> Dict[int, Tuple[int, str]]:
+        """Map group id -> (savings_account_id, tracking_number) for the user's memberships among ``group_ids``."""
+        if not group_ids:
+            return {}
+        rows = (
+            self.db.query(SavingsAccount.group_id, SavingsAccount.id, SavingsAccount.tracking_number)
+            .filter(SavingsAccount.group_id.in_(group_ids), SavingsAccount.customer_id == user_id)
+            .all()
+        )
+        return {group_id: (account_id, tracking_number) for group_id, account_id, tracking_number in rows}
+
     def member_exists_in_group(self, group_id: int, user_id: int) -> bool:
         return (
             self.db.query(SavingsAccount).filter(
@@ -218,19 +321,22 @@ class SavingsGroupRepository(BaseRepository[SavingsGroup]):
         return self.db.query(SavingsAccount).filter(SavingsAccount.group_id == group_id).all()
 
     def get_business_cooperative_summary(self, business_id: int) -> dict:
-        """Aggregate cooperative stats for a business: groups, members, collected amounts."""
-        from models.savings import SavingsStatus
-
-        total_active_groups = (
-            self.db.query(func.count(SavingsGroup.id))
-            .filter(SavingsGroup.business_id == business_id, SavingsGroup.is_active == 1)
-            .scalar() or 0
-        )
-
-        total_inactive_groups = (
-            self.db.query(func.count(SavingsGroup.id))
-            .filter(SavingsGroup.business_id == business_id, SavingsGroup.is_active == 0)
-            .scalar() or 0
+        """
+        Aggregate cooperative stats for a business: groups, members, collected amounts.
+
+        Amounts come from the per-group rollups, so the cost depends on the
+        number of groups rather than on every member-period ever scheduled.
+        """
+        active_groups, inactive_groups, total_target, total_collected = (
+            self.db.query(
+                func.count().filter(SavingsGroup.is_active == 1),
+                func.count().filter(SavingsGroup.is_active == 0),
+                func.coalesce(func.sum(SavingsGroupRollup.target_total), Decimal("0")),
+                func.coalesce(func.sum(SavingsGroupRollup.collected_total), Decimal("0")),
+            )
+            .outerjoin(SavingsGroupRollup, SavingsGroupRollup.group_id == SavingsGroup.id)
+            .filter(SavingsGroup.business_id == business_id)
+            .one()
         )
 
         # All users associated with this business (all roles — agent, customer, cooperative_member, etc.)
@@ -240,36 +346,15 @@ class SavingsGroupRepository(BaseRepository[SavingsGroup]):
             .scalar() or 0
         )
 
-        # Total paid (collected) across all markings for all groups in this business
-        total_collected = (
-            self.db.query(func.coalesce(func.sum(SavingsMarking.amount), Decimal("0")))
-            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
-            .join(SavingsGroup, SavingsGroup.id == SavingsAccount.group_id)
-            .filter(
-                SavingsGroup.business_id == business_id,
-                SavingsMarking.status == SavingsStatus.PAID,
-            )
-            .scalar() or Decimal("0")
-        )
-
-        # Total expected (all markings regardless of status) — pre-seeded when member joins
-        total_target = (
-            self.db.query(func.coalesce(func.sum(SavingsMarking.amount), Decimal("0")))
-            .join(SavingsAccount, SavingsAccount.id == SavingsMarking.savings_account_id)
-            .join(SavingsGroup, SavingsGroup.id == SavingsAccount.group_id)
-            .filter(SavingsGroup.business_id == business_id)
-            .scalar() or Decimal("0")
-        )
-
         progress_pct = (
             float(total_collected) / float(total_target) * 100
             if total_target > 0 else 0.0
         )
 
         return {
-            "total_active_groups": total_active_groups,
-            "total_inactive_groups": total_inactive_groups,
-            "total_groups": total_active_groups + total_inactive_groups,
+            "total_active_groups": active_groups,
+            "total_inactive_groups": inactive_groups,
+            "total_groups": active_groups + inactive_groups,
             "total_members": total_members,
             "total_collected": float(total_collected),
             "total_target": float(total_target),
@@ -0,0 +1,170 @@
+"""
+Search repository for the universal search endpoint.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import String, cast, exists, func, literal, or_, select, union, union_all
+from sqlalchemy.orm import Session
+
+from models.business import Business
+from models.payments import PaymentRequest
+from models.savings import SavingsAccount
+from models.user import User
+from models.user_business import user_business
+
+SEARCH_GROUPS = ("businesses", "users", "savings", "payments")
+# Newest matches ranked per group. Bounds the similarity() work for common
+# terms ("a", a popular first name) that match a large share of a table.
+SEARCH_CANDIDATE_LIMIT = 200
+
+
+def _matches(term: str, *columns):
+    """Substring match on ``lower(column)``; served by the pg_trgm GIN indexes."""
+    return or_(*[func.lower(column).contains(term, autoescape=True) for column in columns])
+
+
+def _score(term: str, *columns):
+    """Best trigram similarity of ``term`` to any of ``columns``."""
+    return func.greatest(*[func.similarity(func.lower(column), term) for column in columns])
+
+
+class SearchRepository:
+    """Repository for role-scoped search across users, businesses, savings and payments"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _businesses(self, term: str, business_ids: Optional[Sequence[int]]):
+        columns = (Business.name, Business.unique_code, Business.address)
+        query = select(
+            literal("businesses").label("group"),
+            _score(term, *columns).label("score"),
+            Business.created_at.label("created_at"),
+            func.json_build_object(
+                "id", Business.id,
+                "name", Business.name,
+                "unique_code", Business.unique_code,
+                "address", Business.address,
+            ).label("item"),
+        ).where(_matches(term, *columns))
+        if business_ids is not None:
+            query = query.where(Business.id.in_(business_ids))
+        return query
+
+    def _users(self, term: str, business_ids: Optional[Sequence[int]]):
+        columns = (User.full_name, User.email, User.phone_number, User.username)
+        query = select(
+            literal("users").label("group"),
+            _score(term, *columns).label("score"),
+            User.created_at.label("created_at"),
+            func.json_build_object(
+                "id", User.id,
+                "full_name", User.full_name,
+                "email", User.email,
+                "phone_number", User.phone_number,
+                "role", cast(User.role, String),
+            ).label("item"),
+        ).where(_matches(term, *columns))
+        if business_ids is not None:
+            query = query.where(
+                exists().where(
+                    user_business.c.user_id == User.id,
+                    user_business.c.business_id.in_(business_ids),
+                )
+            )
+        return query
+
+    def _savings(self, term: str, business_ids: Optional[Sequence[int]]):
+        query = select(
+            literal("savings").label("group"),
+            _score(term, SavingsAccount.tracking_number).label("score"),
+            SavingsAccount.created_at.label("created_at"),
+            func.json_build_object(
+                "id", SavingsAccount.id,
+                "tracking_number", SavingsAccount.tracking_number,
+                "business_id", SavingsAccount.business_id,
+                "customer_id", SavingsAccount.customer_id,
+                "savings_type", cast(SavingsAccount.savings_type, String),
+            ).label("item"),
+        ).where(_matches(term, SavingsAccount.tracking_number))
+        if business_ids is not None:
+            query = query.where(SavingsAccount.business_id.in_(business_ids))
+        return query
+
+    def _payments(self, term: str, business_ids: Optional[Sequence[int]]):
+        # Match the reference and the account's tracking number separately so
+        # each side can use its own index, instead of an OR across the join.
+        matched = union(
+            select(PaymentRequest.id).where(_matches(term, PaymentRequest.reference)),
+            select(PaymentRequest.id)
+            .join(SavingsAccount, SavingsAccount.id == PaymentRequest.savings_account_id)
+            .where(_matches(term, SavingsAccount.tracking_number)),
+        )
+        query = (
+            select(
+                literal("payments").label("group"),
+                _score(term, PaymentRequest.reference, SavingsAccount.tracking_number).label("score"),
+                PaymentRequest.request_date.label("created_at"),
+                func.json_build_object(
+                    "id", PaymentRequest.id,
+                    "reference", PaymentRequest.reference,
+                    "status", cast(PaymentRequest.status, String),
+                    "amount", PaymentRequest.amount,
+                    "business_id", SavingsAccount.business_id,
+                    "tracking_number", SavingsAccount.tracking_number,
+                ).label("item"),
+            )
+            .join(SavingsAccount, SavingsAccount.id == PaymentRequest.savings_account_id)
+            .where(PaymentRequest.id.in_(matched))
+        )
+        if business_ids is not None:
+            query = query.where(SavingsAccount.business_id.in_(business_ids))
+        return query
+
+    def search(
+        self,
+        term: str,
+        *,
+        limit: int,
+        business_ids: Optional[Sequence[int]] = None,
+    ) -> Dict[str, List[Dict[str, object]]]:
+        """
+        Search every group in one round-trip.
+
+        Each group takes its ``SEARCH_CANDIDATE_LIMIT`` newest matches, ranks
+        them by trigram similarity (newest first on ties) and keeps ``limit``
+        before the groups are combined with UNION ALL. Terms matching fewer
+        rows than the cap are ranked over every match.
+        ``business_ids`` limits results to those businesses; None means all.
+        """
+        results: Dict[str, List[Dict[str, object]]] = {group: [] for group in SEARCH_GROUPS}
+        if business_ids is not None and not business_ids:
+            return results
+
+        term = term.lower()
+        groups = []
+        for build in (self._businesses, self._users, self._savings, self._payments):
+            matches = build(term, business_ids)
+            candidates = (
+                matches.order_by(matches.selected_columns.created_at.desc().nulls_last())
+                .limit(SEARCH_CANDIDATE_LIMIT)
+                .subquery()
+            )
+            groups.append(
+                select(candidates)
+                .order_by(candidates.c.score.desc(), candidates.c.created_at.desc().nulls_last())
+                .limit(limit)
+                .subquery()
+            )
+
+        combined = union_all(*[select(group) for group in groups]).subquery()
+        rows = self.db.execute(
+            select(combined.c.group, combined.c.item).order_by(
+                combined.c.group, combined.c.score.desc(), combined.c.created_at.desc().nulls_last()
+            )
+        )
+        for group, item in rows:
+            results[group].append(item)
+        return results
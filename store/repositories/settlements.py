@@ -0,0 +1,85 @@
+"""
+Settlement repository for the Paystack payment settlement queue.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models.savings import PaymentSettlementEvent, SettlementEventStatus
+
+MAX_SETTLEMENT_ATTEMPTS = 5
+
+
+class SettlementRepository:
+    """Repository for queued payment settlement events"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(
+        self,
+        *,
+        reference: str,
+        event: str,
+        amount: int,
+        paid_at: Optional[datetime] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Queue an event; returns False if this (reference, event) was already queued."""
+        stmt = (
+            pg_insert(PaymentSettlementEvent)
+            .values(
+                reference=reference,
+                event=event,
+                amount=amount,
+                paid_at=paid_at,
+                payload=payload,
+                status=SettlementEventStatus.PENDING.value,
+                attempts=0,
+                received_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=["reference", "event"])
+        )
+        return self.db.execute(stmt).rowcount > 0
+
+    def claim_pending(self, limit: int = 100, reference: Optional[str] = None) -> List[PaymentSettlementEvent]:
+        """
+        Lock up to ``limit`` pending events, oldest first.
+
+        ``SKIP LOCKED`` lets several settlers (or a verify request racing the
+        background job) share the queue without applying an event twice.
+        """
+        query = self.db.query(PaymentSettlementEvent).filter(
+            PaymentSettlementEvent.status == SettlementEventStatus.PENDING.value,
+            PaymentSettlementEvent.attempts < MAX_SETTLEMENT_ATTEMPTS,
+        )
+        if reference is not None:
+            query = query.filter(PaymentSettlementEvent.reference == reference)
+        return (
+            query.order_by(PaymentSettlementEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def has_event(self, reference: str) -> bool:
+        return (
+            self.db.query(PaymentSettlementEvent.id)
+            .filter(PaymentSettlementEvent.reference == reference)
+            .first()
+            is not None
+        )
+
+    def mark(
+        self,
+        event: PaymentSettlementEvent,
+        status: SettlementEventStatus,
+        error: Optional[str] = None,
+    ) -> None:
+        event.attempts = (event.attempts or 0) + 1
+        event.status = status.value
+        event.last_error = error
+        if status != SettlementEventStatus.PENDING:
+            event.processed_at = datetime.utcnow()
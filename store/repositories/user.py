@@ -4,11 +4,12 @@ User repository for user-related database operations.
 from typing import Optional, List, Tuple, Dict
 from datetime import datetime, timezone
 
-from sqlalchemy import select, func, exists, and_
+from sqlalchemy import select, func, exists, and_, or_
 from sqlalchemy.orm import Session, joinedload
 
 from models.user import User, user_permissions
 from models.business import Business
+from models.rollups import DailySignupFact
 from models.user_business import user_business
 from models.savings import SavingsAccount, SavingsMarking
 from store.repositories.base import BaseRepository
@@ -36,7 +37,14 @@ class UserRepository(BaseRepository[User]):
     def get_by_role(self, role: Role, skip: int = 0, limit: int = 100) -> List[User]:
         """Get all users by role"""
         return self.db.query(User).filter(User.role == role).offset(skip).limit(limit).all()
-    
+
+    def get_roles_by_ids(self, user_ids: List[int]) -> Dict[int, str]:
+        """Map user id -> role for the given ids; unknown ids are omitted."""
+        if not user_ids:
+            return {}
+        rows = self.db.query(User.id, User.role).filter(User.id.in_(user_ids)).all()
+        return {user_id: role for user_id, role in rows}
+
     def get_by_business_id(self, business_id: int, skip: int = 0, limit: int = 100) -> List[User]:
         """Get all users in a business"""
         return (
@@ -446,18 +454,17 @@ class UserRepository(BaseRepository[User]):
             if business_id is not None
         }
 
-    def get_monthly_user_growth(self, months: int = 6) -> List[Dict[str, int]]:
-        """Return the number of users created per month for the last N months."""
+    def _monthly_signup_counts(self, months: int) -> List[Dict[str, int]]:
+        """Signups per month for the last ``months`` months with any, from the daily signup facts."""
         if months <= 0:
             return []
 
-        month_alias = func.date_trunc("month", User.created_at)
+        month_alias = func.date_trunc("month", DailySignupFact.day)
         rows = (
             self.db.query(
                 month_alias.label("month"),
-                func.count(User.id).label("count"),
+                func.sum(DailySignupFact.signup_count).label("count"),
             )
-            .filter(User.created_at.isnot(None))
             .group_by("month")
             .order_by(month_alias.desc())
             .limit(months)
@@ -470,27 +477,10 @@ class UserRepository(BaseRepository[User]):
             results.append({"label": label, "value": int(count or 0)})
         return results
 
+    def get_monthly_user_growth(self, months: int = 6) -> List[Dict[str, int]]:
+        """Return the number of users created per month for the last N months."""
+        return self._monthly_signup_counts(months)
+
     def get_monthly_signups(self, months: int = 6) -> List[Dict[str, int]]:
         """Return signup counts for the most recent `months` months (chronological)."""
-        if months <= 0:
-            return []
-
-        month_alias = func.date_trunc("month", User.created_at)
-        results = (
-            self.db.query(
-                month_alias.label("month"),
-                func.count(User.id).label("count"),
-            )
-            .filter(User.created_at.isnot(None))
-            .group_by("month")
-            .order_by(month_alias.desc())
-            .limit(months)
-            .all()
-        )
-
-        formatted: List[Dict[str, int]] = []
-        for month, count in reversed(results):
-            label = month.strftime("%b %Y") if month else "Unknown"
-            formatted.append({"label": label, "value": int(count or 0)})
-        return formatted
-
+        return self._monthly_signup_counts(months)
@@ -0,0 +1,88 @@
+"""
+GroupCalendar must agree with the schedule the app stored before it existed:
+the start date stepped one ``relativedelta`` at a time.
+"""
+from datetime import date, timedelta
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from models.savings_group import GroupFrequency
+from utils.group_calendar import GroupCalendar
+
+STEPS = {
+    GroupFrequency.WEEKLY: relativedelta(weeks=1),
+    GroupFrequency.BI_WEEKLY: relativedelta(weeks=2),
+    GroupFrequency.MONTHLY: relativedelta(months=1),
+    GroupFrequency.QUARTERLY: relativedelta(months=3),
+}
+
+STARTS = [
+    date(2024, 1, 15),
+    date(2024, 1, 31),  # clamps to Feb 29, then stays on the 29th
+    date(2023, 1, 31),  # clamps to Feb 28
+    date(2024, 2, 29),  # leap day
+    date(2023, 3, 30),
+    date(2024, 8, 31),
+    date(2023, 11, 30),
+    date(2024, 12, 31),
+]
+
+
+def stepped(start: date, frequency: GroupFrequency, end: date):
+    """Reference schedule: one relativedelta step at a time."""
+    dates, current = [], start
+    while current <= end:
+        dates.append(current)
+        current = current + STEPS[frequency]
+    return dates
+
+
+@pytest.fixture(params=[(s, f) for s in STARTS for f in GroupFrequency], ids=lambda p: f"{p[0]}-{p[1].value}")
+def schedule(request):
+    start, frequency = request.param
+    end = start + timedelta(days=5 * 366)
+    return GroupCalendar(start, frequency, end), stepped(start, frequency, end)
+
+
+def test_dates_match_stepping(schedule):
+    calendar, expected = schedule
+    assert calendar.dates() == expected
+    assert [calendar.nth(n) for n in range(len(expected))] == expected
+
+
+def test_dates_pages_match_stepping(schedule):
+    calendar, expected = schedule
+    for offset in (0, 1, 5, 13, len(expected) - 2):
+        assert calendar.dates(offset=offset, limit=7) == expected[offset:offset + 7]
+
+
+def test_count_matches_stepping(schedule):
+    calendar, expected = schedule
+    assert calendar.count() == len(expected) == len(calendar)
+    for since, until in [
+        (calendar.start_date, calendar.start_date),
+        (calendar.start_date + timedelta(days=1), calendar.start_date + timedelta(days=400)),
+        (date(2025, 2, 28), date(2025, 3, 31)),
+        (date(2026, 2, 1), date(2028, 2, 29)),
+        (calendar.start_date - timedelta(days=30), calendar.end_date + timedelta(days=30)),
+    ]:
+        assert calendar.count(since=since, until=until) == sum(1 for d in expected if since <= d <= until)
+
+
+def test_index_of_matches_stepping(schedule):
+    calendar, expected = schedule
+    positions = {d: n for n, d in enumerate(expected)}
+    day = calendar.start_date - timedelta(days=3)
+    while day <= calendar.end_date + timedelta(days=3):
+        assert calendar.index_of(day) == positions.get(day), day
+        day += timedelta(days=1)
+
+
+def test_open_ended_calendar():
+    calendar = GroupCalendar(date(2024, 1, 31), GroupFrequency.MONTHLY)
+    expected = stepped(date(2024, 1, 31), GroupFrequency.MONTHLY, date(2027, 1, 31))
+    assert calendar.dates(limit=len(expected)) == expected
+    assert calendar.count(until=date(2025, 6, 30)) == sum(1 for d in expected if d <= date(2025, 6, 30))
+    with pytest.raises(ValueError):
+        calendar.count()
@@ -0,0 +1,57 @@
+"""
+The tracking number permutation must be a bijection on the 10-digit space:
+that is what lets allocation skip the uniqueness lookup.
+"""
+import random
+
+from utils.tracking_numbers import format_tracking_number, scramble, unscramble
+
+DOMAIN = 10 ** 10
+
+
+def sample(count: int, seed: int):
+    rng = random.Random(seed)
+    return [rng.randrange(DOMAIN) for _ in range(count)]
+
+
+EDGES = [0, 1, 99_999, 100_000, 100_001, DOMAIN // 2, DOMAIN - 100_000, DOMAIN - 1]
+
+
+def test_outputs_stay_in_domain():
+    for value in EDGES + sample(10_000, seed=1):
+        assert 0 <= scramble(value) < DOMAIN
+        assert 0 <= unscramble(value) < DOMAIN
+
+
+def test_unscramble_inverts_scramble():
+    # A left inverse over the whole domain makes scramble injective, and a
+    # right inverse makes it onto; check both on edges and a random sample.
+    for value in EDGES + sample(100_000, seed=2):
+        assert unscramble(scramble(value)) == value
+        assert scramble(unscramble(value)) == value
+
+
+def test_sequence_values_do_not_collide():
+    # The first half-million sequence values, as issued in production order
+    issued = [scramble(value) for value in range(1, 500_001)]
+    assert len(set(issued)) == len(issued)
+
+
+def test_sparse_values_do_not_collide():
+    values = set(sample(200_000, seed=3)) | set(EDGES)
+    assert len({scramble(value) for value in values}) == len(values)
+
+
+def test_permutes_a_full_block_of_outputs():
+    # Every output in one block of the space maps back to a distinct input
+    block = range(3 * 100_000, 4 * 100_000)
+    inputs = [unscramble(value) for value in block]
+    assert len(set(inputs)) == len(block)
+    assert [scramble(value) for value in inputs] == list(block)
+
+
+def test_formatted_numbers_are_ten_digits():
+    for value in EDGES + sample(1_000, seed=4):
+        number = format_tracking_number(value)
+        assert len(number) == 10 and number.isdigit()
+        assert unscramble(int(number)) == value
@@ -7,11 +7,12 @@ Provides caching functionality using Redis (primary) or in-memory cache (fallbac
 import redis.asyncio as redis
 import json
 import logging
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Union
 from datetime import timedelta
 from functools import wraps
 import pickle
 import hashlib
+import inspect
 from cachetools import TTLCache
 import asyncio
 
@@ -345,7 +346,11 @@ def cache_key(*args, **kwargs) -> str:
     return hashlib.md5(key_data.encode()).hexdigest()
 
 
-def cached(ttl: Union[int, timedelta] = 300, key_prefix: str = ""):
+def cached(
+    ttl: Union[int, timedelta] = 300,
+    key_prefix: str = "",
+    scope: Optional[Callable[[dict], Any]] = None,
+):
     """
     Async-aware caching decorator for FastAPI route handlers.
     Guarantees that the returned value is always the real result (dict/response),
@@ -354,15 +359,28 @@ def cached(ttl: Union[int, timedelta] = 300, key_prefix: str = ""):
     JSONResponse objects are serialised to a plain dict before storage so they
     can be written to Redis as JSON (Redis rejects raw pickle bytes when the
     client is configured with decode_responses=True).
+
+    ``scope`` maps the call's bound arguments to a key segment placed after
+    ``key_prefix`` (for example the customer id), so one scope's entries can
+    be dropped with ``clear_pattern(f"{key_prefix}:{scope}:*")``.
     """
     def decorator(func):
+        signature = inspect.signature(func)
+
+        def _key(args, kwargs) -> str:
+            prefix = key_prefix
+            if scope is not None:
+                arguments = signature.bind_partial(*args, **kwargs).arguments
+                prefix = f"{key_prefix}:{scope(arguments)}"
+            func_name = f"{func.__module__}.{func.__name__}"
+            arg_key = cache_key(*args, **kwargs)
+            return f"{prefix}:{func_name}:{arg_key}" if prefix else f"{func_name}:{arg_key}"
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
             try:
                 from fastapi.responses import JSONResponse as _JSONResponse
-                func_name = f"{func.__module__}.{func.__name__}"
-                arg_key = cache_key(*args, **kwargs)
-                full_key = f"{key_prefix}:{func_name}:{arg_key}" if key_prefix else f"{func_name}:{arg_key}"
+                full_key = _key(args, kwargs)
 
                 cached_value = await get_cache().get(full_key)
                 if cached_value is not None:
@@ -397,8 +415,7 @@ def cached(ttl: Union[int, timedelta] = 300, key_prefix: str = ""):
                 return await func(*args, **kwargs)
         
         async def invalidate(*args, **kwargs):
-            arg_key = cache_key(*args, **kwargs)
-            full_key = f"{key_prefix}:{func.__module__}.{func.__name__}:{arg_key}" if key_prefix else f"{func.__module__}.{func.__name__}:{arg_key}"
+            full_key = _key(args, kwargs)
             await get_cache().delete(full_key)
             logger.debug(f"Cache invalidated for {full_key}")
         
@@ -1,7 +1,9 @@
 # utils/email_service.py
 import aiosmtplib
 from email.message import EmailMessage
+import asyncio
 import os
+from typing import Optional, Tuple
 from jinja2 import Environment, FileSystemLoader
 from dotenv import load_dotenv
 from loguru import logger
@@ -61,7 +63,6 @@ import os
 from jinja2 import Environment, FileSystemLoader
 from dotenv import load_dotenv
 import logging
-from typing import Optional
 
 # Load environment variables
 load_dotenv()
@@ -88,6 +89,9 @@ if os.path.exists(template_dir):
 else:
     logger.warning(f"Email template directory not found: {template_dir}")
 
+# (subject, html_body, text_body)
+EmailContent = Tuple[str, str, Optional[str]]
+
 # Log config (mask password)
 if SMTP_HOST:
     logger.info(f"SMTP Config - Host: {SMTP_HOST}, Port: {SMTP_PORT}, User: {SMTP_USERNAME}, From: {SMTP_FROM_EMAIL}")
@@ -96,15 +100,12 @@ else:
 
 
 
-async def send_email_async(to_email: str, subject: str, html_body: str, text_body: Optional[str] = None):
-    """
-    Core async email sender using aiosmtplib.
-    Supports both HTML and plain text fallback.
-    """
-    if not all([SMTP_HOST, SMTP_USERNAME, SMTP_PASSWORD, SMTP_FROM_EMAIL]):
-        logger.error("Incomplete SMTP configuration - cannot send email")
-        return {"status": "error", "message": "Email service not configured"}
+def smtp_configured() -> bool:
+    return all([SMTP_HOST, SMTP_USERNAME, SMTP_PASSWORD, SMTP_FROM_EMAIL])
+
 
+def build_email_message(to_email: str, subject: str, html_body: str, text_body: Optional[str] = None) -> EmailMessage:
+    """Build the message with a plain-text part and, if given, an HTML alternative."""
     message = EmailMessage()
     message["From"] = f"{SMTP_FROM_NAME} <{SMTP_FROM_EMAIL}>"
     message["To"] = to_email
@@ -115,14 +116,43 @@ async def send_email_async(to_email: str, subject: str, html_body: str, text_bod
         message.add_alternative(html_body, subtype="html")
     else:
         message.set_content(text_body or "No content provided.", subtype="plain")
+    return message
+
+
+async def open_smtp_connection() -> aiosmtplib.SMTP:
+    """Connect, STARTTLS and log in; the caller sends any number of messages and quits."""
+    smtp = aiosmtplib.SMTP(
+        hostname=SMTP_HOST,
+        port=SMTP_PORT,
+        use_tls=False,
+        start_tls=True,
+        timeout=60,
+    )
+    await smtp.connect()
+    await smtp.login(SMTP_USERNAME, SMTP_PASSWORD)
+    return smtp
+
+
+async def send_email_async(to_email: str, subject: str, html_body: str, text_body: Optional[str] = None):
+    """
+    Core async email sender using aiosmtplib.
+    Supports both HTML and plain text fallback.
+
+    Opens a connection per call; handlers should queue mail with
+    ``service.outbound.queue_email`` instead, which the delivery worker
+    sends in batches over one session.
+    """
+    if not smtp_configured():
+        logger.error("Incomplete SMTP configuration - cannot send email")
+        return {"status": "error", "message": "Email service not configured"}
 
+    message = build_email_message(to_email, subject, html_body, text_body)
 
     logger.info(f"Preparing to send email to {to_email}")
     # Log config at INFO level to verify in production (masking password)
     logger.info(f"SMTP Config: Host={SMTP_HOST}, Port={SMTP_PORT}, User={SMTP_USERNAME}, Timeout=60s")
     
     try:
-        import asyncio
         logger.info("Initiating SMTP connection...")
         response = await aiosmtplib.send(
             message,
@@ -154,6 +184,72 @@ async def send_email_async(to_email: str, subject: str, html_body: str, text_bod
         }
 
 
+def _render(template_name: str, **context) -> str:
+    if env is None:
+        raise RuntimeError("Email template system not available.")
+    return env.get_template(template_name).render(app_name="Kopkad", **context)
+
+
+# Content builders return (subject, html_body, text_body) for send_email_async
+# or service.outbound.queue_email.
+
+def welcome_email_content(user_name: str, phone_number: str, role: str) -> EmailContent:
+    body = _render("welcome_email.html", user_name=user_name, phone_number=phone_number, role=role)
+    return "Welcome to Kopkad!", body, None
+
+
+def business_created_email_content(
+    agent_name: str, business_name: str, unique_code: str, created_at: str
+) -> EmailContent:
+    body = _render(
+        "business_created_email.html",
+        agent_name=agent_name,
+        business_name=business_name,
+        unique_code=unique_code,
+        created_at=created_at,
+    )
+    return f"New Business Created: {business_name}", body, None
+
+
+def business_invitation_email_content(
+    customer_name: str, business_name: str, accept_url: str, reject_url: str
+) -> EmailContent:
+    body = _render(
+        "business_invitation_email.html",
+        customer_name=customer_name,
+        business_name=business_name,
+        accept_url=accept_url,
+        reject_url=reject_url,
+    )
+    return f"Invitation to Join {business_name}", body, None
+
+
+def setup_account_email_content(user_name: str, business_name: str, setup_url: str) -> EmailContent:
+    body = _render(
+        "setup_account_email.html",
+        user_name=user_name,
+        business_name=business_name,
+        setup_url=setup_url,
+    )
+    return f"Welcome to {business_name} - Set Up Your Account", body, None
+
+
+def reset_password_email_content(full_name: str, reset_url: str) -> EmailContent:
+    html_body = _render(
+        "reset_password.html",
+        full_name=full_name or "User",
+        reset_url=reset_url,
+        expiry_hours=1,
+    )
+    text_body = (
+        f"Hello {full_name or 'User'},\n\n"
+        f"You requested a password reset. Click here to set a new PIN:\n{reset_url}\n"
+        f"This link expires in 1 hour.\n\n"
+        f"If you didn't request this, ignore this email."
+    )
+    return "Kopkad Password Reset", html_body, text_body
+
+
 async def send_welcome_email(
     to_email: str, user_name: str, phone_number: str, role: str
 ):
@@ -165,12 +261,9 @@ async def send_welcome_email(
             "message": "Email template system not available.",
         }
     try:
-        template = env.get_template("welcome_email.html")
-        body = template.render(
-            user_name=user_name, phone_number=phone_number, role=role, app_name="Kopkad"
+        return await send_email_async(
+            to_email, *welcome_email_content(user_name, phone_number, role)
         )
-        result = await send_email_async(to_email, "Welcome to Kopkad!", body)
-        return result
     except Exception as e:
         logger.error(f"Failed to send welcome email: {str(e)}")
         return {
@@ -186,16 +279,9 @@ async def send_business_created_email(
     unique_code: str,
     created_at: str,
 ):
-    template = env.get_template("business_created_email.html")
-    body = template.render(
-        agent_name=agent_name,
-        business_name=business_name,
-        unique_code=unique_code,
-        created_at=created_at,
-        app_name="Kopkad",
-    )
     return await send_email_async(
-        to_email, f"New Business Created: {business_name}", body
+        to_email,
+        *business_created_email_content(agent_name, business_name, unique_code, created_at),
     )
 
 
@@ -214,15 +300,10 @@ async def send_business_invitation_email(
             "message": "Email template system not available.",
         }
     try:
-        template = env.get_template("business_invitation_email.html")
-        body = template.render(
-            customer_name=customer_name,
-            business_name=business_name,
-            accept_url=accept_url,
-            reject_url=reject_url,
-            app_name="Kopkad",
+        return await send_email_async(
+            to_email,
+            *business_invitation_email_content(customer_name, business_name, accept_url, reject_url),
         )
-        return await send_email_async(to_email, f"Invitation to Join {business_name}", body)
     except Exception as e:
         logger.error(f"Failed to send business invitation email: {str(e)}")
         return {
@@ -245,14 +326,9 @@ async def send_setup_account_email(
             "message": "Email template system not available.",
         }
     try:
-        template = env.get_template("setup_account_email.html")
-        body = template.render(
-            user_name=user_name,
-            business_name=business_name,
-            setup_url=setup_url,
-            app_name="Kopkad",
+        return await send_email_async(
+            to_email, *setup_account_email_content(user_name, business_name, setup_url)
         )
-        return await send_email_async(to_email, f"Welcome to {business_name} - Set Up Your Account", body)
     except Exception as e:
         logger.error(f"Failed to send setup account email: {str(e)}")
         return {
@@ -275,20 +351,7 @@ async def send_reset_password_email_async(to_email: str, full_name: str, reset_u
         return {"status": "error", "message": "Email template system unavailable"}
 
     try:
-        template = env.get_template("reset_password.html")
-        html_body = template.render(
-            full_name=full_name or "User",
-            reset_url=reset_url,
-            app_name="Kopkad",
-            expiry_hours=1,
-        )
-        text_body = (
-            f"Hello {full_name or 'User'},\n\n"
-            f"You requested a password reset. Click here to set a new PIN:\n{reset_url}\n"
-            f"This link expires in 1 hour.\n\n"
-            f"If you didn't request this, ignore this email."
-        )
-        return await send_email_async(to_email, "Kopkad Password Reset", html_body, text_body)
+        return await send_email_async(to_email, *reset_password_email_content(full_name, reset_url))
     except Exception as e:
         logger.error(f"Reset password email failed: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -343,4 +406,12 @@ __all__ = [
     "send_setup_account_email",
     "send_reset_password_email_async",
     "send_invitation_email_async",
+    "smtp_configured",
+    "build_email_message",
+    "open_smtp_connection",
+    "welcome_email_content",
+    "business_created_email_content",
+    "business_invitation_email_content",
+    "setup_account_email_content",
+    "reset_password_email_content",
 ]
@@ -0,0 +1,135 @@
+# utils/group_calendar.py
+"""
+Contribution calendar for cooperative savings groups.
+
+Dates follow the schedule the app has always stored: the start date stepped
+by 1/2 weeks or 1/3 months with ``relativedelta``, one step at a time. For
+month-based schedules that start on the 29th-31st the day of month is
+clamped at each short month and stays clamped (Jan 31 -> Feb 28 -> Mar 28),
+so the N-th date depends on the shortest month seen so far. That minimum
+stabilises within two years, which keeps every lookup O(1) instead of
+iterating from the start date.
+"""
+from datetime import date, timedelta
+from typing import List, Optional
+
+import numpy as np
+
+from models.savings_group import GroupFrequency
+
+_STEPS = {
+    GroupFrequency.WEEKLY: ("weeks", 1),
+    GroupFrequency.BI_WEEKLY: ("weeks", 2),
+    GroupFrequency.MONTHLY: ("months", 1),
+    GroupFrequency.QUARTERLY: ("months", 3),
+}
+
+
+def _days_in_month(month_index: int) -> int:
+    """Days in the month ``month_index`` months after year 0 (0-based month)."""
+    year, month = divmod(month_index, 12)
+    nxt_year, nxt_month = divmod(month_index + 1, 12)
+    return (date(nxt_year, nxt_month + 1, 1) - date(year, month + 1, 1)).days
+
+
+class GroupCalendar:
+    """Closed-form contribution dates for a group schedule."""
+
+    def __init__(self, start_date: date, frequency: GroupFrequency, end_date: Optional[date] = None):
+        self.start_date = start_date
+        self.frequency = frequency
+        self.end_date = end_date
+        self.unit, self.step = _STEPS.get(frequency, ("months", 1))
+        self._start_month = start_date.year * 12 + start_date.month - 1
+
+    # ------------------------------------------------------------------
+    # Single-date arithmetic
+    # ------------------------------------------------------------------
+
+    def _clamped_day(self, n: int) -> int:
+        """Day of month of the n-th date on a month-based schedule."""
+        day = self.start_date.day
+        if day <= 28:
+            return day
+        # The shortest month repeats within two years (a 28-day February at
+        # the latest), so only that many steps can lower the clamp further.
+        horizon = min(n, 24 // self.step)
+        for k in range(1, horizon + 1):
+            day = min(day, _days_in_month(self._start_month + k * self.step))
+            if day == 28:
+                break
+        return day
+
+    def nth(self, n: int) -> date:
+        """The n-th contribution date (0-based), ignoring ``end_date``."""
+        if self.unit == "weeks":
+            return self.start_date + timedelta(weeks=n * self.step)
+        year, month = divmod(self._start_month + n * self.step, 12)
+        return date(year, month + 1, self._clamped_day(n))
+
+    def index_of(self, value: date) -> Optional[int]:
+        """Position of ``value`` in the schedule, or None if it isn't a contribution date."""
+        if value < self.start_date or (self.end_date and value > self.end_date):
+            return None
+        if self.unit == "weeks":
+            days = (value - self.start_date).days
+            n, remainder = divmod(days, 7 * self.step)
+            return n if remainder == 0 else None
+        months = value.year * 12 + value.month - 1 - self._start_month
+        n, remainder = divmod(months, self.step)
+        if remainder or self.nth(n) != value:
+            return None
+        return n
+
+    def _count_through(self, value: date) -> int:
+        """How many dates fall on or before ``value`` (ignoring ``end_date``)."""
+        if value < self.start_date:
+            return 0
+        if self.unit == "weeks":
+            return (value - self.start_date).days // (7 * self.step) + 1
+        months = value.year * 12 + value.month - 1 - self._start_month
+        n = months // self.step
+        if self.nth(n) > value:
+            n -= 1
+        return n + 1
+
+    def count(self, since: Optional[date] = None, until: Optional[date] = None) -> int:
+        """Number of contribution dates in ``[since, until]`` within the schedule."""
+        upper = until or self.end_date
+        if upper is None:
+            raise ValueError("count() needs an upper bound when the calendar has no end_date")
+        if self.end_date and upper > self.end_date:
+            upper = self.end_date
+        total = self._count_through(upper)
+        if since and since > self.start_date:
+            total -= self._count_through(since - timedelta(days=1))
+        return max(0, total)
+
+    # ------------------------------------------------------------------
+    # Vectorized generation
+    # ------------------------------------------------------------------
+
+    def dates(self, offset: int = 0, limit: Optional[int] = None) -> List[date]:
+        """
+        Contribution dates ``offset .. offset + limit`` as a list, generated
+        as one numpy array rather than stepped from the start date.
+        """
+        stop = self.count() if self.end_date else offset + (limit or 0)
+        if limit is not None:
+            stop = min(stop, offset + limit)
+        if stop <= offset:
+            return []
+        index = np.arange(offset, stop, dtype=np.int64)
+
+        if self.unit == "weeks":
+            days = np.datetime64(self.start_date, "D") + index * (7 * self.step)
+            return days.tolist()
+
+        months = np.datetime64(f"{self.start_date.year:04d}-{self.start_date.month:02d}", "M") + index * self.step
+        first_days = months.astype("datetime64[D]")
+        month_lengths = ((months + 1).astype("datetime64[D]") - first_days).astype(np.int64)
+        clamp = np.minimum.accumulate(np.minimum(month_lengths, self._clamped_day(offset)))
+        return (first_days + (clamp - 1)).tolist()
+
+    def __len__(self) -> int:
+        return self.count()
@@ -0,0 +1,206 @@
+# utils/paystack.py
+"""
+Async Paystack client.
+
+A single shared ``httpx.AsyncClient`` keeps connections to Paystack alive
+between requests, so payment calls made from ``async def`` handlers no longer
+block the event loop or pay a fresh TCP/TLS handshake each time.
+
+- Explicit connect/read timeouts on every request
+- Bounded retries with exponential backoff. GETs retry on transport errors,
+  429 and 5xx; POSTs only retry when the connection was never established,
+  so a transaction can't be initialized twice
+- A circuit breaker that fails fast with 503 while Paystack is unreachable
+
+Point ``PAYSTACK_BASE_URL`` at ``scripts/paystack_stub.py`` to run against a
+local stub in tests and benchmarks.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+PAYSTACK_BASE_URL = os.getenv("PAYSTACK_BASE_URL", "https://api.paystack.co")
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class PaystackUnavailableError(HTTPException):
+    """Raised when Paystack can't be reached or the circuit breaker is open."""
+
+    def __init__(self, detail: str = "Payment provider is temporarily unavailable"):
+        super().__init__(status_code=503, detail=detail)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after ``failure_threshold`` failures in a row. Once ``reset_timeout``
+    seconds have passed it lets a single trial request through (half-open):
+    success closes the circuit again, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"Paystack circuit opened after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+
+
+class PaystackClient:
+    """Pooled async client for the Paystack REST API."""
+
+    def __init__(
+        self,
+        secret_key: Optional[str] = None,
+        base_url: str = PAYSTACK_BASE_URL,
+        *,
+        timeout: Optional[httpx.Timeout] = None,
+        limits: Optional[httpx.Limits] = None,
+        max_retries: int = 2,
+        backoff: float = 0.25,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.secret_key = secret_key if secret_key is not None else os.getenv("PAYSTACK_SECRET_KEY", "")
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout or httpx.Timeout(15.0, connect=5.0)
+        self.limits = limits or httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.secret_key}",
+                    "Content-Type": "application/json",
+                },
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """
+        Send a request through the breaker with bounded retries.
+
+        Paystack's 4xx responses are returned as-is for the caller to
+        inspect; only unreachable/overloaded upstreams raise.
+        """
+        if not self.breaker.allow_request():
+            raise PaystackUnavailableError()
+
+        idempotent = method.upper() == "GET"
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, path, json=json, params=params)
+            except httpx.TransportError as e:
+                never_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if attempt < self.max_retries and (idempotent or never_sent):
+                    attempt += 1
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                    continue
+                self.breaker.record_failure()
+                logger.error(f"Paystack {method} {path} failed after {attempt + 1} attempt(s): {e!r}")
+                raise PaystackUnavailableError() from e
+
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                if attempt < self.max_retries and idempotent:
+                    attempt += 1
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                    continue
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            return response
+
+    async def _json(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        response = await self.request(method, path, **kwargs)
+        try:
+            return response.json()
+        except ValueError:
+            return {"status": False, "message": f"Unexpected Paystack response ({response.status_code})"}
+
+    async def initialize_transaction(self, **payload) -> Dict[str, Any]:
+        """POST /transaction/initialize; same result shape as ``paystackapi``."""
+        return await self._json("POST", "/transaction/initialize", json=payload)
+
+    async def verify_transaction(self, reference: str) -> Dict[str, Any]:
+        """GET /transaction/verify/{reference}; same result shape as ``paystackapi``."""
+        return await self._json("GET", f"/transaction/verify/{reference}")
+
+
+paystack_client: Optional[PaystackClient] = None
+
+
+def get_paystack_client() -> PaystackClient:
+    """Return the process-wide Paystack client, creating it on first use."""
+    global paystack_client
+    if paystack_client is None:
+        paystack_client = PaystackClient()
+    return paystack_client
+
+
+async def close_paystack_client() -> None:
+    global paystack_client
+    if paystack_client is not None:
+        await paystack_client.aclose()
+        paystack_client = None
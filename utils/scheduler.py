@@ -22,6 +22,10 @@ from service.cron_notifications import (
     send_weekly_analytics_report,
     notify_legacy_pending_payment_requests,
 )
+from service.settlements import reconcile_stale_initiations, run_settlement_batch
+from service.outbound import OUTBOUND_BATCH_SIZE, run_outbound_batch
+from models.outbound import OutboundChannel
+from service.analytics import refresh_analytics_facts
 import logging
 
 logger = logging.getLogger(__name__)
@@ -186,6 +190,63 @@ def init_scheduler():
         replace_existing=True,
     )
     
+    # Apply queued Paystack webhook events (every 10 seconds)
+    scheduler.add_job(
+        run_payment_settlement,
+        IntervalTrigger(seconds=10),
+        id="payment_settlement",
+        name="Settle queued payment events",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
+    # Deliver queued emails and SMS, one job per channel (every 5 seconds)
+    for channel in OutboundChannel:
+        scheduler.add_job(
+            run_outbound_delivery,
+            IntervalTrigger(seconds=5),
+            args=[channel],
+            id=f"outbound_{channel.value}_delivery",
+            name=f"Deliver queued {channel.value} messages",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+
+    # Verify initiations whose webhook never arrived (every 5 minutes)
+    scheduler.add_job(
+        run_payment_reconciliation,
+        IntervalTrigger(minutes=5),
+        id="payment_reconciliation",
+        name="Reconcile stale payment initiations",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    
+    # Roll changed savings, payments and signups into the daily analytics facts (every 10 minutes)
+    scheduler.add_job(
+        run_analytics_fact_refresh,
+        IntervalTrigger(minutes=10),
+        id="analytics_fact_refresh",
+        name="Refresh daily analytics facts",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
+    # Full rebuild of the daily analytics facts, picking up deleted rows (daily 2:30 AM)
+    scheduler.add_job(
+        run_analytics_fact_rebuild,
+        CronTrigger(hour=2, minute=30),
+        id="analytics_fact_rebuild",
+        name="Rebuild daily analytics facts",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    
     logger.info("Scheduler initialized with all financial advisor jobs")
 
 
@@ -288,6 +349,63 @@ async def run_savings_completion_reminders():
         logger.error(f"Error in savings completion reminders: {str(e)}")
 
 
+async def run_payment_settlement():
+    """Wrapper to drain the payment settlement queue in batches."""
+    db = next(get_db())
+    try:
+        while await run_settlement_batch(db, batch_size=100) == 100:
+            pass
+    except Exception as e:
+        logger.error(f"Error in payment settlement: {str(e)}")
+    finally:
+        db.close()
+
+
+async def run_outbound_delivery(channel: OutboundChannel):
+    """Wrapper to drain the outbound message queue for one channel in batches."""
+    db = next(get_db())
+    try:
+        while await run_outbound_batch(db, channel) == OUTBOUND_BATCH_SIZE:
+            pass
+    except Exception as e:
+        logger.error(f"Error in {channel.value} delivery: {str(e)}")
+    finally:
+        db.close()
+
+
+async def run_payment_reconciliation():
+    """Wrapper to reconcile stale payment initiations."""
+    db = next(get_db())
+    try:
+        await reconcile_stale_initiations(db)
+    except Exception as e:
+        logger.error(f"Error in payment reconciliation: {str(e)}")
+    finally:
+        db.close()
+
+
+async def run_analytics_fact_refresh():
+    """Wrapper to incrementally refresh the daily analytics facts."""
+    db = next(get_db())
+    try:
+        await refresh_analytics_facts(db)
+    except Exception as e:
+        logger.error(f"Error in analytics fact refresh: {str(e)}")
+    finally:
+        db.close()
+
+
+async def run_analytics_fact_rebuild():
+    """Wrapper to rebuild the daily analytics facts from scratch."""
+    db = next(get_db())
+    try:
+        await refresh_analytics_facts(db, full=True)
+    except Exception as e:
+        logger.error(f"Error in analytics fact rebuild: {str(e)}")
+    finally:
+        db.close()
+
+
 async def run_overdue_savings_payments():
     """Wrapper to check overdue savings payments.
     
@@ -1,7 +1,7 @@
 # utils/sms_service.py
 import httpx
 import os
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 from loguru import logger
 
@@ -9,7 +9,7 @@ load_dotenv()
 
 TERMII_API_KEY = os.getenv("TERMII_API_KEY")
 TERMII_SENDER_ID = os.getenv("TERMII_SENDER_ID") or "Kopkad"
-TERMII_BASE_URL = "https://v3.api.termii.com/api/sms/send"  # Updated based on your provided URL
+TERMII_BASE_URL = os.getenv("TERMII_BASE_URL", "https://v3.api.termii.com/api/sms/send")
 
 def normalize_phone(phone: str) -> str:
     """Normalize phone to international format (+234...) for Termii."""
@@ -22,14 +22,46 @@ def normalize_phone(phone: str) -> str:
         return "+234" + cleaned
     return cleaned
 
-async def send_termii_sms_async(to_phone: str, message: str) -> Dict[str, Any]:
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class TermiiError(Exception):
+    """Termii rejected or failed the send; ``retryable`` marks rate limits and outages."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = status_code in RETRYABLE_STATUS_CODES
+
+
+def get_sms_client() -> httpx.AsyncClient:
+    """Return the process-wide Termii client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+        )
+    return _client
+
+
+async def close_sms_client() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+async def deliver_termii_sms(to_phone: str, message: str) -> Dict[str, Any]:
     """
-    Send SMS via Termii asynchronously.
-    Returns: {'status': 'success'|'error', 'message': str, 'data': dict}
+    Send one SMS over the shared client; returns Termii's response body.
+    Raises ``TermiiError`` (or an ``httpx`` transport error) on failure.
     """
     if not TERMII_API_KEY:
-        logger.error("TERMII_API_KEY not set in .env")
-        return {"status": "error", "message": "SMS service not configured"}
+        raise TermiiError("SMS service not configured")
 
     phone = normalize_phone(to_phone)
     payload = {
@@ -40,25 +72,33 @@ async def send_termii_sms_async(to_phone: str, message: str) -> Dict[str, Any]:
         "channel": "generic",
         "api_key": TERMII_API_KEY,
     }
+    response = await get_sms_client().post(TERMII_BASE_URL, json=payload)
+    if response.is_error:
+        raise TermiiError(
+            f"Termii HTTP {response.status_code}: {response.text}",
+            status_code=response.status_code,
+        )
+    data = response.json()
+    if data.get("status") != "success":
+        raise TermiiError(data.get("message", "Unknown Termii error"))
+    logger.info(f"SMS sent to {phone}: {message[:50]}...")
+    return data
+
+
+async def send_termii_sms_async(to_phone: str, message: str) -> Dict[str, Any]:
+    """
+    Send SMS via Termii asynchronously.
+    Returns: {'status': 'success'|'error', 'message': str, 'data': dict}
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(TERMII_BASE_URL, json=payload, timeout=15.0)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") == "success":
-                logger.info(f"SMS sent to {phone}: {message[:50]}...")
-                return {"status": "success", "message": "SMS sent successfully", "data": data}
-            else:
-                error_msg = data.get("message", "Unknown Termii error")
-                logger.error(f"Termii failed: {error_msg}")
-                return {"status": "error", "message": error_msg}
-
-        except httpx.HTTPStatusError as e:
-            error_msg = f"Termii HTTP {e.response.status_code}: {e.response.text}"
-            logger.error(error_msg)
-            return {"status": "error", "message": error_msg}
-        except Exception as e:
-            logger.exception("Termii SMS exception")
-            return {"status": "error", "message": f"Failed to send SMS: {str(e)}"}
\ No newline at end of file
+    Handlers should queue SMS with ``service.outbound.queue_sms`` instead,
+    which the delivery worker sends at Termii's rate limit with retries.
+    """
+    try:
+        data = await deliver_termii_sms(to_phone, message)
+        return {"status": "success", "message": "SMS sent successfully", "data": data}
+    except TermiiError as e:
+        logger.error(f"Termii failed: {e}")
+        return {"status": "error", "message": str(e)}
+    except Exception as e:
+        logger.exception("Termii SMS exception")
+        return {"status": "error", "message": f"Failed to send SMS: {str(e)}"}
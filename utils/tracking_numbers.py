@@ -0,0 +1,69 @@
+# utils/tracking_numbers.py
+"""
+Tracking number allocation for savings accounts.
+
+Numbers come from the ``savings_tracking_number_seq`` Postgres sequence and
+are passed through a fixed permutation of the 10-digit space (a four-round
+Feistel network over two 5-digit halves). A permutation never maps two inputs
+to the same output, so every sequence value yields a distinct number and no
+``SELECT`` is needed before inserting. Consecutive accounts still get
+unrelated-looking numbers.
+
+The round keys are part of the numbering scheme: changing them after numbers
+have been issued could re-issue an existing number.
+
+Accounts created before the sequence existed carry random numbers that the
+permutation may in principle land on; the unique constraint on
+``savings_accounts.tracking_number`` remains the backstop for that case.
+"""
+from typing import List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models.savings import tracking_number_seq
+
+_HALF = 100_000  # two 5-digit halves make up the 10-digit space
+_ROUND_KEYS = (0x5BD1E995, 0x27D4EB2F, 0x165667B1, 0x2545F491)
+
+
+def _round(value: int, key: int) -> int:
+    x = (value * 0x9E3779B1 + key) & 0xFFFFFFFF
+    x ^= x >> 15
+    x = (x * 0x85EBCA6B) & 0xFFFFFFFF
+    x ^= x >> 13
+    return x % _HALF
+
+
+def scramble(value: int) -> int:
+    """Map 0..9999999999 onto itself one-to-one."""
+    left, right = divmod(value, _HALF)
+    for key in _ROUND_KEYS:
+        left, right = right, (left + _round(right, key)) % _HALF
+    return left * _HALF + right
+
+
+def unscramble(value: int) -> int:
+    """Inverse of :func:`scramble`."""
+    left, right = divmod(value, _HALF)
+    for key in reversed(_ROUND_KEYS):
+        left, right = (right - _round(left, key)) % _HALF, left
+    return left * _HALF + right
+
+
+def format_tracking_number(value: int) -> str:
+    return f"{scramble(value):010d}"
+
+
+def allocate_tracking_numbers(db: Session, count: int = 1) -> List[str]:
+    """Reserve ``count`` tracking numbers in a single round-trip."""
+    if count <= 0:
+        return []
+    values = db.execute(
+        select(tracking_number_seq.next_value()).select_from(func.generate_series(1, count))
+    ).scalars().all()
+    return [format_tracking_number(value) for value in values]
+
+
+def allocate_tracking_number(db: Session) -> str:
+    return allocate_tracking_numbers(db, 1)[0]